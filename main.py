@@ -11,12 +11,361 @@ and provides statistical analysis of emergent behaviors including:
 """
 
 import argparse
-from src.simulation import run_simulation
+import json
+import os
+import sys
+from contextlib import nullcontext
+from src.simulation import (
+    run_simulation, run_until_confident, resume_simulation, check_engine_options,
+    _game_options, ENGINES,
+)
+from src.streaming import CI_METRICS, StreamingSummary
+from src.checkpoint import CHECKPOINT_FILE, DEFAULT_CHECKPOINT_EVERY
+from src.seeding import random_seed
 from src.analysis import print_summary
+from src.output import FORMATS, open_writer
+from src.deck import CARD_RANKS, NUM_SUITS, create_deck
+from src.cache import OutcomeCache, SqliteOutcomeCache
+from src.rules import SHORT_WAR_RULES, STANDARD_RULES, WINNINGS_ORDERS, WarRules
+
+# Rank symbols for printing replayed hands
+RANK_SYMBOLS = dict(zip(range(2, 15), '23456789TJQKA'))
+
+
+def print_stack_summary(stacks, deck_size):
+    """Print lead statistics from per-round stack trajectories."""
+    import numpy as np
+    from src.stacks import lead_changes, time_to_lead
+    
+    changes = lead_changes(stacks, deck_size)
+    p1_first = time_to_lead(stacks, player=1, deck_size=deck_size)
+    p2_first = time_to_lead(stacks, player=2, deck_size=deck_size)
+    print("-" * 70)
+    print("STACK SIZES")
+    print("-" * 70)
+    print(f"  Mean lead changes per game:   {changes.mean():>10.2f}")
+    print(f"  Max lead changes in a game:   {changes.max():>10,}")
+    if (p1_first > 0).any():
+        print(f"  Median rounds to P1 lead:     {np.median(p1_first[p1_first > 0]):>10.1f}")
+    if (p2_first > 0).any():
+        print(f"  Median rounds to P2 lead:     {np.median(p2_first[p2_first > 0]):>10.1f}")
+    print()
+
+
+def print_exact_summary(result):
+    """Print the exact results of solving every deal of a small deck."""
+    print("=" * 70)
+    print("EXACT WAR CARD GAME RESULTS")
+    print("=" * 70)
+    print(f"\nDistinct deals: {result['deals']:,} ({result['states']:,} game states)\n")
+    print(f"  Player 1 wins:   {float(result['player_1_win_probability']):>10.4%}")
+    print(f"  Player 2 wins:   {float(result['player_2_win_probability']):>10.4%}")
+    print(f"  Infinite games:  {float(result['infinite_probability']):>10.4%}")
+    if result['expected_rounds'] is not None:
+        print(f"\n  Expected rounds (finite games):  {float(result['expected_rounds']):>10.4f}")
+        print(f"  Expected wars (finite games):    {float(result['expected_wars']):>10.4f}")
+    print()
+
+
+def build_deck(parser, args):
+    """The deck --ranks and --suits ask for, or a parser error if there is none."""
+    if not 1 <= args.ranks <= len(CARD_RANKS):
+        parser.error(f"--ranks must be between 1 and {len(CARD_RANKS)}, got {args.ranks}")
+    if args.suits < 1:
+        parser.error(f"--suits must be at least 1, got {args.suits}")
+    deck_size = args.ranks * args.suits
+    if deck_size < 2:
+        parser.error("The deck needs at least 2 cards")
+    if args.hand_size is not None and not 0 < args.hand_size < deck_size:
+        parser.error(f"--hand-size must leave both players cards of the {deck_size}-card "
+                     f"deck, got {args.hand_size}")
+    return create_deck(CARD_RANKS[:args.ranks], args.suits)
+
+
+def parse_ci_target(text):
+    """Parse a METRIC=HALF_WIDTH argument for --target-ci."""
+    metric, _, width = text.partition('=')
+    if metric not in CI_METRICS or not width:
+        raise argparse.ArgumentTypeError(
+            f"expected METRIC=HALF_WIDTH with METRIC one of {', '.join(CI_METRICS)}"
+        )
+    try:
+        return metric, float(width)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid half-width {width!r}")
+
+
+def merge_main(argv):
+    """Combine the shard outputs of a sharded run: main.py merge DIR..."""
+    from src.shards import merge_shards
+    
+    parser = argparse.ArgumentParser(
+        prog='main.py merge',
+        description='Merge the summaries of a run split with --shard'
+    )
+    parser.add_argument(
+        'paths',
+        nargs='+',
+        help='Shard directories or shard JSON files'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='Save the merged summary as JSON to this path'
+    )
+    args = parser.parse_args(argv)
+    
+    merged = merge_shards(args.paths)
+    print(f"\nMerged {merged['shards']} shards of seed {merged['seed']}")
+    for first, last in merged['missing']:
+        print(f"WARNING: no shard covers games {first + 1:,} to {last:,}")
+    print_summary(merged['summary'])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(merged['summary'], f, indent=2)
+        print(f"\nMerged summary saved to: {args.output}")
+
+
+def sweep_main(argv):
+    """Simulate a grid of configurations: main.py sweep --grid NAME=V1,V2 ..."""
+    from src.sweep import GRID_PARAMETERS, parse_grid_value, run_sweep
+    
+    def grid_value(text):
+        try:
+            return parse_grid_value(text)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc))
+    
+    parser = argparse.ArgumentParser(
+        prog='main.py sweep',
+        description='Run the simulation across a grid of parameters on one worker pool'
+    )
+    parser.add_argument(
+        '--grid',
+        type=grid_value,
+        action='append',
+        required=True,
+        metavar='NAME=V1,V2,...',
+        help=f'Values to sweep; repeatable. NAME is one of {", ".join(GRID_PARAMETERS)}'
+    )
+    parser.add_argument(
+        '-n', '--num-games',
+        type=int,
+        default=10000,
+        help='Games per configuration (default: 10000)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        default='sweep.csv',
+        help='Results table; configurations already in it are skipped (default: sweep.csv)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Results table format (default: from the file extension, else csv)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for the deals, shared by every configuration (default: random)'
+    )
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Suppress progress messages'
+    )
+    args = parser.parse_args(argv)
+    
+    grid = {}
+    for value in args.grid:
+        grid.update(value)
+    try:
+        rows = run_sweep(grid, args.num_games, args.output, args.format, args.seed,
+                         args.jobs, verbose=not args.quiet)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(f"\n{len(rows)} configurations saved to: {args.output}")
+
+
+def deal_main(argv):
+    """Save batched deals to a file, or play a saved file: main.py deal ..."""
+    from src.dealing import deal_range, load_deals, play_deal_batch, save_deals
+    
+    parser = argparse.ArgumentParser(
+        prog='main.py deal',
+        description='Save the batched deals of a seeded run to a binary file, or replay one'
+    )
+    parser.add_argument(
+        '-n', '--num-games',
+        type=int,
+        default=10000,
+        help='Number of deals to save (default: 10000)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Run seed; the file holds games 1..N of a --batch-deals run with this seed'
+    )
+    parser.add_argument(
+        '--ranks',
+        type=int,
+        default=len(CARD_RANKS),
+        help=f'Number of card ranks, counted up from 2 (default: {len(CARD_RANKS)})'
+    )
+    parser.add_argument(
+        '--suits',
+        type=int,
+        default=NUM_SUITS,
+        help=f'Cards of each rank (default: {NUM_SUITS})'
+    )
+    parser.add_argument(
+        '--hand-size',
+        type=int,
+        help='Cards dealt to player 1 (default: half the deck)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        default='deals.npz',
+        help='Deals file to write (default: deals.npz)'
+    )
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='FILE',
+        help='Play the deals in FILE and print their summary instead of dealing'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='python',
+        help='Game engine for --replay (default: python)'
+    )
+    args = parser.parse_args(argv)
+    
+    if args.replay:
+        deals = load_deals(args.replay)
+        print(f"\nPlaying {len(deals):,} deals from {args.replay}...")
+        print_summary(StreamingSummary().update(play_deal_batch(deals, args.engine)).summary())
+        return
+    
+    seed = random_seed() if args.seed is None else args.seed
+    deck = build_deck(parser, args)
+    try:
+        deals = deal_range(seed, 0, args.num_games, deck, args.hand_size)
+    except ValueError as exc:
+        parser.error(str(exc))
+    save_deals(args.output, deals)
+    print(f"\n{len(deals):,} deals of seed {seed} saved to: {args.output}")
+
+
+def format_cards(cards):
+    """Cards as rank symbols, e.g. '2TJQKA'."""
+    return ''.join(RANK_SYMBOLS.get(card, '?') for card in cards)
+
+
+def replay_main(argv):
+    """Query a trace directory or replay one of its games: main.py replay DIR ..."""
+    from src.trace import TraceReader, replay_trace
+    
+    parser = argparse.ArgumentParser(
+        prog='main.py replay',
+        description='List traced games or replay one round by round'
+    )
+    parser.add_argument(
+        'directory',
+        help='Trace directory written with --trace'
+    )
+    parser.add_argument(
+        'game',
+        type=int,
+        nargs='?',
+        help='Game number to replay; without it, matching games are listed'
+    )
+    parser.add_argument(
+        '--rounds',
+        type=str,
+        metavar='FIRST:LAST',
+        help='Only print these rounds of the replayed game'
+    )
+    parser.add_argument(
+        '--min-rounds',
+        type=int,
+        help='List games with at least this many rounds'
+    )
+    parser.add_argument(
+        '--min-double-wars',
+        type=int,
+        help='List games with at least this many double wars'
+    )
+    parser.add_argument(
+        '--min-depth',
+        type=int,
+        help='List games with a war at least this many levels deep'
+    )
+    parser.add_argument(
+        '--infinite',
+        action='store_true',
+        help='List games that hit max rounds'
+    )
+    args = parser.parse_args(argv)
+    
+    reader = TraceReader(args.directory)
+    if args.game is None:
+        games = reader.select(args.min_rounds, args.min_double_wars, args.min_depth,
+                              True if args.infinite else None)
+        print(f"{len(games):,} of {len(reader):,} traced games match")
+        for game_num in games[:100]:
+            entry = reader.entry(game_num)
+            print(f"  game {game_num}: {entry['rounds']} rounds, {entry['wars']} wars, "
+                  f"{entry['double_wars']} double wars, deepest war {entry['max_depth']}")
+        if len(games) > 100:
+            print(f"  ... {len(games) - 100:,} more")
+        return
+    
+    first, _, last = (args.rounds or '0:').partition(':')
+    first = int(first or 0)
+    last = int(last) if last else None
+    try:
+        for round_num, record, p1_hand, p2_hand in replay_trace(reader, args.game):
+            if round_num < first or (last is not None and round_num > last):
+                continue
+            if record is None:
+                print(f"Deal     P1 {format_cards(p1_hand)} | P2 {format_cards(p2_hand)}")
+                continue
+            faceup, decider = record['faceup'], record['decider']
+            play = f"{format_cards([faceup >> 4])} v {format_cards([faceup & 15])}"
+            if record['depth']:
+                play += f", war x{record['depth']}"
+                if decider:
+                    play += f" -> {format_cards([decider >> 4])} v {format_cards([decider & 15])}"
+            print(f"{round_num:>5}  {play:<22} pot {record['pot']:>2}  "
+                  f"P1 {len(p1_hand):>2} {format_cards(p1_hand)} | P2 {format_cards(p2_hand)}")
+    except (KeyError, ValueError) as exc:
+        parser.error(str(exc).strip('"'))
+
+
+# Subcommands, dispatched on the first command-line argument
+COMMANDS = {
+    'merge': merge_main,
+    'sweep': sweep_main,
+    'deal': deal_main,
+    'replay': replay_main,
+}
 
 
 def main():
     """Main entry point for the War game simulation."""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description='Simulate War card games and analyze statistics'
     )
@@ -34,33 +383,500 @@ def main():
     parser.add_argument(
         '-o', '--output',
         type=str,
-        help='Output CSV file path for game data (optional)'
+        help='Output file path for game data (optional)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Output file format (default: from the file extension, else csv)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for a reproducible run (default: random)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='python',
+        help='Game engine: python (default), numpy (vectorized batches) or jit (compiled with numba)'
+    )
+    parser.add_argument(
+        '--batch-deals',
+        action='store_true',
+        help='Shuffle each chunk of deals at once with NumPy (different games '
+             'for a seed than without it)'
+    )
+    parser.add_argument(
+        '--detect-cycles',
+        action='store_true',
+        help='End games as soon as they provably loop forever'
+    )
+    parser.add_argument(
+        '--track-stacks',
+        action='store_true',
+        help="Record player 1's stack size after every round"
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        metavar='DIR',
+        help='Save periodic checkpoints of the run to this directory'
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f'Games between checkpoints (default: {DEFAULT_CHECKPOINT_EVERY})'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='DIR',
+        help='Finish an interrupted run from its checkpoint directory'
+    )
+    parser.add_argument(
+        '--target-ci',
+        type=parse_ci_target,
+        action='append',
+        metavar='METRIC=HALF_WIDTH',
+        help='Simulate until this CI half-width is reached instead of a fixed '
+             f'game count; repeatable. METRIC is one of {", ".join(CI_METRICS)}'
+    )
+    parser.add_argument(
+        '--confidence',
+        type=float,
+        default=0.95,
+        help='Confidence level for --target-ci (default: 0.95)'
+    )
+    parser.add_argument(
+        '--max-games',
+        type=int,
+        help='Upper bound on games for --target-ci (default: unbounded)'
+    )
+    parser.add_argument(
+        '--ranks',
+        type=int,
+        default=len(CARD_RANKS),
+        help=f'Number of card ranks, counted up from 2 (default: {len(CARD_RANKS)})'
+    )
+    parser.add_argument(
+        '--suits',
+        type=int,
+        default=NUM_SUITS,
+        help=f'Cards of each rank (default: {NUM_SUITS})'
+    )
+    parser.add_argument(
+        '--hand-size',
+        type=int,
+        help="Cards dealt to player 1 (default: half the deck)"
+    )
+    parser.add_argument(
+        '--facedown',
+        type=int,
+        default=STANDARD_RULES.facedown,
+        help=f'Cards each player puts facedown in a war (default: {STANDARD_RULES.facedown})'
+    )
+    parser.add_argument(
+        '--short-war',
+        choices=SHORT_WAR_RULES,
+        default=STANDARD_RULES.short_war,
+        help='A player short of cards for a war loses (default), or turns '
+             'their last card faceup (last_card)'
+    )
+    parser.add_argument(
+        '--winnings',
+        choices=WINNINGS_ORDERS,
+        default=STANDARD_RULES.winnings,
+        help='Order won cards go under the winner\'s hand (default: in_play)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse the outcome of deals that come up again (in memory)'
+    )
+    parser.add_argument(
+        '--cache-file',
+        type=str,
+        metavar='PATH',
+        help='Like --cache, but keep outcomes in an SQLite file across runs'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Report time per phase and war-depth/game-length histograms '
+             '(runs in one process)'
+    )
+    parser.add_argument(
+        '--cprofile',
+        type=str,
+        metavar='PATH',
+        help='Profile the whole run with cProfile and save pstats to PATH'
+    )
+    parser.add_argument(
+        '--trace',
+        type=str,
+        metavar='DIR',
+        help='Record every round of every game to DIR (see: main.py replay)'
+    )
+    parser.add_argument(
+        '--progress-interval',
+        type=float,
+        metavar='SECONDS',
+        help='Print throughput, ETA, infinite-game rate and memory at most this often'
+    )
+    parser.add_argument(
+        '--status-port',
+        type=int,
+        metavar='PORT',
+        help='Serve live run status as JSON on http://127.0.0.1:PORT/ (0 picks a free port)'
+    )
+    parser.add_argument(
+        '--status-socket',
+        type=str,
+        metavar='PATH',
+        help='Serve live run status as JSON over HTTP on a Unix socket'
+    )
+    parser.add_argument(
+        '--shard',
+        type=str,
+        metavar='I/N',
+        help='Play only shard I of N of the run (needs --seed); '
+             'combine shards with "main.py merge"'
+    )
+    parser.add_argument(
+        '--shard-dir',
+        type=str,
+        default='shards',
+        help='Directory for shard output (default: shards)'
+    )
+    parser.add_argument(
+        '--store',
+        type=str,
+        metavar='DB',
+        help='Add the games to a SQLite result store, continuing its series, '
+             'and print the summary of every stored game'
+    )
+    parser.add_argument(
+        '--exact',
+        action='store_true',
+        help='Solve every deal of a small deck exactly instead of sampling'
     )
     
     args = parser.parse_args()
     
-    # Run simulation
-    results = run_simulation(
+    if args.target_ci:
+        # The adaptive run has no checkpoints, stack tracking, outcome
+        # cache or trace
+        conflicts = [flag for flag, value in (
+            ('--resume', args.resume), ('--checkpoint', args.checkpoint),
+            ('--track-stacks', args.track_stacks), ('--cache', args.cache),
+            ('--cache-file', args.cache_file), ('--trace', args.trace),
+        ) if value]
+        if conflicts:
+            parser.error(f"--target-ci cannot be combined with {', '.join(conflicts)}")
+    
+    if args.trace:
+        # Traces are recorded by the python loop from deterministic rules, in
+        # one uninterrupted run
+        conflicts = [flag for flag, value in (
+            ('--detect-cycles', args.detect_cycles), ('--track-stacks', args.track_stacks),
+            ('--cache', args.cache), ('--cache-file', args.cache_file),
+            (f'--engine {args.engine}', args.engine != 'python'),
+            ('--winnings shuffle', args.winnings == 'shuffle'),
+            ('--checkpoint', args.checkpoint), ('--resume', args.resume),
+        ) if value]
+        if conflicts:
+            parser.error(f"--trace cannot be combined with {', '.join(conflicts)}")
+    
+    if args.resume and not os.path.isfile(os.path.join(args.resume, CHECKPOINT_FILE)):
+        parser.error(f"--resume: no checkpoint in {args.resume}")
+    
+    deck = build_deck(parser, args)
+    deck_size = len(deck)
+    if (args.ranks, args.suits) == (len(CARD_RANKS), NUM_SUITS):
+        deck = None  # The standard deck, which play_game() deals by default
+    rules = WarRules(args.facedown, args.short_war, args.winnings)
+    try:
+        args.rules = None if rules == STANDARD_RULES else rules.validate()
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.detect_cycles and not rules.deterministic:
+        parser.error("--detect-cycles cannot be combined with --winnings shuffle")
+    
+    if args.cache or args.cache_file:
+        # Cached outcomes are plain standard-rules games from a single process
+        conflicts = [flag for flag, value in (
+            (f'--jobs {args.jobs}', args.jobs > 1), ('--detect-cycles', args.detect_cycles),
+            ('--track-stacks', args.track_stacks), ('non-standard rules', args.rules),
+        ) if value]
+        if conflicts:
+            flag = '--cache-file' if args.cache_file else '--cache'
+            parser.error(f"{flag} cannot be combined with {', '.join(conflicts)}")
+    
+    if args.track_stacks:
+        from src.stacks import MAX_TRACKED_DECK
+        # Checkpoints don't save trajectories, and they are stored one byte a round
+        conflicts = [flag for flag, value in (
+            ('--detect-cycles', args.detect_cycles), ('--checkpoint', args.checkpoint),
+            ('--resume', args.resume),
+        ) if value]
+        if conflicts:
+            parser.error(f"--track-stacks cannot be combined with {', '.join(conflicts)}")
+        if deck_size > MAX_TRACKED_DECK:
+            parser.error(f"--track-stacks is limited to {MAX_TRACKED_DECK} cards, got {deck_size}")
+    
+    if args.exact:
+        from src.game import MAX_ROUNDS
+        from src.solver import MAX_EXACT_DECK, solve_deck
+        if deck_size > MAX_EXACT_DECK:
+            parser.error(f"--exact is limited to {MAX_EXACT_DECK} cards, got {deck_size} "
+                         f"(shrink the deck with --ranks and --suits)")
+        try:
+            solution = solve_deck(deck or create_deck(), args.hand_size, MAX_ROUNDS, args.rules)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print_exact_summary(solution)
+        return
+    
+    if args.engine != 'python':
+        # The same options the run will hand the engine
+        run_options = _game_options(
+            detect_cycles=args.detect_cycles, track_stacks=args.track_stacks, deck=deck,
+            hand_size=args.hand_size, rules=args.rules, batch_deals=args.batch_deals,
+            cache=args.cache or args.cache_file, trace=args.trace
+        )
+        try:
+            check_engine_options(args.engine, run_options)
+        except ValueError as exc:
+            parser.error(str(exc))
+    
+    if args.shard:
+        from src.shards import parse_shard, run_shard
+        if args.seed is None:
+            parser.error("--shard needs --seed, shared by every shard of the run")
+        # Shards write their own rows and summary to --shard-dir
+        conflicts = [flag for flag, value in (
+            ('--output', args.output), ('--track-stacks', args.track_stacks),
+            ('--cache', args.cache), ('--cache-file', args.cache_file),
+            ('--trace', args.trace), ('--checkpoint', args.checkpoint),
+            ('--resume', args.resume), ('--target-ci', args.target_ci),
+            ('--store', args.store),
+        ) if value]
+        if conflicts:
+            parser.error(f"--shard cannot be combined with {', '.join(conflicts)}")
+        try:
+            index, count = parse_shard(args.shard)
+        except ValueError as exc:
+            parser.error(str(exc))
+        run_shard(
+            args.num_games, index, count, args.seed, args.shard_dir,
+            fmt=args.format or 'csv',
+            workers=args.jobs,
+            engine=args.engine,
+            verbose=not args.quiet,
+            detect_cycles=args.detect_cycles,
+            deck=deck,
+            hand_size=args.hand_size,
+            rules=args.rules,
+            batch_deals=args.batch_deals
+        )
+        return
+    
+    if args.store:
+        # The store keeps summaries of plain fixed-size runs only
+        conflicts = [flag for flag, value in (
+            ('--track-stacks', args.track_stacks), ('--cache', args.cache),
+            ('--cache-file', args.cache_file), ('--trace', args.trace),
+            ('--checkpoint', args.checkpoint), ('--resume', args.resume),
+            ('--target-ci', args.target_ci),
+        ) if value]
+        if conflicts:
+            parser.error(f"--store cannot be combined with {', '.join(conflicts)}")
+        store_run(args, deck)
+        return
+    
+    if args.cprofile:
+        import cProfile
+        import pstats
+        with cProfile.Profile() as cprofiler:
+            run(args, deck, deck_size)
+        cprofiler.dump_stats(args.cprofile)
+        print(f"\ncProfile stats saved to: {args.cprofile}\n")
+        pstats.Stats(cprofiler).sort_stats('cumulative').print_stats(15)
+    else:
+        run(args, deck, deck_size)
+
+
+def store_run(args, deck):
+    """Extend the series in a --store database and print its cumulative summary."""
+    from src.store import ResultStore, extend_store
+    writer = open_writer(args.output, args.format) if args.output else None
+    with ResultStore(args.store) as store, writer or nullcontext():
+        result = extend_store(
+            store, args.num_games, args.seed,
+            workers=args.jobs,
+            engine=args.engine,
+            verbose=not args.quiet,
+            writer=writer,
+            detect_cycles=args.detect_cycles,
+            deck=deck,
+            hand_size=args.hand_size,
+            rules=args.rules,
+            batch_deals=args.batch_deals
+        )
+    if args.output:
+        print(f"\nGame data saved to: {args.output}")
+    coverage = ', '.join(f"{first + 1:,} to {last:,}" for first, last in result['ranges'])
+    print(f"\nStore {args.store} holds games {coverage} of seed {result['seed']}")
+    print_summary(result['summary'])
+
+
+def simulate(args, deck, cache, writer, progress=None, profiler=None):
+    """Run the simulation the command-line arguments ask for."""
+    if args.resume:
+        return resume_simulation(
+            args.resume,
+            verbose=not args.quiet,
+            workers=args.jobs,
+            writer=writer,
+            keep_games=writer is None,
+            progress=progress,
+            profiler=profiler,
+            # --profile needs the python engine's hooks, even for a run
+            # checkpointed with another engine
+            engine=args.engine if args.profile else None
+        )
+    if args.target_ci:
+        # -n sets the batch size between stopping checks
+        results = run_until_confident(
+            dict(args.target_ci),
+            confidence=args.confidence,
+            batch_size=args.num_games,
+            max_games=args.max_games,
+            verbose=not args.quiet,
+            workers=args.jobs,
+            seed=args.seed,
+            engine=args.engine,
+            detect_cycles=args.detect_cycles,
+            deck=deck,
+            hand_size=args.hand_size,
+            rules=args.rules,
+            batch_deals=args.batch_deals,
+            writer=writer,
+            keep_games=writer is None,
+            progress=progress,
+            profiler=profiler
+        )
+        print(f"Games needed: {results['games_needed']:,}")
+        return results
+    return run_simulation(
         num_games=args.num_games,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        workers=args.jobs,
+        seed=args.seed,
+        engine=args.engine,
+        detect_cycles=args.detect_cycles,
+        track_stacks=args.track_stacks,
+        deck=deck,
+        hand_size=args.hand_size,
+        rules=args.rules,
+        batch_deals=args.batch_deals,
+        cache=cache,
+        writer=writer,
+        keep_games=writer is None,
+        progress=progress,
+        profiler=profiler,
+        trace_dir=args.trace,
+        checkpoint_dir=args.checkpoint,
+        checkpoint_every=args.checkpoint_every
     )
+
+
+def run(args, deck, deck_size):
+    """Simulate, then print and save the results."""
+    # Game data is written batch by batch as games finish rather than kept
+    # in memory, so long runs with --output don't grow with the game count
+    writer = None
+    if args.output:
+        writer = open_writer(args.output, args.format)
+    
+    cache = None
+    if args.cache_file:
+        cache = SqliteOutcomeCache(args.cache_file)
+    elif args.cache:
+        cache = OutcomeCache()
+    
+    # Live progress, counted per chunk as games come back from the run
+    progress = None
+    status_server = None
+    if args.progress_interval is not None or args.status_port is not None or args.status_socket:
+        from src.progress import RunProgress, StatusServer
+        progress = RunProgress(report_interval=args.progress_interval)
+        if args.status_port is not None or args.status_socket:
+            status_server = StatusServer(progress, port=args.status_port or 0,
+                                         unix_path=args.status_socket)
+    
+    # Run simulation; profiling hooks only see games played in this process
+    profiler = None
+    with status_server or nullcontext():
+        if status_server is not None:
+            print(f"Serving run status on {status_server.address}")
+        if args.profile:
+            from src.profiling import RunProfiler
+            if args.jobs > 1:
+                print("Note: --profile runs in a single process")
+                args.jobs = 1
+            # The hooks only fire in the python loop; the other engines play
+            # the same games
+            if args.engine != 'python':
+                print("Note: --profile uses the python engine")
+                args.engine = 'python'
+            profiler = RunProfiler()
+            with profiler:
+                results = simulate(args, deck, cache, writer, progress, profiler)
+        else:
+            results = simulate(args, deck, cache, writer, progress)
     
     # Print summary statistics
-    print_summary(results['summary'])
+    with profiler.phase('summary') if profiler else nullcontext():
+        print_summary(results['summary'])
+    if cache is not None:
+        cache.close()
+        print(f"Outcome cache: {cache.hits:,} hits, {cache.misses:,} misses "
+              f"({cache.hit_rate:.1%} hit rate)\n")
+    if 'stacks' in results:
+        print_stack_summary(results['stacks'], deck_size)
     
-    # Save to CSV if requested
+    # Finish the game data file, written as the games were played
+    with profiler.phase('output') if profiler else nullcontext():
+        if writer is not None:
+            writer.close()
     if args.output:
-        results['game_data'].to_csv(args.output)
         print(f"\nGame data saved to: {args.output}")
-    
-    # Print DataFrame info
     if not args.quiet:
-        print("\nDataFrame Info:")
-        print(f"Shape: {results['game_data'].shape}")
-        print(f"\nFirst few games:")
-        print(results['game_data'].head())
-        print(f"\nBasic statistics:")
-        print(results['game_data'].describe())
+        print(f"\nSeed: {results['seed']}")
+    
+    # Print DataFrame info (games written to --output aren't kept in memory)
+    if not args.quiet and writer is None:
+        with profiler.phase('dataframe') if profiler else nullcontext():
+            print("\nDataFrame Info:")
+            print(f"Shape: {results['game_data'].shape}")
+            print(f"\nFirst few games:")
+            print(results['game_data'].head())
+            print(f"\nBasic statistics:")
+            print(results['game_data'].describe())
+    
+    if profiler is not None:
+        from src.profiling import print_profile
+        print()
+        print_profile(profiler)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,12 @@
 import statistics
 from typing import List, Dict, Any
 
+from src.columns import GameColumns
+
+# Extra quantiles reported by analyze_columns(), keyed by label
+QUANTILES = {'p90': 0.90, 'p99': 0.99, 'p99.9': 0.999}
+DEFAULT_ROUNDS_BIN_WIDTH = 100
+
 
 def analyze_results(all_game_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -104,6 +110,128 @@ def analyze_results(all_game_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     return results
 
+
+def _column(data, name: str):
+    """One column of game_data, a GameColumns or a mapping of arrays."""
+    import numpy as np
+    if isinstance(data, GameColumns):
+        return np.asarray(getattr(data, name))
+    return np.asarray(data[name])
+
+
+def _histogram(values, bin_width: int) -> Dict[int, int]:
+    """Counts per bin start, with empty bins between min and max included."""
+    import numpy as np
+    counts = np.bincount(values // bin_width)
+    first = int(values.min()) // bin_width
+    return {bin_index * bin_width: int(counts[bin_index])
+            for bin_index in range(first, len(counts))}
+
+
+def analyze_columns(data, rounds_bin_width: int = DEFAULT_ROUNDS_BIN_WIDTH) -> Dict[str, Any]:
+    """
+    Vectorized analyze_results() for games held as columns.
+
+    Gives the same keys as analyze_results() from a few NumPy passes, plus
+    'quantiles' (p90/p99/p99.9) for rounds, wars and double wars and a
+    'histograms' entry with rounds (in bins of rounds_bin_width) and wars
+    (one bin per count). Infinite games are excluded from everything but
+    their own count, as in analyze_results().
+
+    Args:
+        data: The game_data DataFrame, a GameColumns, or a mapping of
+            'rounds', 'wars', 'double_wars', 'winner' and 'hit_max_rounds'
+            arrays
+        rounds_bin_width: Width of the rounds histogram bins
+
+    Returns:
+        Summary dict (empty if there are no games)
+    """
+    import numpy as np
+
+    hit_max_rounds = _column(data, 'hit_max_rounds').astype(bool)
+    total_games = len(hit_max_rounds)
+    if not total_games:
+        return {}
+    finite = ~hit_max_rounds
+    total_finite = int(finite.sum())
+    total_infinite = total_games - total_finite
+    infinite_games = {
+        'count': total_infinite,
+        'percentage': (total_infinite / total_games) * 100,
+    }
+    if not total_finite:
+        return {
+            'total_games': total_games,
+            'rounds': {},
+            'wars': {},
+            'double_wars': {},
+            'winners': {},
+            'correlation_wars_rounds': None,
+            'infinite_games': infinite_games,
+        }
+
+    rounds = _column(data, 'rounds')[finite].astype(np.int64)
+    wars = _column(data, 'wars')[finite].astype(np.int64)
+    double_wars = _column(data, 'double_wars')[finite].astype(np.int64)
+    winner = _column(data, 'winner')[finite]
+    p1_wins = int((winner == 1).sum())
+    p2_wins = int((winner == 2).sum())
+
+    def metric_summary(values):
+        quantiles = np.quantile(values, list(QUANTILES.values()))
+        return {
+            'mean': float(values.mean()),
+            'median': float(np.median(values)),
+            'stdev': float(values.std(ddof=1)) if len(values) > 1 else 0,
+            'min': int(values.min()),
+            'max': int(values.max()),
+            'quantiles': {label: float(q) for label, q in zip(QUANTILES, quantiles)},
+        }
+
+    games_with_wars = int((wars > 0).sum())
+    games_with_double_wars = int((double_wars > 0).sum())
+    results = {
+        'total_games': total_games,
+        'rounds': metric_summary(rounds),
+        'wars': {
+            **metric_summary(wars),
+            'games_with_wars': games_with_wars,
+            'percentage_with_wars': (games_with_wars / total_finite) * 100,
+        },
+        'double_wars': {
+            **metric_summary(double_wars),
+            'games_with_double_wars': games_with_double_wars,
+            'percentage_with_double_wars': (games_with_double_wars / total_finite) * 100,
+        },
+        'winners': {
+            'player_1_wins': p1_wins,
+            'player_2_wins': p2_wins,
+            'player_1_win_percentage': (p1_wins / total_finite) * 100,
+            'player_2_win_percentage': (p2_wins / total_finite) * 100,
+        },
+        'infinite_games': infinite_games,
+        'histograms': {
+            'rounds_bin_width': rounds_bin_width,
+            'rounds': _histogram(rounds, rounds_bin_width),
+            'wars': _histogram(wars, 1),
+        },
+    }
+
+    # Correlation (finite games only)
+    if total_finite > 1:
+        rounds_dev = rounds - rounds.mean()
+        wars_dev = wars - wars.mean()
+        denominator = np.sqrt((rounds_dev ** 2).sum() * (wars_dev ** 2).sum())
+        results['correlation_wars_rounds'] = (
+            float((rounds_dev * wars_dev).sum() / denominator) if denominator != 0 else 0
+        )
+    else:
+        results['correlation_wars_rounds'] = None
+
+    return results
+
+
 def print_summary(results: Dict[str, Any]) -> None:
     """Print a formatted summary of simulation results."""
     if not results:
@@ -128,6 +256,8 @@ def print_summary(results: Dict[str, Any]) -> None:
         print(f"  Std Dev:  {r['stdev']:>10.2f}")
         print(f"  Min:      {r['min']:>10,}")
         print(f"  Max:      {r['max']:>10,}")
+        for label, value in r.get('quantiles', {}).items():
+            print(f"  {label + ':':<9} {value:>10.2f}")
 
     # Wars stats
     w = results.get('wars', {})
@@ -140,6 +270,8 @@ def print_summary(results: Dict[str, Any]) -> None:
         print(f"  Std Dev:  {w['stdev']:>10.2f}")
         print(f"  Min:      {w['min']:>10,}")
         print(f"  Max:      {w['max']:>10,}")
+        for label, value in w.get('quantiles', {}).items():
+            print(f"  {label + ':':<9} {value:>10.2f}")
         print(f"  Games w/ Wars:      {w['games_with_wars']:>10,}")
         print(f"  % Games w/ Wars:    {w['percentage_with_wars']:>10.2f}%")
 
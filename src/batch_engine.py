@@ -0,0 +1,282 @@
+"""
+Vectorized NumPy engine that plays many games of War in lockstep.
+
+Each game's hands are stored as fixed-width circular buffers (one row of a
+K x 2 x C array, where C is the deck size) with head/length indices. Every
+step advances all active games by one round; ties are resolved level by
+level with masked operations, and finished games are retired from the
+active set. Once only a few games are left they finish on play_hands().
+The rules match src.game exactly, so the same deals give the same
+rounds/wars/double_wars/winner/hit_max_rounds as play_game().
+
+Against play_hands() on the same deals this is about 1.5x faster at 5,000
+games and 2x at 20,000, and slower below a few thousand. The ~10% of games
+that run to MAX_ROUNDS keep thousands of rows stepping to the end, so the
+per-step NumPy overhead never becomes small; src.jit_engine is the engine
+for real speed.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from src.deck import create_deck, deal_cards
+from src.game import MAX_ROUNDS, WAR_CARDS_FACEDOWN, play_hands
+
+# Retired games are dropped from the batch arrays once live games fall
+# below this fraction of the rows
+COMPACT_FRACTION = 0.9
+# Once this few games are live, each lockstep round costs more than
+# playing them out one at a time, so they finish on play_hands()
+SCALAR_TAIL = 256
+
+
+def deals_to_array(deals):
+    """
+    Pack dealt hands into arrays for play_batch().
+
+    Args:
+        deals: iterable of (p1_hand, p2_hand) pairs as returned by deal_cards()
+
+    Returns:
+        tuple: (cards, p1_counts) where cards is an int8 array of shape
+        (K, deck_size) holding p1's cards followed by p2's, and p1_counts
+        is the number of cards dealt to player 1 in each game
+    """
+    deals = list(deals)
+    deck_size = len(deals[0][0]) + len(deals[0][1])
+    cards = np.empty((len(deals), deck_size), dtype=np.int8)
+    p1_counts = np.empty(len(deals), dtype=np.int64)
+    for i, (p1_hand, p2_hand) in enumerate(deals):
+        cards[i, :len(p1_hand)] = p1_hand
+        cards[i, len(p1_hand):] = p2_hand
+        p1_counts[i] = len(p1_hand)
+    return cards, p1_counts
+
+
+def play_batch(cards, p1_counts=None, max_rounds=MAX_ROUNDS):
+    """
+    Play K games of War simultaneously.
+
+    Args:
+        cards: int array of shape (K, deck_size); each row holds player 1's
+            hand (top card first) followed by player 2's
+        p1_counts: cards dealt to player 1 per game (default: half the deck)
+        max_rounds: round limit after which a game counts as infinite
+
+    Returns:
+        dict of arrays, one entry per game:
+            - rounds, wars, double_wars: int32 counters
+            - winner: int8, 1 or 2 (0 if the game hit max rounds)
+            - hit_max_rounds: bool
+    """
+    cards = np.asarray(cards, dtype=np.int8)
+    num_games, capacity = cards.shape
+    if p1_counts is None:
+        p1_counts = np.full(num_games, capacity // 2, dtype=np.int64)
+    p1_counts = np.asarray(p1_counts, dtype=np.int64)
+
+    # Per-game results, written as each game retires from the batch
+    out_rounds = np.zeros(num_games, dtype=np.int32)
+    out_wars = np.zeros(num_games, dtype=np.int32)
+    out_double_wars = np.zeros(num_games, dtype=np.int32)
+    out_winner = np.zeros(num_games, dtype=np.int8)
+    out_hit_max = np.zeros(num_games, dtype=bool)
+
+    # Circular buffers, flattened: row r's p1 hand lives at
+    # [2*r*C, 2*r*C + C) and its p2 hand at [2*r*C + C, 2*r*C + 2*C).
+    # head/length are indexed [player, row] with player 0 = p1, 1 = p2.
+    offsets = np.arange(capacity)
+    buf = np.empty((num_games, 2, capacity), dtype=np.int8)
+    buf[:, 0, :] = cards
+    shift = (offsets[None, :] + p1_counts[:, None]) % capacity
+    buf[:, 1, :] = np.take_along_axis(cards, shift, axis=1)
+    flat = buf.reshape(-1)
+
+    ids = np.arange(num_games)  # original game index of each batch row
+    head = np.zeros((2, num_games), dtype=np.int64)
+    length = np.stack([p1_counts, capacity - p1_counts])
+    rounds = np.zeros(num_games, dtype=np.int32)
+    wars = np.zeros(num_games, dtype=np.int32)
+    double_wars = np.zeros(num_games, dtype=np.int32)
+    live = np.ones(num_games, dtype=bool)
+    pot = np.empty((num_games, capacity), dtype=np.int8)
+
+    cards_needed = WAR_CARDS_FACEDOWN + 1
+
+    def retire(rows, winner, hit_max=False):
+        if not len(rows):
+            return
+        game_ids = ids[rows]
+        out_rounds[game_ids] = rounds[rows]
+        out_wars[game_ids] = wars[rows]
+        out_double_wars[game_ids] = double_wars[rows]
+        out_winner[game_ids] = winner
+        out_hit_max[game_ids] = hit_max
+        live[rows] = False
+
+    def give(rows, side, pot_cards):
+        # Append each row's pot cards, in order, to the winning side's hand
+        base = (rows * 2 + side) * capacity
+        tail = head[side, rows] + length[side, rows]
+        pos = (tail[:, None] + offsets[None, :pot_cards.shape[1]]) % capacity
+        flat[base[:, None] + pos] = pot_cards
+        length[side, rows] += pot_cards.shape[1]
+
+    num_rows = num_games
+    bases = np.arange(2 * num_games).reshape(num_games, 2).T * capacity
+    while num_rows:
+        if num_rows <= SCALAR_TAIL:
+            # The long tail of games finishes on the scalar loop, from the
+            # hands and counters they have reached
+            for row in np.flatnonzero(live):
+                p1_hand, p2_hand = (
+                    deque(flat[bases[side, row]
+                               + (head[side, row] + offsets[:length[side, row]]) % capacity].tolist())
+                    for side in (0, 1)
+                )
+                stats = play_hands(p1_hand, p2_hand, max_rounds - int(rounds[row]))
+                game_id = ids[row]
+                out_rounds[game_id] = rounds[row] + stats['rounds']
+                out_wars[game_id] = wars[row] + stats['wars']
+                out_double_wars[game_id] = double_wars[row] + stats['double_wars']
+                out_winner[game_id] = stats['winner'] or 0
+                out_hit_max[game_id] = stats['hit_max_rounds']
+            break
+
+        # Check if either player is out of cards
+        p1_out = live & (length[0] == 0)
+        p2_out = live & ~p1_out & (length[1] == 0)
+        retire(np.flatnonzero(p1_out), 2)
+        retire(np.flatnonzero(p2_out), 1)
+
+        # Draw top cards (retired rows draw too, but are never read again)
+        top = flat[bases + head]
+        head += 1
+        head[head == capacity] = 0
+        length -= 1
+
+        # The higher card takes both, p1's card first. The two cells past
+        # the end of a hand are always free, so the cards are written for
+        # every row and only the length update is masked.
+        p2_higher = top[1] > top[0]
+        tail = np.where(p2_higher, head[1] + length[1], head[0] + length[0])
+        base = bases[0] + p2_higher * capacity
+        flat[base + tail % capacity] = top[0]
+        flat[base + (tail + 1) % capacity] = top[1]
+        decided = live & (top[0] != top[1])
+        length[0] += 2 * (decided & ~p2_higher)
+        length[1] += 2 * (decided & p2_higher)
+
+        # War! Resolve one level at a time for every tied game
+        at_war = np.flatnonzero(live & (top[0] == top[1]))
+        if len(at_war):
+            pot[at_war, 0] = top[0, at_war]
+            pot[at_war, 1] = top[1, at_war]
+            pot_len = 2
+            depth = 0
+        while len(at_war):
+            wars[at_war] += 1
+            if depth > 0:
+                double_wars[at_war] += 1
+
+            # Players without enough cards for the war lose
+            p1_short = length[0, at_war] < cards_needed
+            p2_short = ~p1_short & (length[1, at_war] < cards_needed)
+            retire(at_war[p1_short], 2)
+            retire(at_war[p2_short], 1)
+            at_war = at_war[~(p1_short | p2_short)]
+            if not len(at_war):
+                break
+
+            # Place cards facedown, then the faceup pair. Every game at the
+            # same war depth has the same pot size.
+            war_head = head[:, at_war]
+            pos = (war_head[:, :, None] + offsets[:cards_needed]) % capacity
+            drawn = flat[bases[:, at_war, None] + pos]
+            head[:, at_war] = (war_head + cards_needed) % capacity
+            length[:, at_war] -= cards_needed
+            # Cards go into the pot alternating p1, p2 as they are played
+            pot[at_war, pot_len:pot_len + 2 * cards_needed] = (
+                drawn.transpose(1, 2, 0).reshape(len(at_war), -1)
+            )
+            pot_len += 2 * cards_needed
+            war_cards = drawn[:, :, -1]
+
+            won = war_cards[0] != war_cards[1]
+            winners = at_war[won]
+            give(winners, (war_cards[1, won] > war_cards[0, won]).astype(np.int64),
+                 pot[winners, :pot_len])
+            at_war = at_war[~won]
+            depth += 1
+
+        # Games that ended mid-war don't count the round
+        rounds += live
+
+        # Check for max rounds (potential infinite game)
+        capped = np.flatnonzero(live & (rounds >= max_rounds))
+        retire(capped, 0, hit_max=True)
+
+        # Compact the batch once enough games have retired
+        num_live = np.count_nonzero(live)
+        if num_live <= num_rows * COMPACT_FRACTION:
+            keep = np.flatnonzero(live)
+            buf = buf[keep]
+            flat = buf.reshape(-1)
+            ids, head, length = ids[keep], head[:, keep], length[:, keep]
+            rounds, wars, double_wars = rounds[keep], wars[keep], double_wars[keep]
+            live = live[keep]
+            pot = pot[keep]
+            num_rows = num_live
+            bases = np.arange(2 * num_rows).reshape(num_rows, 2).T * capacity
+
+    return {
+        'rounds': out_rounds,
+        'wars': out_wars,
+        'double_wars': out_double_wars,
+        'winner': out_winner,
+        'hit_max_rounds': out_hit_max,
+    }
+
+
+def play_dealt(cards, p1_counts=None, max_rounds=MAX_ROUNDS):
+    """
+    Play already-dealt games, e.g. from src.dealing, with the batch engine.
+
+    Args:
+        cards, p1_counts, max_rounds: As in play_batch()
+
+    Returns:
+        list of per-game statistics dicts in the same shape as play_game()
+    """
+    results = play_batch(cards, p1_counts, max_rounds)
+    return [
+        {
+            'rounds': int(r),
+            'wars': int(w),
+            'double_wars': int(d),
+            'winner': int(win) or None,
+            'hit_max_rounds': bool(hit),
+        }
+        for r, w, d, win, hit in zip(
+            results['rounds'], results['wars'], results['double_wars'],
+            results['winner'], results['hit_max_rounds'],
+        )
+    ]
+
+
+def play_games(rngs, max_rounds=MAX_ROUNDS):
+    """
+    Deal and play one game per RNG with the batch engine.
+
+    Args:
+        rngs: iterable of random.Random streams, one per game, used exactly
+            as play_game(rng=...) would use them
+        max_rounds: round limit after which a game counts as infinite
+
+    Returns:
+        list of per-game statistics dicts in the same shape as play_game()
+    """
+    deck = create_deck()
+    cards, p1_counts = deals_to_array(deal_cards(deck, rng) for rng in rngs)
+    return play_dealt(cards, p1_counts, max_rounds)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the War game engine and analysis.
+
+Times each phase of a run (deal, play, DataFrame build, analysis) across
+several game counts with a fixed seed, records games/rounds/wars per second
+and peak traced memory, and writes the results as a JSON baseline. With
+--compare, the new results are checked against a saved baseline and any
+metric that got worse by more than the threshold is flagged.
+
+Usage:
+    python -m src.bench -o baseline.json
+    python -m src.bench --compare baseline.json --threshold 0.10
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from src.analysis import analyze_results
+from src.deck import create_deck, deal_cards
+from src.game import play_hands
+from src.seeding import game_rng
+from src.simulation import ENGINES, games_to_dataframe
+
+DEFAULT_GAME_COUNTS = (1000, 5000, 20000)
+DEFAULT_SEED = 12345
+
+# Metrics where a larger value is better; every other timing is
+# lower-is-better
+THROUGHPUT_METRICS = ('games_per_sec', 'rounds_per_sec', 'wars_per_sec')
+TIME_METRICS = ('deal_sec', 'play_sec', 'dataframe_sec', 'analysis_sec', 'total_sec')
+
+
+def _play(deals, engine):
+    """Play pre-dealt games with the chosen engine."""
+    if engine == 'python':
+        return [play_hands(deque(p1_hand), deque(p2_hand)) for p1_hand, p2_hand in deals]
+    # The array engines play the same deals packed as a DealBatch
+    from src.batch_engine import deals_to_array
+    from src.dealing import DealBatch, play_deal_batch
+    return play_deal_batch(DealBatch(*deals_to_array(deals)), engine)
+
+
+def run_phases(num_games, seed=DEFAULT_SEED, engine='python'):
+    """
+    Run one full pass of deal, play, DataFrame build and analysis.
+
+    Returns:
+        dict: per-phase wall times plus round and war totals
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    deck = create_deck()
+    deals = [deal_cards(deck, game_rng(seed, i)) for i in range(num_games)]
+    timings['deal_sec'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    games = _play(deals, engine)
+    timings['play_sec'] = time.perf_counter() - start
+    for game_num, game in enumerate(games, 1):
+        game['game_num'] = game_num
+
+    start = time.perf_counter()
+    games_to_dataframe(games)
+    timings['dataframe_sec'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyze_results(games)
+    timings['analysis_sec'] = time.perf_counter() - start
+
+    timings['total_sec'] = sum(timings.values())
+    timings['rounds'] = sum(game['rounds'] for game in games)
+    timings['wars'] = sum(game['wars'] for game in games)
+    return timings
+
+
+def benchmark(num_games, seed=DEFAULT_SEED, engine='python', repeat=3):
+    """
+    Benchmark one game count, keeping the fastest of several passes.
+
+    Peak memory is measured in a separate traced pass so tracing overhead
+    doesn't distort the timings.
+
+    Returns:
+        dict: phase timings, throughput and peak memory for the game count
+    """
+    passes = [run_phases(num_games, seed, engine) for _ in range(repeat)]
+    result = {metric: min(p[metric] for p in passes) for metric in TIME_METRICS}
+    rounds, wars = passes[0]['rounds'], passes[0]['wars']
+
+    # Throughput is based on play time, the phase the engines compete on
+    result['games_per_sec'] = num_games / result['play_sec']
+    result['rounds_per_sec'] = rounds / result['play_sec']
+    result['wars_per_sec'] = wars / result['play_sec']
+    result['rounds'] = rounds
+    result['wars'] = wars
+
+    tracemalloc.start()
+    run_phases(num_games, seed, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result['peak_memory_bytes'] = peak
+    return result
+
+
+def run_suite(game_counts=DEFAULT_GAME_COUNTS, seed=DEFAULT_SEED, engine='python',
+              repeat=3, verbose=True):
+    """
+    Benchmark every game count and return a JSON-serializable report.
+    """
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': engine,
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': {},
+    }
+    for num_games in game_counts:
+        result = benchmark(num_games, seed, engine, repeat)
+        report['results'][str(num_games)] = result
+        if verbose:
+            print(f"{num_games:>8,} games: {result['games_per_sec']:>10,.0f} games/s "
+                  f"{result['rounds_per_sec']:>12,.0f} rounds/s "
+                  f"{result['wars_per_sec']:>10,.0f} wars/s "
+                  f"peak {result['peak_memory_bytes'] / 2 ** 20:>7.1f} MiB")
+            print("          " + "  ".join(
+                f"{metric[:-4]} {result[metric]:.3f}s" for metric in TIME_METRICS
+            ))
+    return report
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Find metrics that regressed by more than threshold (a fraction).
+
+    Returns:
+        list of (game_count, metric, baseline_value, current_value,
+        relative_change) tuples, where relative_change is the fractional
+        slowdown
+    """
+    regressions = []
+    for count, base in baseline['results'].items():
+        new = current['results'].get(count)
+        if new is None:
+            continue
+        for metric in THROUGHPUT_METRICS:
+            change = (base[metric] - new[metric]) / base[metric]
+            if change > threshold:
+                regressions.append((count, metric, base[metric], new[metric], change))
+        for metric in TIME_METRICS + ('peak_memory_bytes',):
+            if base[metric] <= 0:
+                continue
+            change = (new[metric] - base[metric]) / base[metric]
+            if change > threshold:
+                regressions.append((count, metric, base[metric], new[metric], change))
+    return regressions
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark War game engine and analysis throughput'
+    )
+    parser.add_argument(
+        '-n', '--games',
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_GAME_COUNTS),
+        help='Game counts to benchmark (default: 1000 5000 20000)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=DEFAULT_SEED,
+        help=f'Seed for the benchmark deals (default: {DEFAULT_SEED})'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='python',
+        help='Game engine to benchmark (default: python)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Passes per game count; the fastest is kept (default: 3)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='Write the results as a JSON baseline to this path'
+    )
+    parser.add_argument(
+        '--compare',
+        type=str,
+        help='Baseline JSON to compare against; exits 1 on regression'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.10,
+        help='Relative slowdown that counts as a regression (default: 0.10)'
+    )
+
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.games, args.seed, args.engine, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBenchmark results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS (worse by more than {args.threshold:.0%}):")
+            for count, metric, old, new, change in regressions:
+                print(f"  {count:>8} games  {metric:<18} {old:>14,.3f} -> {new:>14,.3f}  ({change:+.1%})")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
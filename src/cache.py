@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 100000  # Outcomes kept in memory
+COMMIT_EVERY = 10000  # New outcomes between SQLite commits
+
+Outcome = Tuple[int, int, int, Optional[int], bool]
+OUTCOME_FIELDS = ('rounds', 'wars', 'double_wars', 'winner', 'hit_max_rounds')
+
+
+def encode_deal(p1_hand, p2_hand) -> bytes:
+    """
+    Pack two dealt hands into a compact key, 4 bits per card.
+
+    The first byte is player 1's hand size; the cards of both hands follow
+    in deal order, two per byte. A standard deal packs into 27 bytes.
+
+    Raises:
+        ValueError: if a card is outside 0-15 or player 1 has over 255 cards
+    """
+    cards = list(p1_hand) + list(p2_hand)
+    if min(cards) < 0 or max(cards) > 15 or len(p1_hand) > 255:
+        raise ValueError("Deal keys need card values 0-15 and at most 255 cards in hand 1")
+    if len(cards) % 2:
+        cards.append(0)
+    packed = bytes(cards[i] << 4 | cards[i + 1] for i in range(0, len(cards), 2))
+    return bytes((len(p1_hand),)) + packed
+
+
+class OutcomeCache:
+    """
+    In-memory LRU cache of game outcomes keyed by encode_deal().
+
+    War is deterministic once dealt, so a deal's outcome can be reused
+    whenever the same deal comes up again. Counts hits and misses so the
+    hit rate shows whether the cache pays for itself.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[bytes, Outcome]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached outcome for a deal, or None."""
+        outcome = self._lookup(key)
+        if outcome is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(zip(OUTCOME_FIELDS, outcome))
+
+    def put(self, key: bytes, game: Dict[str, Any]) -> None:
+        """Store a deal's outcome (a play_hands() result)."""
+        self._remember(key, tuple(game[field] for field in OUTCOME_FIELDS))
+
+    def _lookup(self, key: bytes) -> Optional[Outcome]:
+        outcome = self._entries.get(key)
+        if outcome is not None:
+            self._entries.move_to_end(key)
+        return outcome
+
+    def _remember(self, key: bytes, outcome: Outcome) -> None:
+        self._entries[key] = outcome
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self),
+        }
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SqliteOutcomeCache(OutcomeCache):
+    """
+    Outcome cache persisted to an SQLite file, with an in-memory LRU in front.
+
+    Outcomes survive between runs, so repeated-seed regression runs and
+    reduced-deck studies start warm. New outcomes are committed in batches
+    of COMMIT_EVERY and on close().
+    """
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_CACHE_SIZE):
+        import sqlite3
+        super().__init__(maxsize)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outcomes ("
+            "deal BLOB PRIMARY KEY, rounds INTEGER, wars INTEGER, "
+            "double_wars INTEGER, winner INTEGER, hit_max_rounds INTEGER)"
+        )
+        self._uncommitted = 0
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
+
+    def _lookup(self, key):
+        outcome = super()._lookup(key)
+        if outcome is None:
+            row = self._connection.execute(
+                "SELECT rounds, wars, double_wars, winner, hit_max_rounds "
+                "FROM outcomes WHERE deal = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                outcome = row[:4] + (bool(row[4]),)
+                super()._remember(key, outcome)
+        return outcome
+
+    def _remember(self, key, outcome):
+        super()._remember(key, outcome)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?, ?, ?, ?)", (key,) + outcome
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
@@ -0,0 +1,114 @@
+import csv
+import json
+import os
+from typing import Dict, Any, Iterator, List, Optional
+
+from src.output import CsvGameWriter
+from src.streaming import StreamingSummary
+
+CHECKPOINT_FILE = 'checkpoint.json'
+DEFAULT_CHECKPOINT_EVERY = 100000  # Games between checkpoints
+
+
+def _parse_value(column: str, value: str):
+    """Convert one CSV cell back to the type play_game() produced."""
+    if value == '':
+        return None
+    if column == 'hit_max_rounds':
+        return value == 'True'
+    return int(value)
+
+
+class Checkpoint:
+    """
+    Periodic on-disk snapshots of a simulation run.
+
+    A checkpoint directory holds checkpoint.json (run configuration, number
+    of completed games, list of segment files and the StreamingSummary
+    state) plus one CSV segment of per-game rows per checkpoint. Games are
+    dealt from per-game seed substreams, so the completed-game count is the
+    whole RNG position: a resumed run continues with exactly the games an
+    uninterrupted run would have played. checkpoint.json is replaced
+    atomically, so a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, directory: str, config: Dict[str, Any],
+                 every: int = DEFAULT_CHECKPOINT_EVERY, completed_games: int = 0,
+                 segments: Optional[List[str]] = None,
+                 accumulator: Optional[StreamingSummary] = None):
+        self.directory = directory
+        self.config = config
+        self.every = every
+        self.completed_games = completed_games
+        self.segments = segments or []
+        self.accumulator = accumulator or StreamingSummary()
+        self._pending = []
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, CHECKPOINT_FILE)
+
+    @classmethod
+    def create(cls, directory: str, config: Dict[str, Any],
+               every: int = DEFAULT_CHECKPOINT_EVERY) -> 'Checkpoint':
+        """Start a new checkpoint directory for a run."""
+        os.makedirs(directory, exist_ok=True)
+        checkpoint = cls(directory, config, every)
+        if os.path.exists(checkpoint.path):
+            raise FileExistsError(
+                f"{directory} already holds a checkpoint; resume it instead"
+            )
+        checkpoint._save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, directory: str) -> 'Checkpoint':
+        """Load the latest checkpoint from a directory."""
+        with open(os.path.join(directory, CHECKPOINT_FILE)) as f:
+            state = json.load(f)
+        return cls(
+            directory,
+            state['config'],
+            state['every'],
+            state['completed_games'],
+            state['segments'],
+            StreamingSummary.from_dict(state['accumulator']),
+        )
+
+    def record(self, chunk_stats: List[Dict[str, Any]]) -> None:
+        """Add a finished chunk of games, checkpointing every `every` games."""
+        self.accumulator.update(chunk_stats)
+        self._pending.extend(chunk_stats)
+        if len(self._pending) >= self.every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any pending games and the accumulator state to disk."""
+        if self._pending:
+            name = f"games_{self.completed_games:012d}.csv"
+            with CsvGameWriter(os.path.join(self.directory, name)) as writer:
+                writer.write(self._pending)
+            self.completed_games += len(self._pending)
+            self.segments.append(name)
+            self._pending = []
+        self._save()
+
+    def _save(self) -> None:
+        state = {
+            'config': self.config,
+            'every': self.every,
+            'completed_games': self.completed_games,
+            'segments': self.segments,
+            'accumulator': self.accumulator.to_dict(),
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def iter_games(self) -> Iterator[Dict[str, Any]]:
+        """Read back every checkpointed game, in game order."""
+        for name in self.segments:
+            with open(os.path.join(self.directory, name), newline='') as f:
+                for row in csv.DictReader(f):
+                    yield {column: _parse_value(column, value) for column, value in row.items()}
@@ -0,0 +1,92 @@
+from array import array
+from typing import Dict, Any, Iterable
+
+
+def _pandas():
+    """Import pandas, which is only needed to build DataFrames."""
+    try:
+        import pandas
+    except ImportError as exc:
+        raise ImportError(
+            "Building game_data requires pandas (pip install pandas)"
+        ) from exc
+    return pandas
+
+
+class GameColumns:
+    """
+    Per-game statistics stored column by column in typed arrays.
+
+    Holding a run's games as a few flat arrays instead of one dict per game
+    keeps memory small, and to_dataframe() hands the arrays to pandas
+    directly, so game_data is only paid for when it is actually used.
+    Games where a value is None (winner of an infinite game, cycle columns
+    of a game that never looped) store 0 or -1 in its place.
+    """
+
+    INT_COLUMNS = ('game_num', 'rounds', 'wars', 'double_wars')
+
+    def __init__(self):
+        self.game_num = array('q')
+        self.rounds = array('q')
+        self.wars = array('q')
+        self.double_wars = array('q')
+        self.winner = array('b')  # 0 when the game hit max rounds
+        self.hit_max_rounds = array('b')
+        self.cycle_length = None  # array('q'), -1 for no loop (only with cycle detection)
+        self.cycle_start = None
+
+    def __len__(self):
+        return len(self.game_num)
+
+    def append(self, game: Dict[str, Any]) -> None:
+        """Add one game's statistics dict (including 'game_num')."""
+        if self.cycle_length is None and not self.game_num and 'cycle_length' in game:
+            self.cycle_length = array('q')
+            self.cycle_start = array('q')
+        self.game_num.append(game['game_num'])
+        self.rounds.append(game['rounds'])
+        self.wars.append(game['wars'])
+        self.double_wars.append(game['double_wars'])
+        self.winner.append(game['winner'] or 0)
+        self.hit_max_rounds.append(game['hit_max_rounds'])
+        if self.cycle_length is not None:
+            cycle_length = game['cycle_length']
+            self.cycle_length.append(-1 if cycle_length is None else cycle_length)
+            self.cycle_start.append(-1 if cycle_length is None else game['cycle_start'])
+
+    def extend(self, games: Iterable[Dict[str, Any]]) -> 'GameColumns':
+        """Add every game from an iterable; returns self for chaining."""
+        for game in games:
+            self.append(game)
+        return self
+
+    def to_dataframe(self):
+        """
+        Build the game_data DataFrame, indexed by game_num.
+
+        Columns with missing values (winner, cycle columns) are float with
+        NaN for the missing entries, as pandas builds them from None.
+        """
+        import numpy as np
+        pd = _pandas()
+
+        def column(values, dtype, missing=None):
+            # Copy out of the array buffer so the array can keep growing
+            data = np.frombuffer(values, dtype=dtype).astype(np.int64)
+            if missing is not None and (data == missing).any():
+                data = np.where(data == missing, np.nan, data)
+            return data
+
+        data = {
+            'rounds': column(self.rounds, np.int64),
+            'wars': column(self.wars, np.int64),
+            'double_wars': column(self.double_wars, np.int64),
+            'winner': column(self.winner, np.int8, missing=0),
+            'hit_max_rounds': column(self.hit_max_rounds, np.int8).astype(bool),
+        }
+        if self.cycle_length is not None:
+            data['cycle_length'] = column(self.cycle_length, np.int64, missing=-1)
+            data['cycle_start'] = column(self.cycle_start, np.int64, missing=-1)
+        index = pd.Index(column(self.game_num, np.int64), name='game_num')
+        return pd.DataFrame(data, index=index)
@@ -0,0 +1,132 @@
+import random
+from collections import deque
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.deck import create_deck
+
+# Batched deals are drawn in fixed blocks of games, each from its own
+# stream, so a game's deal depends only on the run seed and its index
+DEAL_BLOCK = 1000
+
+
+class DealBatch(NamedTuple):
+    """
+    N deals as a compact array any engine can play.
+
+    cards is an int8 array of shape (N, deck_size) holding player 1's hand
+    (top card first) followed by player 2's; p1_counts holds the number of
+    cards dealt to player 1 in each deal.
+    """
+
+    cards: np.ndarray
+    p1_counts: np.ndarray
+
+    def __len__(self):
+        return len(self.cards)
+
+    def hands(self, index: int):
+        """Deal index as a (p1_hand, p2_hand) pair of deques."""
+        row = self.cards[index].tolist()
+        p1_count = int(self.p1_counts[index])
+        return deque(row[:p1_count]), deque(row[p1_count:])
+
+
+def deal_batch(num_deals: int, rng: np.random.Generator,
+               deck: Optional[List[int]] = None,
+               hand_size: Optional[int] = None) -> DealBatch:
+    """
+    Shuffle num_deals decks in one call.
+
+    Each row is the deck ordered by the argsort of a row of uniform random
+    numbers, which is a uniform shuffle done for every row at once.
+
+    Args:
+        num_deals: Number of deals
+        rng: NumPy Generator the shuffles are drawn from
+        deck: Cards to deal, as from create_deck() (standard deck if None)
+        hand_size: Cards dealt to player 1 (half the deck if None)
+
+    Returns:
+        DealBatch of the deals
+    """
+    deck = np.asarray(create_deck() if deck is None else deck, dtype=np.int8)
+    if hand_size is None:
+        hand_size = len(deck) // 2
+    if not 0 < hand_size < len(deck):
+        raise ValueError(f"hand_size must leave both players cards, got {hand_size}")
+    order = np.argsort(rng.random((num_deals, len(deck))), axis=1)
+    return DealBatch(deck[order], np.full(num_deals, hand_size, dtype=np.int16))
+
+
+def deal_range(seed: int, first_game: int, last_game: int,
+               deck: Optional[List[int]] = None,
+               hand_size: Optional[int] = None) -> DealBatch:
+    """
+    Batched deals for zero-based games first_game..last_game-1 of a run.
+
+    Block b (games b * DEAL_BLOCK onwards) is dealt from the NumPy stream
+    seeded with (seed, b), so the same seed gives the same deals however a
+    run is split into chunks, workers or shards. These deals come from a
+    different generator than the per-game random.Random streams, so a run
+    with batched deals plays different games than one without.
+    """
+    blocks = []
+    for block in range(first_game // DEAL_BLOCK, (last_game - 1) // DEAL_BLOCK + 1):
+        deals = deal_batch(DEAL_BLOCK, np.random.default_rng([seed, block]), deck, hand_size)
+        start = max(first_game - block * DEAL_BLOCK, 0)
+        stop = min(last_game - block * DEAL_BLOCK, DEAL_BLOCK)
+        blocks.append(DealBatch(deals.cards[start:stop], deals.p1_counts[start:stop]))
+    if len(blocks) == 1:
+        return blocks[0]
+    return DealBatch(np.concatenate([b.cards for b in blocks]),
+                     np.concatenate([b.p1_counts for b in blocks]))
+
+
+def play_deal_batch(deals: DealBatch, engine: str = 'python',
+                    rngs: Optional[Iterable[random.Random]] = None,
+                    **game_options) -> List[Dict[str, Any]]:
+    """
+    Play every deal of a batch with any engine.
+
+    Args:
+        deals: DealBatch from deal_batch(), deal_range() or load_deals()
+        engine: 'python', 'numpy' or 'jit'
+        rngs: random.Random per deal for rules that shuffle winnings, e.g.
+            the run's game_rng() streams (global random module if None)
+        **game_options: play_game() options the engine supports (none for
+            numpy)
+
+    Returns:
+        list of per-game statistics dicts in deal order
+    """
+    if not len(deals):
+        return []
+    if engine == 'numpy':
+        if game_options:
+            raise ValueError(f"The numpy engine does not support {sorted(game_options)}")
+        from src.batch_engine import play_dealt
+        return play_dealt(deals.cards, deals.p1_counts)
+    if engine == 'jit':
+        from src.jit_engine import NUMBA_AVAILABLE, play_dealt
+        if NUMBA_AVAILABLE:
+            return play_dealt(deals.cards, deals.p1_counts, **game_options)
+
+    from src.game import play_game
+    if rngs is None:
+        rngs = [None] * len(deals)
+    return [play_game(hands=deals.hands(i), rng=rng, **game_options)
+            for i, rng in zip(range(len(deals)), rngs)]
+
+
+def save_deals(path: str, deals: DealBatch) -> None:
+    """Store a batch as an uncompressed .npz file (52 bytes per standard deal)."""
+    with open(path, 'wb') as f:
+        np.savez(f, cards=deals.cards, p1_counts=deals.p1_counts)
+
+
+def load_deals(path: str) -> DealBatch:
+    """Read a batch written by save_deals()."""
+    with np.load(path) as data:
+        return DealBatch(data['cards'], data['p1_counts'])
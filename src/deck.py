@@ -1,4 +1,3 @@
-# src/deck.py
 import random
 from collections import deque
 
@@ -6,26 +5,34 @@ from collections import deque
 CARD_RANKS = list(range(2, 15))  # 2-14 (J=11, Q=12, K=13, A=14)
 NUM_SUITS = 4
 
-def create_deck():
+def create_deck(ranks=CARD_RANKS, suits=NUM_SUITS):
     """
-    Creates a standard 52-card deck.
+    Creates a deck with `suits` cards of each rank (standard 52-card deck by default).
     Returns a list of integers where suits don't matter, just rank.
     """
     deck = []
-    for rank in CARD_RANKS:
-        for _ in range(NUM_SUITS):
+    for rank in ranks:
+        for _ in range(suits):
             deck.append(rank)
     return deck
 
-def deal_cards(deck):
+def deal_cards(deck, rng=None, hand_size=None):
     """
-    Shuffles deck and deals 26 cards to each player.
+    Shuffles deck and deals hand_size cards to player 1 and the rest to
+    player 2 (half each by default, i.e. 26 cards from a standard deck).
     Returns two deques (for efficient pop/append operations).
+
+    rng is an optional random.Random used for the shuffle; the global
+    random module is used when it is None.
     """
+    if hand_size is None:
+        hand_size = len(deck) // 2
+    if not 0 < hand_size < len(deck):
+        raise ValueError(f"hand_size must leave both players cards, got {hand_size}")
     shuffled = deck.copy()
-    random.shuffle(shuffled)
+    (rng or random).shuffle(shuffled)
     
-    p1_hand = deque(shuffled[:26])
-    p2_hand = deque(shuffled[26:])
+    p1_hand = deque(shuffled[:hand_size])
+    p2_hand = deque(shuffled[hand_size:])
     
-    return p1_hand, p2_hand
\ No newline at end of file
+    return p1_hand, p2_hand
@@ -1,12 +1,59 @@
+import random
+from array import array
 from collections import deque
+from functools import lru_cache, partial
 from src.deck import create_deck, deal_cards
+from src.rules import STANDARD_RULES, as_rules
 
 # Constants
 MAX_ROUNDS = 3000  # Prevent infinite games
 WAR_CARDS_FACEDOWN = 3  # Standard war rules
+STANDARD_DECK = create_deck()  # Only ever copied by deal_cards(), so built once
 
+# Instrumentation hooks: callbacks per event, see add_hook()
+HOOK_EVENTS = ('on_game_start', 'on_round', 'on_war', 'on_game_end')
+_hooks = {event: [] for event in HOOK_EVENTS}
 
-def play_round(p1_hand, p2_hand, stats):
+
+def add_hook(event, callback):
+    """
+    Attach a callback to a game event.
+    
+    Events and their callback arguments:
+        on_game_start(p1_hand, p2_hand): hands dealt, before the first round
+        on_round(rounds, p1_cards, p2_cards): a round completed; rounds so
+            far and each player's card count
+        on_war(depth): a war started; depth 0 for a war, 1 for a war
+            during that war, and so on
+        on_game_end(stats): game over, with play_game()'s statistics
+    
+    Hooks only fire in the process that plays the game. While no on_round
+    or on_war hook is attached, games run on the uninstrumented fast loop,
+    so the hooks cost nothing per round. on_round and on_war don't fire for
+    games played with detect_cycles or answered from a cache.
+    """
+    if event not in _hooks:
+        raise ValueError(f"Unknown hook event {event!r}; expected one of {HOOK_EVENTS}")
+    _hooks[event].append(callback)
+
+
+def remove_hook(event, callback):
+    """Detach a callback attached with add_hook()."""
+    _hooks[event].remove(callback)
+
+
+def _arrange_winnings(cards, rules, rng):
+    """Put won cards in the order the rules return them to a hand."""
+    if rules.winnings == 'shuffle':
+        (rng or random).shuffle(cards)
+    elif rules.winnings == 'high_first':
+        cards.sort(reverse=True)
+    elif rules.winnings == 'low_first':
+        cards.sort()
+    return cards
+
+
+def play_round(p1_hand, p2_hand, stats, rules=None, rng=None, max_rounds=MAX_ROUNDS):
     """
     Play a single round of War.
     
@@ -14,6 +61,9 @@ def play_round(p1_hand, p2_hand, stats):
         p1_hand: deque of player 1's cards
         p2_hand: deque of player 2's cards
         stats: dictionary tracking game statistics
+        rules: WarRules variant (standard rules if None)
+        rng: random.Random for rules that shuffle winnings
+        max_rounds: round limit after which the game counts as infinite
     
     Returns:
         bool: True if game should continue, False if game is over
@@ -32,25 +82,26 @@ def play_round(p1_hand, p2_hand, stats):
     
     # Cards in play for this round
     cards_in_play = [p1_card, p2_card]
+    rules = rules or STANDARD_RULES
     
     # Compare cards
     if p1_card > p2_card:
         # Player 1 wins
-        p1_hand.extend(cards_in_play)
+        p1_hand.extend(_arrange_winnings(cards_in_play, rules, rng))
     elif p2_card > p1_card:
         # Player 2 wins
-        p2_hand.extend(cards_in_play)
+        p2_hand.extend(_arrange_winnings(cards_in_play, rules, rng))
     else:
         # War!
         stats['wars'] += 1
-        war_result = handle_war(p1_hand, p2_hand, cards_in_play, stats)
+        war_result = handle_war(p1_hand, p2_hand, cards_in_play, stats, rules=rules, rng=rng)
         if not war_result:
             return False  # Game ended during war
     
     stats['rounds'] += 1
         
     # Check for max rounds (potential infinite game)
-    if stats['rounds'] >= MAX_ROUNDS:
+    if stats['rounds'] >= max_rounds:
         stats['hit_max_rounds'] = True
         stats['winner'] = None
         return False
@@ -58,7 +109,7 @@ def play_round(p1_hand, p2_hand, stats):
     return True
 
 
-def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0):
+def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0, rules=None, rng=None):
     """
     Handle a war scenario when cards tie.
     
@@ -68,6 +119,8 @@ def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0):
         cards_in_play: list of cards currently in the pot
         stats: dictionary tracking game statistics
         war_depth: recursion depth for tracking double/triple wars
+        rules: WarRules variant (standard rules if None)
+        rng: random.Random for rules that shuffle winnings
     
     Returns:
         bool: True if war completed successfully, False if game ended
@@ -77,7 +130,14 @@ def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0):
         stats['double_wars'] += 1
     
     # Each player needs 4 cards total (3 facedown + 1 faceup)
-    cards_needed = WAR_CARDS_FACEDOWN + 1
+    rules = rules or STANDARD_RULES
+    cards_needed = rules.facedown + 1
+    p1_facedown = p2_facedown = rules.facedown
+    if rules.short_war == 'last_card':
+        # A short player turns their last card faceup instead of losing
+        p1_facedown = min(p1_facedown, len(p1_hand) - 1)
+        p2_facedown = min(p2_facedown, len(p2_hand) - 1)
+        cards_needed = 1
     
     # Check if players have enough cards
     if len(p1_hand) < cards_needed:
@@ -90,9 +150,11 @@ def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0):
         return False
     
     # Place cards facedown
-    for _ in range(WAR_CARDS_FACEDOWN):
-        cards_in_play.append(p1_hand.popleft())
-        cards_in_play.append(p2_hand.popleft())
+    for i in range(max(p1_facedown, p2_facedown)):
+        if i < p1_facedown:
+            cards_in_play.append(p1_hand.popleft())
+        if i < p2_facedown:
+            cards_in_play.append(p2_hand.popleft())
     
     # Draw faceup cards
     p1_card = p1_hand.popleft()
@@ -102,35 +164,242 @@ def handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth=0):
     # Compare faceup cards
     if p1_card > p2_card:
         # Player 1 wins the war
-        p1_hand.extend(cards_in_play)
+        p1_hand.extend(_arrange_winnings(cards_in_play, rules, rng))
         return True
     elif p2_card > p1_card:
         # Player 2 wins the war
-        p2_hand.extend(cards_in_play)
+        p2_hand.extend(_arrange_winnings(cards_in_play, rules, rng))
         return True
     else:
         # Another war! (recursive)
         stats['wars'] += 1
-        return handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth + 1)
+        return handle_war(p1_hand, p2_hand, cards_in_play, stats, war_depth + 1, rules, rng)
 
 
-def play_game():
+def play_hands(p1_hand, p2_hand, max_rounds=MAX_ROUNDS, stacks=None, rng=None):
     """
-    Play a complete game of War and return statistics.
+    Play dealt hands to the end with an allocation-free round loop.
+    
+    Follows exactly the rules of play_round() and handle_war(), but keeps
+    the counters in locals, resolves wars iteratively, and collects war
+    cards in a pot buffer allocated once per game, so a round allocates
+    nothing on the heap.
+    
+    Args:
+        p1_hand: deque of player 1's cards
+        p2_hand: deque of player 2's cards
+        max_rounds: round limit after which the game counts as infinite
+        stacks: optional array('b') that player 1's stack size is appended
+            to after every completed round
+        rng: unused; the standard rules never shuffle (accepted so all
+            rules_player() loops share one signature)
     
     Returns:
-        dict: Statistics from the game including:
-            - rounds: total number of rounds
-            - wars: number of wars
-            - double_wars: number of wars during wars
-            - winner: 1, 2, or None (if hit max rounds)
-            - hit_max_rounds: bool indicating if game hit the limit
+        dict: Statistics in the same shape as play_game()
     """
-    # Initialize game
-    deck = create_deck()
-    p1_hand, p2_hand = deal_cards(deck)
+    record_stack = stacks.append if stacks is not None else None
+    pot = [0] * (len(p1_hand) + len(p2_hand))
+    p1_draw, p2_draw = p1_hand.popleft, p2_hand.popleft
+    p1_take, p2_take = p1_hand.append, p2_hand.append
+    cards_needed = WAR_CARDS_FACEDOWN + 1
+    
+    rounds = wars = double_wars = 0
+    winner = None
+    hit_max_rounds = False
+    
+    while True:
+        # Check if either player is out of cards
+        if not p1_hand:
+            winner = 2
+            break
+        if not p2_hand:
+            winner = 1
+            break
+        
+        p1_card = p1_draw()
+        p2_card = p2_draw()
+        if p1_card > p2_card:
+            p1_take(p1_card)
+            p1_take(p2_card)
+        elif p2_card > p1_card:
+            p2_take(p1_card)
+            p2_take(p2_card)
+        else:
+            # War! Each iteration is one level of a (double) war
+            pot[0] = p1_card
+            pot[1] = p2_card
+            pot_size = 2
+            war_depth = 0
+            while True:
+                wars += 1
+                if war_depth > 0:
+                    double_wars += 1
+                
+                if len(p1_hand) < cards_needed:
+                    winner = 2
+                    break
+                if len(p2_hand) < cards_needed:
+                    winner = 1
+                    break
+                
+                # Facedown cards, then the faceup pair, alternating players
+                end = pot_size + 2 * cards_needed
+                while pot_size < end:
+                    pot[pot_size] = p1_draw()
+                    pot[pot_size + 1] = p2_draw()
+                    pot_size += 2
+                p1_card = pot[pot_size - 2]
+                p2_card = pot[pot_size - 1]
+                
+                if p1_card != p2_card:
+                    take = p1_take if p1_card > p2_card else p2_take
+                    i = 0
+                    while i < pot_size:
+                        take(pot[i])
+                        i += 1
+                    break
+                war_depth += 1
+            
+            if winner is not None:
+                break  # Game ended during war
+        
+        rounds += 1
+        if record_stack is not None:
+            record_stack(len(p1_hand))
+        if rounds >= max_rounds:
+            hit_max_rounds = True
+            break
+    
+    return {
+        'rounds': rounds,
+        'wars': wars,
+        'double_wars': double_wars,
+        'winner': winner,
+        'hit_max_rounds': hit_max_rounds
+    }
+
+
+@lru_cache(maxsize=None)
+def rules_player(rules):
+    """
+    Specialize a rule set into a game loop, once per distinct rule set.
+    
+    The standard rules get play_hands() itself. Any other rule set gets a
+    copy of the same allocation-free loop with the facedown count, the
+    short-of-cards rule and the winnings order fixed when the loop is
+    built, so the rule checks cost nothing per round.
     
-    # Initialize statistics
+    Args:
+        rules: WarRules
+    
+    Returns:
+        function(p1_hand, p2_hand, max_rounds=MAX_ROUNDS, stacks=None,
+        rng=None) returning statistics in the same shape as play_hands();
+        rng shuffles winnings under the 'shuffle' order
+    """
+    if rules == STANDARD_RULES:
+        return play_hands
+    
+    facedown = rules.facedown
+    last_card = rules.short_war == 'last_card'
+    winnings = rules.winnings
+    
+    def play(p1_hand, p2_hand, max_rounds=MAX_ROUNDS, stacks=None, rng=None):
+        record_stack = stacks.append if stacks is not None else None
+        p1_draw, p2_draw = p1_hand.popleft, p2_hand.popleft
+        if winnings == 'shuffle':
+            arrange = (rng or random).shuffle
+        elif winnings == 'high_first':
+            arrange = partial(list.sort, reverse=True)
+        elif winnings == 'low_first':
+            arrange = list.sort
+        else:
+            arrange = None
+        
+        rounds = wars = double_wars = 0
+        winner = None
+        hit_max_rounds = False
+        
+        while True:
+            if not p1_hand:
+                winner = 2
+                break
+            if not p2_hand:
+                winner = 1
+                break
+            
+            p1_card = p1_draw()
+            p2_card = p2_draw()
+            pot = [p1_card, p2_card]
+            war_depth = 0
+            while p1_card == p2_card:
+                wars += 1
+                if war_depth > 0:
+                    double_wars += 1
+                
+                p1_facedown = p2_facedown = facedown
+                if last_card:
+                    p1_facedown = min(facedown, len(p1_hand) - 1)
+                    p2_facedown = min(facedown, len(p2_hand) - 1)
+                if len(p1_hand) < p1_facedown + 1 or p1_facedown < 0:
+                    winner = 2
+                    break
+                if len(p2_hand) < p2_facedown + 1 or p2_facedown < 0:
+                    winner = 1
+                    break
+                
+                for i in range(max(p1_facedown, p2_facedown)):
+                    if i < p1_facedown:
+                        pot.append(p1_draw())
+                    if i < p2_facedown:
+                        pot.append(p2_draw())
+                p1_card = p1_draw()
+                p2_card = p2_draw()
+                pot.append(p1_card)
+                pot.append(p2_card)
+                war_depth += 1
+            
+            if winner is not None:
+                break  # Game ended during war
+            if arrange is not None:
+                arrange(pot)
+            (p1_hand if p1_card > p2_card else p2_hand).extend(pot)
+            
+            rounds += 1
+            if record_stack is not None:
+                record_stack(len(p1_hand))
+            if rounds >= max_rounds:
+                hit_max_rounds = True
+                break
+        
+        return {
+            'rounds': rounds,
+            'wars': wars,
+            'double_wars': double_wars,
+            'winner': winner,
+            'hit_max_rounds': hit_max_rounds
+        }
+    
+    return play
+
+
+def play_hooked(p1_hand, p2_hand, max_rounds=MAX_ROUNDS, stacks=None, rules=None, rng=None):
+    """
+    Play dealt hands to the end, reporting each round and war to the hooks.
+    
+    Plays by play_round() and takes the place of play_hands() while an
+    on_round or on_war hook is attached.
+    
+    Args:
+        p1_hand: deque of player 1's cards
+        p2_hand: deque of player 2's cards
+        max_rounds, stacks: as in play_hands()
+        rules, rng: as in play_round()
+    
+    Returns:
+        dict: Statistics in the same shape as play_game()
+    """
+    on_round, on_war = _hooks['on_round'], _hooks['on_war']
     stats = {
         'rounds': 0,
         'wars': 0,
@@ -138,9 +407,166 @@ def play_game():
         'winner': None,
         'hit_max_rounds': False
     }
+    playing = True
+    while playing:
+        rounds, wars = stats['rounds'], stats['wars']
+        playing = play_round(p1_hand, p2_hand, stats, rules, rng, max_rounds)
+        for depth in range(stats['wars'] - wars):
+            for callback in on_war:
+                callback(depth)
+        if stats['rounds'] > rounds:
+            if stacks is not None:
+                stacks.append(len(p1_hand))
+            for callback in on_round:
+                callback(stats['rounds'], len(p1_hand), len(p2_hand))
+    return stats
+
+
+def play_until_cycle(p1_hand, p2_hand, stats, rules=None, max_rounds=MAX_ROUNDS):
+    """
+    Play a game to the end, stopping early if it enters a loop.
+    
+    War is deterministic once dealt, so if the pair of hands at the start
+    of a round repeats an earlier pair, the game can never finish. Every
+    pair of hands seen is kept, as bytes, so a loop of any
+    length is caught on its first repeat, which also gives where it
+    starts; only loops that don't come round again within max_rounds go
+    undetected. A looping game is recorded as hitting max rounds, with
+    stats['rounds'] holding the rounds actually played.
+    
+    Args:
+        p1_hand: deque of player 1's cards
+        p2_hand: deque of player 2's cards
+        stats: dictionary tracking game statistics; cycle_length and
+            cycle_start are set (to None if no loop was found)
+        rules: WarRules variant; must be deterministic
+        max_rounds: round limit for games that don't loop
+    """
+    stats['cycle_length'] = None
+    stats['cycle_start'] = None
+    
+    # Hands as bytes split by a byte no card value reaches
+    seen = {bytes(p1_hand) + b'\xff' + bytes(p2_hand): 0}
+    round_num = 0
+    while play_round(p1_hand, p2_hand, stats, rules, max_rounds=max_rounds):
+        round_num += 1
+        first_seen = seen.setdefault(bytes(p1_hand) + b'\xff' + bytes(p2_hand), round_num)
+        if first_seen != round_num:
+            stats['cycle_length'] = round_num - first_seen
+            stats['cycle_start'] = first_seen
+            stats['hit_max_rounds'] = True
+            stats['winner'] = None
+            return
+
+
+def play_game(seed=None, rng=None, detect_cycles=False, track_stacks=False,
+              deck=None, hand_size=None, cache=None, rules=None, max_rounds=MAX_ROUNDS,
+              hands=None, trace=False):
+    """
+    Play a complete game of War and return statistics.
+    
+    Args:
+        seed: optional seed for the deal (ignored if rng is given)
+        rng: optional random.Random used to shuffle the deck
+        detect_cycles: stop as soon as the game provably loops forever
+            (see play_until_cycle) instead of playing to MAX_ROUNDS
+        track_stacks: record player 1's stack size after every round
+        deck: cards to deal, as from create_deck() (standard deck if None)
+        hand_size: cards dealt to player 1 (half the deck if None)
+        cache: optional OutcomeCache from src.cache; a deal seen before
+            returns its cached outcome instead of being played again
+        rules: WarRules variant from src.rules, or its list form (standard
+            rules if None); shuffled winnings are drawn from rng
+        max_rounds: round limit after which the game counts as infinite
+        hands: optional (p1_hand, p2_hand) deques to play instead of
+            dealing, e.g. from a src.dealing batch (deck and hand_size are
+            then ignored)
+        trace: record every round with src.trace.play_traced() (rules
+            without shuffled winnings only)
+    
+    Returns:
+        dict: Statistics from the game including:
+            - rounds: total number of rounds
+            - wars: number of wars
+            - double_wars: number of wars during wars
+            - winner: 1, 2, or None (if hit max rounds)
+            - hit_max_rounds: bool indicating if game hit the limit
+            - cycle_length, cycle_start: loop period and first looping
+              round, or None (only when detect_cycles is set)
+            - stack_sizes: array('b') of player 1's stack size after each
+              round (only when track_stacks is set)
+            - trace, deal, p1_count: array('B') of round records, the
+              dealt cards as bytes and player 1's share of them (only
+              when trace is set; see src.trace.TraceWriter)
+    """
+    if detect_cycles and track_stacks:
+        raise ValueError("track_stacks cannot be combined with detect_cycles")
+    if track_stacks:
+        from src.stacks import MAX_TRACKED_DECK
+        deck_size = (sum(map(len, hands)) if hands is not None
+                     else len(STANDARD_DECK if deck is None else deck))
+        if deck_size > MAX_TRACKED_DECK:
+            raise ValueError(f"track_stacks is limited to {MAX_TRACKED_DECK} cards, got {deck_size}")
+    if cache is not None and (detect_cycles or track_stacks):
+        raise ValueError("cache cannot be combined with detect_cycles or track_stacks")
+    if trace and (detect_cycles or track_stacks or cache is not None):
+        raise ValueError("trace cannot be combined with detect_cycles, track_stacks or cache")
+    if cache is not None and max_rounds != MAX_ROUNDS:
+        raise ValueError("cache only supports the default max_rounds")
+    rules = as_rules(rules)
+    if rules != STANDARD_RULES:
+        if cache is not None:
+            raise ValueError("cache only supports the standard rules")
+        if detect_cycles and not rules.deterministic:
+            raise ValueError("detect_cycles needs rules that don't shuffle winnings")
+    
+    # Initialize game
+    if rng is None and seed is not None:
+        rng = random.Random(seed)
+    if hands is not None:
+        p1_hand, p2_hand = hands
+    else:
+        p1_hand, p2_hand = deal_cards(STANDARD_DECK if deck is None else deck, rng, hand_size)
+    for callback in _hooks['on_game_start']:
+        callback(p1_hand, p2_hand)
     
     # Play until game ends
-    while play_round(p1_hand, p2_hand, stats):
-        pass
+    if _hooks['on_round'] or _hooks['on_war']:
+        play = partial(play_hooked, max_rounds=max_rounds, rules=rules, rng=rng)
+    elif rules == STANDARD_RULES and max_rounds == MAX_ROUNDS:
+        play = play_hands
+    else:
+        play = partial(rules_player(rules), max_rounds=max_rounds, rng=rng)
+    if trace:
+        from src.trace import play_traced
+        records = array('B')
+        deal = bytes(p1_hand) + bytes(p2_hand)
+        p1_count = len(p1_hand)
+        stats = play_traced(p1_hand, p2_hand, records, max_rounds, rules)
+        stats.update(trace=records, deal=deal, p1_count=p1_count)
+    elif track_stacks:
+        stack_sizes = array('b')
+        stats = play(p1_hand, p2_hand, stacks=stack_sizes)
+        stats['stack_sizes'] = stack_sizes
+    elif cache is not None:
+        from src.cache import encode_deal
+        key = encode_deal(p1_hand, p2_hand)
+        stats = cache.get(key)
+        if stats is None:
+            stats = play(p1_hand, p2_hand)
+            cache.put(key, stats)
+    elif not detect_cycles:
+        stats = play(p1_hand, p2_hand)
+    else:
+        stats = {
+            'rounds': 0,
+            'wars': 0,
+            'double_wars': 0,
+            'winner': None,
+            'hit_max_rounds': False
+        }
+        play_until_cycle(p1_hand, p2_hand, stats, rules, max_rounds)
     
+    for callback in _hooks['on_game_end']:
+        callback(stats)
     return stats
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Compiled game kernel: whole games played on fixed int8 arrays.
+
+Each player's hand is a circular buffer as long as the deck, read at a
+head index and appended at a tail index, and war cards collect in a pot
+buffer of the same size, so the kernel never allocates while playing.
+The loop is the same as play_hands() in src.game, so the same deals give
+the same rounds/wars/double_wars/winner/hit_max_rounds. With Numba installed the
+kernel is compiled once (and cached on disk); without it play_games()
+falls back to play_game(), which gives the same results at Python speed.
+"""
+
+import numpy as np
+
+from src.batch_engine import deals_to_array
+from src.deck import create_deck, deal_cards
+from src.game import MAX_ROUNDS, play_game
+from src.rules import STANDARD_RULES, as_rules
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# play_game() options the kernel handles; rules may only change the
+# facedown count
+SUPPORTED_OPTIONS = ('deck', 'hand_size', 'rules', 'max_rounds')
+
+# Columns of the kernel's output array
+RESULT_FIELDS = ('rounds', 'wars', 'double_wars', 'winner', 'hit_max_rounds')
+
+
+def _play_deals(cards, p1_counts, max_rounds, facedown, out):
+    """
+    Play each dealt row of cards to the end (the kernel Numba compiles).
+
+    Args:
+        cards: int8 array (K, deck_size), player 1's hand then player 2's
+        p1_counts: cards dealt to player 1 per game
+        max_rounds: round limit after which a game counts as infinite
+        facedown: cards each player puts facedown in a war
+        out: int32 array (K, 5) receiving RESULT_FIELDS per game, with
+            winner 0 for games that hit max_rounds
+    """
+    num_games, capacity = cards.shape
+    p1_hand = np.empty(capacity, dtype=np.int8)
+    p2_hand = np.empty(capacity, dtype=np.int8)
+    pot = np.empty(capacity, dtype=np.int8)
+    cards_needed = facedown + 1
+
+    for game in range(num_games):
+        # Each hand is read at its head and appended at its tail, both
+        # wrapping around the buffer
+        p1_count = p1_counts[game]
+        p2_count = capacity - p1_count
+        for i in range(p1_count):
+            p1_hand[i] = cards[game, i]
+        for i in range(p2_count):
+            p2_hand[i] = cards[game, p1_count + i]
+        head1 = 0
+        head2 = 0
+        tail1 = p1_count if p1_count < capacity else 0
+        tail2 = p2_count if p2_count < capacity else 0
+        len1 = p1_count
+        len2 = p2_count
+        rounds = 0
+        wars = 0
+        double_wars = 0
+        winner = 0
+        hit_max_rounds = 0
+
+        while True:
+            # Check if either player is out of cards
+            if len1 == 0:
+                winner = 2
+                break
+            if len2 == 0:
+                winner = 1
+                break
+
+            p1_card = p1_hand[head1]
+            head1 += 1
+            if head1 == capacity:
+                head1 = 0
+            p2_card = p2_hand[head2]
+            head2 += 1
+            if head2 == capacity:
+                head2 = 0
+
+            if p1_card > p2_card:
+                p1_hand[tail1] = p1_card
+                tail1 += 1
+                if tail1 == capacity:
+                    tail1 = 0
+                p1_hand[tail1] = p2_card
+                tail1 += 1
+                if tail1 == capacity:
+                    tail1 = 0
+                len1 += 1
+                len2 -= 1
+            elif p2_card > p1_card:
+                p2_hand[tail2] = p1_card
+                tail2 += 1
+                if tail2 == capacity:
+                    tail2 = 0
+                p2_hand[tail2] = p2_card
+                tail2 += 1
+                if tail2 == capacity:
+                    tail2 = 0
+                len1 -= 1
+                len2 += 1
+            else:
+                # War! Each iteration is one level of a (double) war
+                len1 -= 1
+                len2 -= 1
+                pot[0] = p1_card
+                pot[1] = p2_card
+                pot_size = 2
+                war_depth = 0
+                while True:
+                    wars += 1
+                    if war_depth > 0:
+                        double_wars += 1
+                    if len1 < cards_needed:
+                        winner = 2
+                        break
+                    if len2 < cards_needed:
+                        winner = 1
+                        break
+
+                    # Facedown cards, then the faceup pair, alternating players
+                    for _ in range(cards_needed):
+                        pot[pot_size] = p1_hand[head1]
+                        head1 += 1
+                        if head1 == capacity:
+                            head1 = 0
+                        pot[pot_size + 1] = p2_hand[head2]
+                        head2 += 1
+                        if head2 == capacity:
+                            head2 = 0
+                        pot_size += 2
+                    len1 -= cards_needed
+                    len2 -= cards_needed
+                    p1_card = pot[pot_size - 2]
+                    p2_card = pot[pot_size - 1]
+
+                    if p1_card > p2_card:
+                        for i in range(pot_size):
+                            p1_hand[tail1] = pot[i]
+                            tail1 += 1
+                            if tail1 == capacity:
+                                tail1 = 0
+                        len1 += pot_size
+                        break
+                    if p2_card > p1_card:
+                        for i in range(pot_size):
+                            p2_hand[tail2] = pot[i]
+                            tail2 += 1
+                            if tail2 == capacity:
+                                tail2 = 0
+                        len2 += pot_size
+                        break
+                    war_depth += 1
+
+                if winner != 0:
+                    break  # Game ended during war
+
+            rounds += 1
+            if rounds >= max_rounds:
+                hit_max_rounds = 1
+                break
+
+        out[game, 0] = rounds
+        out[game, 1] = wars
+        out[game, 2] = double_wars
+        out[game, 3] = winner
+        out[game, 4] = hit_max_rounds
+
+
+if NUMBA_AVAILABLE:
+    _compiled_play_deals = njit(cache=True, nogil=True)(_play_deals)
+
+
+def check_options(game_options):
+    """Raise ValueError for play_game() options the kernel can't play."""
+    unsupported = sorted(set(game_options) - set(SUPPORTED_OPTIONS))
+    if unsupported:
+        raise ValueError(f"The jit engine does not support {unsupported}")
+    rules = as_rules(game_options.get('rules'))
+    if rules._replace(facedown=STANDARD_RULES.facedown) != STANDARD_RULES:
+        raise ValueError("The jit engine only supports changing the facedown count")
+
+
+def play_deals(cards, p1_counts=None, max_rounds=MAX_ROUNDS, facedown=STANDARD_RULES.facedown):
+    """
+    Play dealt games with the compiled kernel.
+
+    Args:
+        cards: int array of shape (K, deck_size); each row holds player 1's
+            hand (top card first) followed by player 2's
+        p1_counts: cards dealt to player 1 per game (default: half the deck)
+        max_rounds: round limit after which a game counts as infinite
+        facedown: cards each player puts facedown in a war
+
+    Returns:
+        int32 array of shape (K, 5) with the RESULT_FIELDS of each game
+
+    Raises:
+        RuntimeError: if Numba is not installed
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("The compiled kernel requires numba (pip install numba)")
+    cards = np.ascontiguousarray(cards, dtype=np.int8)
+    if p1_counts is None:
+        p1_counts = np.full(len(cards), cards.shape[1] // 2, dtype=np.int64)
+    out = np.zeros((len(cards), len(RESULT_FIELDS)), dtype=np.int32)
+    _compiled_play_deals(cards, np.asarray(p1_counts, dtype=np.int64), max_rounds, facedown, out)
+    return out
+
+
+def play_dealt(cards, p1_counts=None, **game_options):
+    """
+    Play already-dealt games, e.g. from src.dealing, with the kernel.
+
+    Args:
+        cards, p1_counts: As in play_deals()
+        **game_options: play_game() options from SUPPORTED_OPTIONS (deck
+            and hand_size are ignored; the deals already fix them)
+
+    Returns:
+        list of per-game statistics dicts in the same shape as play_game()
+    """
+    check_options(game_options)
+    out = play_deals(cards, p1_counts, game_options.get('max_rounds', MAX_ROUNDS),
+                     as_rules(game_options.get('rules')).facedown)
+    return [
+        {
+            'rounds': rounds,
+            'wars': wars,
+            'double_wars': double_wars,
+            'winner': winner or None,
+            'hit_max_rounds': bool(hit_max_rounds),
+        }
+        for rounds, wars, double_wars, winner, hit_max_rounds in out.tolist()
+    ]
+
+
+def play_games(rngs, **game_options):
+    """
+    Deal and play one game per RNG, as play_game(rng=...) would.
+
+    Args:
+        rngs: iterable of random.Random streams, one per game
+        **game_options: play_game() options from SUPPORTED_OPTIONS
+
+    Returns:
+        list of per-game statistics dicts in the same shape as play_game()
+    """
+    check_options(game_options)
+    if not NUMBA_AVAILABLE:
+        return [play_game(rng=rng, **game_options) for rng in rngs]
+
+    deck = game_options.get('deck') or create_deck()
+    hand_size = game_options.get('hand_size')
+    deals = [deal_cards(deck, rng, hand_size) for rng in rngs]
+    if not deals:
+        return []
+    return play_dealt(*deals_to_array(deals), **game_options)
@@ -0,0 +1,189 @@
+import csv
+import os
+from typing import Dict, Any, List, Optional
+
+FORMATS = ('csv', 'parquet', 'feather')
+
+# Per-game columns in output order, after the game_num index
+COLUMNS = ('rounds', 'wars', 'double_wars', 'winner', 'hit_max_rounds')
+CYCLE_COLUMNS = ('cycle_length', 'cycle_start')
+
+
+def _arrow():
+    """Import pyarrow, which is only needed for Parquet and Feather output."""
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Parquet and Feather output require pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+class GameWriter:
+    """
+    Base class for writers that append batches of games to an output file.
+
+    Subclasses implement _write_batch(); batches are lists of per-game
+    statistics dicts that include 'game_num'. The set of columns is fixed
+    by the first batch. Writers are context managers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.columns = None
+        self.rows_written = 0
+
+    def write(self, games: List[Dict[str, Any]]) -> None:
+        """Append a batch of games to the output."""
+        if not games:
+            return
+        if self.columns is None:
+            self.columns = COLUMNS + tuple(c for c in CYCLE_COLUMNS if c in games[0])
+        self._write_batch(games)
+        self.rows_written += len(games)
+
+    def _write_batch(self, games: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvGameWriter(GameWriter):
+    """
+    Writes rows with the same header and columns as DataFrame.to_csv() of
+    game_data.
+
+    Values are written as the games hold them: winner and the cycle
+    columns are integers, or empty when missing, where to_csv() writes
+    1.0/2.0 for a float column that has a missing value. pd.read_csv()
+    reads both files back to the same DataFrame.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', newline='')
+        self._csv = csv.writer(self._file)
+
+    def _write_batch(self, games):
+        if not self.rows_written:
+            self._csv.writerow(('game_num',) + self.columns)
+        self._csv.writerows(
+            [game['game_num']] + ['' if game[c] is None else game[c] for c in self.columns]
+            for game in games
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowGameWriter(GameWriter):
+    """Shared batch-to-Arrow conversion with compact column types."""
+
+    def _schema(self):
+        pa = _arrow()
+        types = {
+            'game_num': pa.uint64(),
+            # Counters grow with max_rounds, which sweeps can raise past
+            # what 8 or 16 bits hold
+            'rounds': pa.uint32(),
+            'wars': pa.uint32(),
+            'double_wars': pa.uint32(),
+            'winner': pa.int8(),  # Null for games that hit max rounds
+            'hit_max_rounds': pa.bool_(),
+            'cycle_length': pa.uint32(),
+            'cycle_start': pa.uint32(),
+        }
+        return pa.schema([(name, types[name]) for name in ('game_num',) + self.columns])
+
+    def _record_batch(self, games):
+        pa = _arrow()
+        schema = self._schema()
+        arrays = [
+            pa.array([game[field.name] for game in games], type=field.type)
+            for field in schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ParquetGameWriter(_ArrowGameWriter):
+    """Writes each batch as a Parquet row group."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._writer = None
+
+    def _write_batch(self, games):
+        batch = self._record_batch(games)
+        if self._writer is None:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class FeatherGameWriter(_ArrowGameWriter):
+    """Writes each batch as a record batch of a Feather (Arrow IPC) file."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._sink = None
+        self._writer = None
+
+    def _write_batch(self, games):
+        batch = self._record_batch(games)
+        if self._writer is None:
+            import pyarrow.ipc as ipc
+            self._sink = _arrow().OSFile(self.path, 'wb')
+            options = ipc.IpcWriteOptions(compression='lz4')
+            self._writer = ipc.new_file(self._sink, batch.schema, options=options)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+
+
+_WRITERS = {
+    'csv': CsvGameWriter,
+    'parquet': ParquetGameWriter,
+    'feather': FeatherGameWriter,
+}
+
+
+def infer_format(path: str) -> str:
+    """Guess the output format from a file extension (default: csv)."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('parquet', 'pq'):
+        return 'parquet'
+    if extension in ('feather', 'arrow', 'ipc'):
+        return 'feather'
+    return 'csv'
+
+
+def open_writer(path: str, fmt: Optional[str] = None) -> GameWriter:
+    """
+    Open a batch writer for per-game output.
+
+    Args:
+        path: Output file path
+        fmt: 'csv', 'parquet' or 'feather' (inferred from path if None)
+
+    Returns:
+        GameWriter to pass batches of games to
+    """
+    fmt = fmt or infer_format(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {FORMATS}")
+    return _WRITERS[fmt](path)
@@ -0,0 +1,143 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Any
+
+from src.game import add_hook, remove_hook
+
+
+class RunProfiler:
+    """
+    Where a run's time goes, collected through the src.game hooks.
+
+    While attached, every game is timed from the end of the previous game
+    (or attach()) through its deal and each round. Rounds are split into
+    plain rounds and rounds that contained a war, and histograms of war
+    depth and rounds per game are kept. Other phases, such as analysis or
+    output, are timed with the phase() context manager. Timing every round
+    slows games down, so the totals describe the shape of a run rather
+    than its uninstrumented speed.
+    """
+
+    def __init__(self):
+        self.phase_times = Counter()  # Seconds per phase
+        self.round_counts = Counter()  # 'plain rounds' / 'war rounds'
+        self.war_depths = Counter()
+        self.game_rounds = Counter()
+        self._last = None
+        self._war_this_round = False
+
+    def _on_game_start(self, p1_hand, p2_hand):
+        now = time.perf_counter()
+        self.phase_times['deal'] += now - self._last
+        self._last = now
+
+    def _on_war(self, depth):
+        self.war_depths[depth] += 1
+        self._war_this_round = True
+
+    def _on_round(self, rounds, p1_cards, p2_cards):
+        now = time.perf_counter()
+        phase = 'war rounds' if self._war_this_round else 'plain rounds'
+        self.phase_times[phase] += now - self._last
+        self.round_counts[phase] += 1
+        self._last = now
+        self._war_this_round = False
+
+    def _on_game_end(self, stats):
+        now = time.perf_counter()
+        # A war that ends the game doesn't complete a round
+        phase = 'war rounds' if self._war_this_round else 'plain rounds'
+        self.phase_times[phase] += now - self._last
+        self.game_rounds[stats['rounds']] += 1
+        self._last = now
+        self._war_this_round = False
+
+    def _events(self):
+        return (
+            ('on_game_start', self._on_game_start),
+            ('on_round', self._on_round),
+            ('on_war', self._on_war),
+            ('on_game_end', self._on_game_end),
+        )
+
+    def attach(self) -> None:
+        """Start collecting from games played in this process."""
+        for event, callback in self._events():
+            add_hook(event, callback)
+        self._last = time.perf_counter()
+
+    def detach(self) -> None:
+        """Stop collecting; games go back to the uninstrumented loop."""
+        for event, callback in self._events():
+            remove_hook(event, callback)
+
+    def __enter__(self):
+        """Attach for a whole run; time not spent in games or phases goes to 'other'."""
+        self._run_start = time.perf_counter()
+        self._timed_before_run = sum(self.phase_times.values())
+        self.attach()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.detach()
+        elapsed = time.perf_counter() - self._run_start
+        timed = sum(self.phase_times.values()) - self._timed_before_run
+        self.phase_times['other simulation'] += max(0.0, elapsed - timed)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the wall time of a block to a named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phase_times[name] += elapsed
+            if self._last is not None:
+                # Keep the block out of the next game's deal time
+                self._last += elapsed
+
+    def report(self) -> Dict[str, Any]:
+        """Phase times, round counts and histograms as plain dicts."""
+        return {
+            'phase_times': dict(self.phase_times),
+            'round_counts': dict(self.round_counts),
+            'war_depths': dict(sorted(self.war_depths.items())),
+            'game_rounds': dict(sorted(self.game_rounds.items())),
+        }
+
+
+def _bucketed(histogram: Counter, width: int) -> Counter:
+    """Group a value histogram into buckets of the given width."""
+    buckets = Counter()
+    for value, count in histogram.items():
+        buckets[value // width * width] += count
+    return buckets
+
+
+def print_profile(profiler: RunProfiler, bucket_width: int = 250) -> None:
+    """Print phase times and histograms from a RunProfiler."""
+    print("=" * 70)
+    print("PROFILE")
+    print("=" * 70)
+
+    total = sum(profiler.phase_times.values())
+    print("\nWall time by phase:")
+    for phase, seconds in profiler.phase_times.most_common():
+        share = seconds / total if total else 0
+        print(f"  {phase:<16} {seconds:>10.3f}s  {share:>6.1%}")
+    for phase, count in sorted(profiler.round_counts.items()):
+        per_round = profiler.phase_times[phase] / count * 1e6
+        print(f"  {phase:<16} {count:>10,} rounds, {per_round:.2f} us/round")
+
+    print("\nWar depth (0 = war, 1 = double war, ...):")
+    for depth, count in sorted(profiler.war_depths.items()):
+        print(f"  {depth:>4}  {count:>10,}")
+
+    print(f"\nRounds per game (buckets of {bucket_width}):")
+    games = sum(profiler.game_rounds.values())
+    for start, count in sorted(_bucketed(profiler.game_rounds, bucket_width).items()):
+        bar = '#' * round(50 * count / games) if games else ''
+        print(f"  {start:>5}-{start + bucket_width - 1:<5} {count:>8,}  {bar}")
+    print()
@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+
+def _memory_bytes() -> Optional[int]:
+    """Resident memory of this process (peak RSS where the current one isn't known)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '?'
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class RunProgress:
+    """
+    Live counters for a run, updated once per finished chunk of games.
+
+    The run loop calls update() with each chunk as it comes back, whether
+    the chunk was played inline or by a worker process, so no game ever
+    touches a lock or prints. Readers such as StatusServer call snapshot()
+    from other threads; the counters are plain attributes, so a snapshot
+    is at most one chunk behind.
+
+    With report_interval set, update() also prints a progress line at most
+    once every report_interval seconds.
+    """
+
+    def __init__(self, report_interval: Optional[float] = None):
+        self.report_interval = report_interval
+        self.total_games = None
+        self.first_game = 0
+        self.completed = 0
+        self.infinite = 0
+        self.started = None
+        self.finished = None
+        self._last_report = None
+
+    def start(self, total_games: Optional[int], first_game: int = 0) -> None:
+        """Begin timing a run of total_games (None if open-ended), resuming at first_game."""
+        self.total_games = total_games
+        self.first_game = first_game
+        self.completed = first_game
+        self.infinite = 0
+        self.started = self._last_report = time.monotonic()
+        self.finished = None
+
+    def update(self, chunk_stats: List[Dict[str, Any]]) -> None:
+        """Count a finished chunk of games."""
+        self.infinite += sum(1 for game in chunk_stats if game['hit_max_rounds'])
+        self.completed += len(chunk_stats)
+        if self.report_interval is not None:
+            now = time.monotonic()
+            if now - self._last_report >= self.report_interval:
+                self._last_report = now
+                print(self.format_line())
+
+    def finish(self) -> None:
+        self.finished = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Throughput, ETA, infinite-game rate and memory as a JSON-ready dict."""
+        now = self.finished or time.monotonic()
+        elapsed = now - self.started if self.started is not None else 0.0
+        played = self.completed - self.first_game
+        rate = played / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total_games is not None and rate > 0:
+            eta = max(0, self.total_games - self.completed) / rate
+        return {
+            'state': ('finished' if self.finished else
+                      'running' if self.started is not None else 'waiting'),
+            'completed_games': self.completed,
+            'total_games': self.total_games,
+            'percent': (self.completed / self.total_games * 100
+                        if self.total_games else None),
+            'elapsed_sec': elapsed,
+            'games_per_sec': rate,
+            'eta_sec': eta,
+            'infinite_pct': self.infinite / played * 100 if played else None,
+            'memory_bytes': _memory_bytes(),
+        }
+
+    def format_line(self) -> str:
+        status = self.snapshot()
+        done = f"{status['completed_games']:,}"
+        if status['total_games'] is not None:
+            done = f"{status['percent']:.1f}% ({done} / {status['total_games']:,} games)"
+        else:
+            done += " games"
+        line = (f"Progress: {done}, {status['games_per_sec']:,.0f} games/s, "
+                f"ETA {_format_eta(status['eta_sec'])}")
+        if status['infinite_pct'] is not None:
+            line += f", infinite {status['infinite_pct']:.2f}%"
+        if status['memory_bytes'] is not None:
+            line += f", memory {status['memory_bytes'] / 2 ** 20:,.0f} MB"
+        return line
+
+
+class StatusServer:
+    """
+    Serve a RunProgress snapshot as JSON over local HTTP or a Unix socket.
+
+    The asyncio server runs on its own thread, since the run loop itself
+    is synchronous; every request reads the current counters. Any GET
+    path returns the snapshot, e.g. curl http://127.0.0.1:PORT/ or
+    curl --unix-socket PATH http://localhost/. Use as a context manager,
+    or call start() and close().
+    """
+
+    def __init__(self, progress: RunProgress, host: str = '127.0.0.1', port: int = 0,
+                 unix_path: Optional[str] = None):
+        self.progress = progress
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        return self.unix_path if self.unix_path else f"http://{self.host}:{self.port}/"
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            # Skip the headers; nothing in them changes the response
+            while (await reader.readline()).strip():
+                pass
+            if request.split()[:1] == [b'GET']:
+                status, body = '200 OK', json.dumps(self.progress.snapshot())
+            else:
+                status, body = '405 Method Not Allowed', json.dumps({'error': 'GET only'})
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except (ConnectionError, EOFError):  # EOFError covers IncompleteReadError
+            pass
+        finally:
+            writer.close()
+
+    async def _start_server(self):
+        import asyncio
+        if self.unix_path:
+            return await asyncio.start_unix_server(self._handle, path=self.unix_path)
+        return await asyncio.start_server(self._handle, self.host, self.port)
+
+    def start(self) -> 'StatusServer':
+        """Start serving on a background thread; returns once the socket is bound."""
+        import asyncio
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(self._start_server())
+        if not self.unix_path:
+            self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+
+        import asyncio
+
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,61 @@
+from typing import NamedTuple
+
+# What a player short of cards for a war does
+SHORT_WAR_RULES = (
+    'lose',       # Loses the game (standard)
+    'last_card',  # Plays what they can facedown and turns their last card faceup
+)
+
+# Order in which won cards go to the bottom of the winner's hand
+WINNINGS_ORDERS = (
+    'in_play',     # The order they were played in (standard)
+    'shuffle',     # Shuffled with the game's RNG
+    'high_first',  # Highest card first
+    'low_first',   # Lowest card first
+)
+
+
+class WarRules(NamedTuple):
+    """
+    A variant of the War rules.
+
+    Rule sets are immutable and hashable, so each distinct set is turned
+    into its specialized game loop only once (see src.game.rules_player).
+    As a tuple, a rule set also survives a round trip through JSON
+    checkpoints and shard files; play_game() accepts the list form.
+    """
+
+    facedown: int = 3
+    short_war: str = 'lose'
+    winnings: str = 'in_play'
+
+    def validate(self) -> 'WarRules':
+        """Check the rule values; returns self."""
+        if self.facedown < 0:
+            raise ValueError(f"facedown must be at least 0, got {self.facedown}")
+        if self.short_war not in SHORT_WAR_RULES:
+            raise ValueError(
+                f"Unknown short_war rule {self.short_war!r}; expected one of {SHORT_WAR_RULES}"
+            )
+        if self.winnings not in WINNINGS_ORDERS:
+            raise ValueError(
+                f"Unknown winnings order {self.winnings!r}; expected one of {WINNINGS_ORDERS}"
+            )
+        return self
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether a deal fully decides the game (no shuffled winnings)."""
+        return self.winnings != 'shuffle'
+
+
+STANDARD_RULES = WarRules()
+
+
+def as_rules(rules) -> WarRules:
+    """Coerce None, a WarRules or its list/tuple form to a validated WarRules."""
+    if rules is None:
+        return STANDARD_RULES
+    if not isinstance(rules, WarRules):
+        rules = WarRules(*rules)
+    return rules.validate()
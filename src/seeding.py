@@ -0,0 +1,40 @@
+import random
+
+# SplitMix64 constants
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix64(z):
+    """SplitMix64 output function: scramble a 64-bit state into a seed."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def game_seed(seed, game_index):
+    """
+    Derive the seed for a single game from the run seed.
+
+    The seed for game i is the i-th output of a SplitMix64 stream started
+    at the run seed, computed directly so any game can be regenerated in
+    O(1) without replaying the games before it.
+
+    Args:
+        seed: Run seed (any integer)
+        game_index: Zero-based index of the game within the run
+
+    Returns:
+        int: 64-bit seed for the game's RNG
+    """
+    return _mix64((seed + (game_index + 1) * _GAMMA) & _MASK64)
+
+
+def game_rng(seed, game_index):
+    """Return an independent random.Random stream for one game of a run."""
+    return random.Random(game_seed(seed, game_index))
+
+
+def random_seed():
+    """Draw a fresh run seed from the operating system's entropy source."""
+    return random.SystemRandom().randrange(2 ** 63)
@@ -0,0 +1,178 @@
+import glob
+import json
+import os
+from typing import Dict, Any, List, Tuple
+
+from src.output import open_writer
+from src.simulation import _game_options, _iter_chunks
+from src.streaming import StreamingSummary
+
+SHARD_PATTERN = 'shard-*-of-*.json'
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parse an 'i/N' shard spec (1 <= i <= N).
+
+    Returns:
+        tuple: (shard index, number of shards)
+    """
+    index, _, count = text.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {text!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+def shard_range(num_games: int, index: int, count: int) -> Tuple[int, int]:
+    """
+    Zero-based [first, last) game range of shard index (1-based) of count.
+
+    Shards are contiguous and differ in size by at most one game.
+    """
+    return (index - 1) * num_games // count, index * num_games // count
+
+
+def shard_name(index: int, count: int) -> str:
+    return f"shard-{index:05d}-of-{count:05d}"
+
+
+def run_shard(num_games: int, index: int, count: int, seed: int, directory: str,
+              fmt: str = 'csv', workers: int = 1, engine: str = 'python',
+              verbose: bool = True, **options) -> Dict[str, Any]:
+    """
+    Play one shard of a run and write its outputs to a directory.
+
+    Game i of the run is dealt from seed substream i wherever it is played,
+    so the shards of a run together hold exactly the games of the same
+    run played in one go. Two files are written per shard:
+    shard-IIIII-of-NNNNN.<fmt> with the per-game rows, and
+    shard-IIIII-of-NNNNN.json with the shard's seed, game range, options
+    and StreamingSummary state, which is all merge_shards() needs.
+
+    Args:
+        num_games: Games in the whole run
+        index: This shard, 1-based
+        count: Number of shards
+        seed: Seed of the whole run (every shard must use the same one)
+        directory: Directory for the shard files
+        fmt: Row file format: 'csv', 'parquet' or 'feather'
+        workers, engine, verbose: As in run_simulation()
+        **options: play_game() options (detect_cycles, deck, hand_size)
+
+    Returns:
+        The shard state as written to the JSON file
+    """
+    game_options = _game_options(**options)
+    first_game, last_game = shard_range(num_games, index, count)
+    os.makedirs(directory, exist_ok=True)
+    name = shard_name(index, count)
+    rows_file = f"{name}.{fmt}"
+    if verbose:
+        print(f"\nRunning shard {index}/{count}: games {first_game + 1:,} "
+              f"to {last_game:,} of {num_games:,}...")
+
+    accumulator = StreamingSummary()
+    with open_writer(os.path.join(directory, rows_file), fmt) as writer:
+        for chunk_stats in _iter_chunks(last_game, seed, workers, engine, game_options,
+                                        first_game):
+            accumulator.update(chunk_stats)
+            writer.write(chunk_stats)
+
+    state = {
+        'seed': seed,
+        'num_games': num_games,
+        'shard': index,
+        'num_shards': count,
+        'first_game': first_game,
+        'last_game': last_game,
+        'engine': engine,
+        'game_options': game_options,
+        'rows_file': rows_file,
+        'accumulator': accumulator.to_dict(),
+    }
+    # Written last, so a shard only counts as done once its rows are complete
+    tmp_path = os.path.join(directory, f"{name}.json.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, os.path.join(directory, f"{name}.json"))
+    if verbose:
+        print(f"Shard written to {directory}")
+    return state
+
+
+def _shard_files(paths: List[str]) -> List[str]:
+    """Expand directories into the shard JSON files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, SHARD_PATTERN))))
+        else:
+            files.append(path)
+    return files
+
+
+def merge_shards(paths: List[str]) -> Dict[str, Any]:
+    """
+    Combine shard outputs into the summary of the whole run.
+
+    Only the shard JSON files are read; the accumulators merge exactly, so
+    the summary is the one analyze_results() gives for all the games.
+
+    Args:
+        paths: Shard JSON files and/or directories holding them
+
+    Returns:
+        Dictionary containing:
+            - 'summary': Summary dict with the same keys as analyze_results()
+            - 'accumulator': Merged StreamingSummary
+            - 'seed', 'num_games', 'game_options': Run configuration
+            - 'shards': Number of shards merged
+            - 'missing': Zero-based [first, last) game ranges no shard
+              covered (empty when the run is complete)
+
+    Raises:
+        ValueError: if shards come from different runs or overlap
+    """
+    states = []
+    for path in _shard_files(paths):
+        with open(path) as f:
+            states.append(json.load(f))
+    if not states:
+        raise ValueError(f"No shard files found in {paths}")
+
+    # Engines play identical games, so shards may use different ones
+    run_keys = ('seed', 'num_games', 'game_options')
+    first = states[0]
+    for state in states[1:]:
+        for key in run_keys:
+            if state[key] != first[key]:
+                raise ValueError(f"Shards come from different runs ({key} differs)")
+
+    accumulator = StreamingSummary()
+    missing = []
+    covered = 0
+    for state in sorted(states, key=lambda s: s['first_game']):
+        if state['first_game'] < covered:
+            raise ValueError(
+                f"Shard {state['shard']}/{state['num_shards']} overlaps games already merged"
+            )
+        if state['first_game'] > covered:
+            missing.append((covered, state['first_game']))
+        covered = state['last_game']
+        accumulator.merge(StreamingSummary.from_dict(state['accumulator']))
+    if covered < first['num_games']:
+        missing.append((covered, first['num_games']))
+
+    return {
+        'summary': accumulator.summary(),
+        'accumulator': accumulator,
+        'seed': first['seed'],
+        'num_games': first['num_games'],
+        'game_options': first['game_options'],
+        'shards': len(states),
+        'missing': missing,
+    }
@@ -1,67 +1,596 @@
-from typing import Dict, Any
-import pandas as pd
+import math
+from collections import deque
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional
 from src.game import play_game
-from src.analysis import analyze_results
+from src.cache import OutcomeCache
+from src.checkpoint import Checkpoint, DEFAULT_CHECKPOINT_EVERY
+from src.columns import GameColumns
+from src.output import GameWriter
+from src.rules import STANDARD_RULES, WarRules, as_rules
+from src.seeding import game_rng, random_seed
+from src.stacks import StackTrajectories
+from src.streaming import CI_METRICS, StreamingSummary, confidence_half_widths
 
+if TYPE_CHECKING:
+    # Only needed for annotations
+    from src.profiling import RunProfiler
+    from src.progress import RunProgress
 
-def run_simulation(num_games: int = 10000, verbose: bool = True) -> Dict[str, Any]:
+# Games are handed to workers in fixed-size chunks
+CHUNK_SIZE = 1000
+ADAPTIVE_BATCH_SIZE = 10000  # Games between stopping checks in run_until_confident
+BATCH_CHUNK_SIZE = 10000  # Larger chunks keep the numpy engine's batches wide
+
+ENGINES = ('python', 'numpy', 'jit')
+
+
+def replay_game(seed: int, game_num: int, **game_options) -> Dict[str, Any]:
+    """
+    Regenerate a single game of a seeded run without replaying earlier games.
+
+    Args:
+        seed: Seed the run was started with
+        game_num: One-based game number, as in the game_data index
+        **game_options: Extra keyword arguments for play_game(), which must
+            match the ones the run used
+
+    Returns:
+        Statistics dict for the game, identical to the one from the run
+    """
+    if game_options.get('batch_deals'):
+        deals, game_options = _batch_deals(seed, game_num - 1, game_num, game_options)
+        game_stats = play_game(hands=deals.hands(0), rng=game_rng(seed, game_num - 1),
+                               **game_options)
+    else:
+        game_stats = play_game(rng=game_rng(seed, game_num - 1), **game_options)
+    game_stats['game_num'] = game_num
+    return game_stats
+
+
+def _batch_deals(seed: int, first_game: int, last_game: int, game_options: Dict[str, Any]):
+    """
+    Deal games first_game..last_game-1 with the batched dealer.
+
+    Returns:
+        tuple: (DealBatch, game_options without the dealing options)
+    """
+    from src.dealing import deal_range
+    deals = deal_range(seed, first_game, last_game, game_options.get('deck'),
+                       game_options.get('hand_size'))
+    dealt = ('batch_deals', 'deck', 'hand_size')
+    return deals, {name: value for name, value in game_options.items() if name not in dealt}
+
+
+def _play_chunk(seed: int, start: int, count: int, engine: str = 'python',
+                game_options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Play a contiguous chunk of games, each with its own RNG substream.
+
+    Args:
+        seed: Run seed the per-game streams are derived from
+        start: Zero-based index of the first game in the chunk
+        count: Number of games to play
+        engine: 'python' to play games one at a time, 'numpy' to play the
+            whole chunk in lockstep with src.batch_engine, 'jit' to play
+            it with the compiled kernel in src.jit_engine
+        game_options: Extra keyword arguments for play_game(), plus
+            batch_deals to deal the chunk with src.dealing
+
+    Returns:
+        List of per-game statistics dicts, numbered from start + 1
+    """
+    if game_options and game_options.get('batch_deals'):
+        from src.dealing import play_deal_batch
+        deals, options = _batch_deals(seed, start, start + count, game_options)
+        # The game streams still drive rules that shuffle winnings
+        rngs = (game_rng(seed, i) for i in range(start, start + count))
+        chunk_stats = play_deal_batch(deals, engine, rngs, **options)
+        for i, game_stats in enumerate(chunk_stats, start + 1):
+            game_stats['game_num'] = i
+        return chunk_stats
+    if engine == 'numpy':
+        from src.batch_engine import play_games
+        chunk_stats = play_games(game_rng(seed, i) for i in range(start, start + count))
+        for i, game_stats in enumerate(chunk_stats, start + 1):
+            game_stats['game_num'] = i
+        return chunk_stats
+    if engine == 'jit':
+        from src.jit_engine import play_games
+        chunk_stats = play_games((game_rng(seed, i) for i in range(start, start + count)),
+                                 **(game_options or {}))
+        for i, game_stats in enumerate(chunk_stats, start + 1):
+            game_stats['game_num'] = i
+        return chunk_stats
+
+    game_options = game_options or {}
+    return [replay_game(seed, i + 1, **game_options) for i in range(start, start + count)]
+
+
+def _chunks(num_games: int, chunk_size: int = CHUNK_SIZE, first_game: int = 0):
+    """Yield (chunk_index, start, count) tuples covering games first_game..num_games-1."""
+    for chunk_index, start in enumerate(range(first_game, num_games, chunk_size)):
+        yield chunk_index, start, min(chunk_size, num_games - start)
+
+
+def _game_options(**options) -> Dict[str, Any]:
+    """Collect the non-default play_game() options for a run."""
+    # A WarRules is a non-empty tuple, so the standard rules need their own check
+    if options.get('rules') and as_rules(options['rules']) == STANDARD_RULES:
+        options['rules'] = None
+    return {name: value for name, value in options.items() if value}
+
+
+def check_engine_options(engine: str, game_options: Dict[str, Any]) -> None:
+    """
+    Raise ValueError if an engine can't play a run's options.
+
+    Args:
+        engine: One of ENGINES
+        game_options: play_game() options of the run, as from _game_options()
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    # Batched deals take care of the deck and hand size for every engine
+    dealt = ('batch_deals', 'deck', 'hand_size') if game_options.get('batch_deals') else ()
+    play_options = {name: value for name, value in game_options.items() if name not in dealt}
+    if engine == 'numpy' and play_options:
+        raise ValueError(f"The numpy engine does not support {sorted(play_options)}")
+    if engine == 'jit':
+        from src.jit_engine import check_options
+        check_options(play_options)
+
+
+def _iter_chunks(num_games: int, seed: int, workers: int = 1, engine: str = 'python',
+                 game_options: Optional[Dict[str, Any]] = None,
+                 first_game: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield chunks of per-game statistics in game order.
+
+    With several workers, only a few chunks per worker are in flight at a
+    time, so memory stays bounded however many games are requested.
+    """
+    game_options = game_options or {}
+    check_engine_options(engine, game_options)
+    chunk_size = BATCH_CHUNK_SIZE if engine == 'numpy' else CHUNK_SIZE
+    chunks = _chunks(num_games, chunk_size, first_game)
+
+    if workers <= 1:
+        for _, start, count in chunks:
+            yield _play_chunk(seed, start, count, engine, game_options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for _, start, count in chunks:
+            pending.append(executor.submit(_play_chunk, seed, start, count, engine, game_options))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_games(num_games: int, seed: Optional[int] = None, workers: int = 1,
+               engine: str = 'python', detect_cycles: bool = False,
+               track_stacks: bool = False, deck: Optional[List[int]] = None,
+               hand_size: Optional[int] = None,
+               rules: Optional[WarRules] = None,
+               batch_deals: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Generate per-game statistics one at a time, in game order.
+
+    Yields the same games as run_simulation() with the same arguments, but
+    never holds more than a few chunks in memory.
+
+    Args:
+        num_games: Number of games to simulate
+        seed: Seed for the run (random if None)
+        workers: Number of worker processes to spread games across
+        engine: 'python', 'numpy' or 'jit'
+        detect_cycles: Stop looping games as soon as the loop is proven
+        track_stacks: Include each game's 'stack_sizes' trajectory
+        deck: Cards to deal, from create_deck() (standard deck if None)
+        hand_size: Cards dealt to player 1 (half the deck if None)
+        rules: WarRules variant (standard rules if None)
+        batch_deals: Deal with the batched dealer in src.dealing
+
+    Yields:
+        Statistics dict for each game, including its 'game_num'
+    """
+    if seed is None:
+        seed = random_seed()
+    game_options = _game_options(detect_cycles=detect_cycles, track_stacks=track_stacks,
+                                 deck=deck, hand_size=hand_size, rules=rules,
+                                 batch_deals=batch_deals)
+    for chunk_stats in _iter_chunks(num_games, seed, workers, engine, game_options):
+        yield from chunk_stats
+
+
+def games_to_dataframe(all_game_stats: Iterable[Dict[str, Any]]):
+    """
+    Build the game_data DataFrame (indexed by game_num) from per-game dicts.
+
+    Cycle columns are included when the games were played with cycle
+    detection.
+    """
+    return GameColumns().extend(all_game_stats).to_dataframe()
+
+
+class SimulationResults(dict):
+    """
+    Results dictionary whose 'game_data' DataFrame is built on first access.
+
+    Games are kept as GameColumns, and pandas is only imported once
+    results['game_data'] is looked up, so summary-only runs never pay for
+    the DataFrame. The columns stay available as the `columns` attribute
+    (None for runs that didn't keep their games).
+    """
+
+    def __init__(self, columns: Optional[GameColumns], **results):
+        super().__init__(**results)
+        self.columns = columns
+
+    def __missing__(self, key):
+        if key != 'game_data':
+            raise KeyError(key)
+        if self.columns is None:
+            raise KeyError("game_data is not available: the run was made with keep_games=False")
+        self['game_data'] = self.columns.to_dataframe()
+        return self['game_data']
+
+
+def run_simulation(
+    num_games: int = 10000,
+    verbose: bool = True,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    engine: str = 'python',
+    detect_cycles: bool = False,
+    track_stacks: bool = False,
+    deck: Optional[List[int]] = None,
+    hand_size: Optional[int] = None,
+    rules: Optional[WarRules] = None,
+    batch_deals: bool = False,
+    cache: Optional[OutcomeCache] = None,
+    writer: Optional[GameWriter] = None,
+    keep_games: bool = True,
+    progress: Optional['RunProgress'] = None,
+    profiler: Optional['RunProfiler'] = None,
+    trace_dir: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+) -> Dict[str, Any]:
     """
     Run multiple War game simulations and return aggregate statistics.
-    
+
     Args:
         num_games: Number of games to simulate
         verbose: Whether to print progress updates
-    
+        workers: Number of worker processes to spread games across
+        seed: Seed for the run; game i is dealt from its own substream, so
+            the same seed gives the same games for any number of workers
+            (random if None)
+        engine: 'python' (default), 'numpy' for the vectorized batch
+            engine or 'jit' for the compiled kernel (Python speed without
+            numba); all produce identical games for the same seed
+        detect_cycles: Stop looping games as soon as the loop is proven and
+            add cycle_length/cycle_start columns (python engine only)
+        track_stacks: Record player 1's stack size after every round of
+            every game (python engine only)
+        deck: Cards to deal, e.g. create_deck(ranks, suits) for a reduced
+            deck (standard 52-card deck if None; python and jit engines)
+        hand_size: Cards dealt to player 1 (half the deck if None)
+        rules: WarRules variant from src.rules (standard rules if None;
+            python engine, or jit for a different facedown count)
+        batch_deals: Deal each chunk at once with the vectorized dealer in
+            src.dealing instead of one random.Random shuffle per game; the
+            games differ from those of the same seed without it, but are
+            the same for every engine, worker count and chunking
+        cache: OutcomeCache from src.cache consulted before playing each
+            deal (python engine with one worker only)
+        writer: GameWriter from src.output that each chunk of games is
+            written to as soon as it finishes (optional)
+        keep_games: Whether to keep every game for game_data; with
+            keep_games=False memory stays bounded by a few chunks however
+            many games are played, and the games only reach the writer
+        progress: RunProgress from src.progress that counts each chunk as
+            it finishes, for live reporting (optional)
+        profiler: RunProfiler from src.profiling to time the summary
+            accumulation (and checkpoint saves) in, as its 'accumulation'
+            phase (optional)
+        trace_dir: Directory to record every round of every game to, for
+            src.trace.TraceReader and replay_trace() (python engine only;
+            about 4 bytes per round)
+        checkpoint_dir: Directory to save periodic checkpoints to, so an
+            interrupted run can be finished with resume_simulation()
+        checkpoint_every: Games between checkpoints
+
+    Returns:
+        SimulationResults dictionary containing:
+            - 'game_data': DataFrame with individual game statistics (indexed
+              by game_num), built from the stored columns on first access
+              (only when keep_games is set)
+            - 'summary': Dictionary of aggregate statistics, with the same
+              keys as analyze_results()
+            - 'seed': Seed the run used, for replaying games with replay_game()
+            - 'stacks': StackTrajectories with one trajectory per game, in
+              game order (only when track_stacks is set)
+    """
+    if seed is None:
+        seed = random_seed()
+    game_options = _game_options(detect_cycles=detect_cycles, track_stacks=track_stacks,
+                                 deck=deck, hand_size=hand_size, rules=rules,
+                                 batch_deals=batch_deals)
+
+    # Check every option before the trace or checkpoint directory is made
+    if trace_dir is not None:
+        if checkpoint_dir is not None:
+            raise ValueError("trace_dir cannot be combined with checkpointing")
+        if engine != 'python':
+            raise ValueError("trace_dir needs the python engine")
+        if detect_cycles or track_stacks or cache is not None:
+            raise ValueError("trace_dir cannot be combined with detect_cycles, track_stacks or cache")
+        if not as_rules(rules).deterministic:
+            raise ValueError("trace_dir needs rules that don't shuffle winnings")
+    if checkpoint_dir is not None and track_stacks:
+        raise ValueError("track_stacks cannot be combined with checkpointing")
+    # Each worker process would only fill its own copy of the cache
+    if cache is not None and workers > 1:
+        raise ValueError("cache requires workers=1")
+
+    tracer = None
+    if trace_dir is not None:
+        from src.trace import TraceWriter
+        game_options['trace'] = True
+        tracer = TraceWriter(trace_dir, rules, seed)
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        config = {
+            'num_games': num_games,
+            'seed': seed,
+            'engine': engine,
+            # A copy, so the cache added below stays out of the saved config
+            'game_options': dict(game_options),
+        }
+        checkpoint = Checkpoint.create(checkpoint_dir, config, checkpoint_every)
+
+    if cache is not None:
+        # Not part of the checkpoint config: the cache only changes speed
+        game_options['cache'] = cache
+
+    if tracer is None:
+        return _run(num_games, seed, engine, game_options, verbose, workers, writer,
+                    keep_games, progress, checkpoint, profiler=profiler)
+    with tracer:
+        return _run(num_games, seed, engine, game_options, verbose, workers, writer,
+                    keep_games, progress, checkpoint, tracer, profiler)
+
+
+def resume_simulation(
+    checkpoint_dir: str,
+    verbose: bool = True,
+    workers: int = 1,
+    writer: Optional[GameWriter] = None,
+    keep_games: bool = True,
+    progress: Optional['RunProgress'] = None,
+    profiler: Optional['RunProfiler'] = None,
+    engine: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Finish a checkpointed run that was interrupted.
+
+    The games, seed and options come from the checkpoint. Games already
+    checkpointed are read back rather than replayed, and the remaining
+    games are played from the saved RNG position, so the results match an
+    uninterrupted run with the same seed.
+
+    Args:
+        checkpoint_dir: Directory passed as checkpoint_dir to run_simulation()
+        verbose: Whether to print progress updates
+        workers: Number of worker processes to spread games across
+        writer: GameWriter that receives every game, including the ones
+            read back from the checkpoint (optional)
+        keep_games: Whether to keep every game for game_data
+        progress: RunProgress counting the remaining games (optional)
+        profiler: RunProfiler timing the summary accumulation (optional)
+        engine: Engine for the remaining games (the checkpointed run's if
+            None); every engine plays the same games
+
     Returns:
-        Dictionary containing:
-            - 'game_data': DataFrame with individual game statistics (indexed by game_num)
-            - 'summary': Dictionary of aggregate statistics from analyze_results()
+        Same dictionary as run_simulation()
     """
+    checkpoint = Checkpoint.load(checkpoint_dir)
+    config = checkpoint.config
+    if verbose:
+        print(f"\nResuming from {checkpoint_dir}: "
+              f"{checkpoint.completed_games:,} of {config['num_games']:,} games done")
+    return _run(config['num_games'], config['seed'], engine or config['engine'],
+                config['game_options'], verbose, workers, writer, keep_games, progress,
+                checkpoint, profiler=profiler)
+
+
+def _run(num_games: int, seed: int, engine: str, game_options: Dict[str, Any],
+         verbose: bool, workers: int, writer: Optional[GameWriter], keep_games: bool,
+         progress: Optional['RunProgress'], checkpoint: Optional[Checkpoint],
+         tracer=None, profiler: Optional['RunProfiler'] = None) -> Dict[str, Any]:
+    """Play (the rest of) a run and assemble the results dictionary."""
     if verbose:
         print(f"\nRunning {num_games:,} War game simulations...")
         print("This may take a moment...\n")
-    
-    all_game_stats = []
-    
+
+    columns = GameColumns() if keep_games else None
+    stacks = StackTrajectories() if game_options.get('track_stacks') else None
+    first_game = 0
+    if checkpoint is not None:
+        accumulator = checkpoint.accumulator
+        first_game = checkpoint.completed_games
+        if columns is not None or writer is not None:
+            checkpointed_games = list(checkpoint.iter_games())
+            if columns is not None:
+                columns.extend(checkpointed_games)
+            if writer is not None:
+                writer.write(checkpointed_games)
+    else:
+        accumulator = StreamingSummary()
+
     # Progress reporting intervals
     report_interval = max(1, num_games // 10)  # Report every 10%
-    
-    for i in range(num_games):
-        # Run a single game
-        game_stats = play_game()
-        game_stats['game_num'] = i + 1  # Add game number starting from 1
-        all_game_stats.append(game_stats)
-        
+    next_report = report_interval
+    while next_report <= first_game:
+        next_report += report_interval
+
+    completed = first_game
+    if progress is not None:
+        progress.start(num_games, first_game)
+    for chunk_stats in _iter_chunks(num_games, seed, workers, engine, game_options, first_game):
+        if stacks is not None:
+            # Move trajectories into the shared flat buffer
+            for game in chunk_stats:
+                stacks.append(game.pop('stack_sizes'))
+        if tracer is not None:
+            for game in chunk_stats:
+                tracer.append(game)
+        if columns is not None:
+            columns.extend(chunk_stats)
+        if writer is not None:
+            writer.write(chunk_stats)
+        with profiler.phase('accumulation') if profiler else nullcontext():
+            if checkpoint is not None:
+                checkpoint.record(chunk_stats)
+            else:
+                accumulator.update(chunk_stats)
+        completed += len(chunk_stats)
+        if progress is not None:
+            progress.update(chunk_stats)
+
         # Progress update
-        if verbose and (i + 1) % report_interval == 0:
-            progress = ((i + 1) / num_games) * 100
-            print(f"Progress: {progress:.0f}% ({i + 1:,} / {num_games:,} games)")
-    
+        if verbose and completed >= next_report:
+            percent = (completed / num_games) * 100
+            print(f"Progress: {percent:.0f}% ({completed:,} / {num_games:,} games)")
+            while next_report <= completed:
+                next_report += report_interval
+
+    if checkpoint is not None:
+        checkpoint.flush()
+    if progress is not None:
+        progress.finish()
+
     if verbose:
         print(f"\nCompleted {num_games:,} simulations!")
         print("Analyzing results...\n")
-    
-    # Convert to DataFrame
-    # Extract only the scalar values for the main DataFrame
-    df_data = []
-    for game in all_game_stats:
-        row = {
-            'game_num': game['game_num'],
-            'rounds': game['rounds'],
-            'wars': game['wars'],
-            'double_wars': game['double_wars'],
-            'winner': game['winner'],
-            'hit_max_rounds': game['hit_max_rounds']
-        }
-        df_data.append(row)
-    
-    df = pd.DataFrame(df_data)
-    df.set_index('game_num', inplace=True)
-    
-    # Analyze and return results
-    summary = analyze_results(all_game_stats)
-    
-    return {
-        'game_data': df,
-        'summary': summary
-    }
\ No newline at end of file
+
+    # Analyze and return results; game_data is built when first looked up
+    summary = accumulator.summary()
+
+    results = SimulationResults(
+        columns,
+        summary=summary,
+        seed=seed
+    )
+    if stacks is not None:
+        results['stacks'] = stacks
+    return results
+
+
+def run_until_confident(
+    targets: Dict[str, float],
+    confidence: float = 0.95,
+    batch_size: int = ADAPTIVE_BATCH_SIZE,
+    max_games: Optional[int] = None,
+    verbose: bool = True,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    engine: str = 'python',
+    detect_cycles: bool = False,
+    deck: Optional[List[int]] = None,
+    hand_size: Optional[int] = None,
+    rules: Optional[WarRules] = None,
+    batch_deals: bool = False,
+    writer: Optional[GameWriter] = None,
+    keep_games: bool = True,
+    progress: Optional['RunProgress'] = None,
+    profiler: Optional['RunProfiler'] = None,
+) -> Dict[str, Any]:
+    """
+    Simulate in batches until every target confidence interval is reached.
+
+    After each batch, the confidence-interval half-width of each targeted
+    metric is estimated from the games so far; the run stops once all of
+    them are at or below their targets (or max_games is reached).
+
+    Args:
+        targets: Half-width to reach per metric, keyed by names from
+            CI_METRICS: 'rounds_mean' (rounds), 'p1_win_pct' and
+            'infinite_pct' (percentage points)
+        confidence: Two-sided confidence level of the intervals
+        batch_size: Games to play between checks
+        max_games: Upper bound on games played (unbounded if None)
+        verbose, workers, seed, engine, detect_cycles, deck, hand_size,
+            rules, batch_deals, writer, keep_games, progress, profiler: As
+            in run_simulation(); progress counts toward max_games, if set
+
+    Returns:
+        Same dictionary as run_simulation(), plus:
+            - 'games_needed': Number of games played
+            - 'half_widths': Final half-width per targeted metric
+            - 'converged': Whether every target was reached
+    """
+    unknown = set(targets) - set(CI_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown CI metrics {sorted(unknown)}; expected some of {CI_METRICS}")
+    if seed is None:
+        seed = random_seed()
+    game_options = _game_options(detect_cycles=detect_cycles, deck=deck, hand_size=hand_size,
+                                 rules=rules, batch_deals=batch_deals)
+
+    if verbose:
+        wanted = ', '.join(f"{metric} +/- {width:g}" for metric, width in targets.items())
+        print(f"\nRunning War game simulations until {confidence:.0%} CIs reach: {wanted}\n")
+
+    accumulator = StreamingSummary()
+    columns = GameColumns() if keep_games else None
+    games_played = 0
+    if progress is not None:
+        progress.start(max_games)
+    converged = False
+    # Undefined until the first batch (and for good if max_games is 0)
+    half_widths = {metric: math.inf for metric in targets}
+    while not converged and (max_games is None or games_played < max_games):
+        first_game = games_played
+        last_game = first_game + batch_size
+        if max_games is not None:
+            last_game = min(last_game, max_games)
+        for chunk_stats in _iter_chunks(last_game, seed, workers, engine, game_options, first_game):
+            with profiler.phase('accumulation') if profiler else nullcontext():
+                accumulator.update(chunk_stats)
+            if columns is not None:
+                columns.extend(chunk_stats)
+            if writer is not None:
+                writer.write(chunk_stats)
+            if progress is not None:
+                progress.update(chunk_stats)
+        games_played = last_game
+
+        widths = confidence_half_widths(accumulator, confidence)
+        half_widths = {metric: widths[metric] for metric in targets}
+        converged = all(half_widths[metric] <= target for metric, target in targets.items())
+        if verbose:
+            current = ', '.join(f"{metric} +/- {width:.4g}" for metric, width in half_widths.items())
+            print(f"{games_played:>12,} games: {current}")
+
+    if progress is not None:
+        progress.finish()
+    if verbose:
+        status = "reached" if converged else "not reached (max games)"
+        print(f"\nTargets {status} after {games_played:,} games\n")
+
+    return SimulationResults(
+        columns,
+        summary=accumulator.summary(),
+        seed=seed,
+        games_needed=games_played,
+        half_widths=half_widths,
+        converged=converged,
+    )
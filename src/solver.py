@@ -0,0 +1,187 @@
+from collections import deque
+from fractions import Fraction
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.game import play_round
+from src.rules import WarRules, as_rules
+
+# Distinct deals grow as a multinomial in the deck size: 12 cards (3 ranks
+# x 4 suits) have 34,650, 16 cards (4 x 4) already 63 million
+MAX_EXACT_DECK = 16
+
+State = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+def distinct_deals(deck: List[int]) -> Iterator[Tuple[int, ...]]:
+    """
+    Yield every distinct ordering of a deck, in lexicographic order.
+
+    Cards of the same rank are interchangeable, and a uniform shuffle makes
+    every distinct ordering equally likely, so these are the equally likely
+    deals of the deck.
+    """
+    cards = sorted(deck)
+    n = len(cards)
+    while True:
+        yield tuple(cards)
+        # Next lexicographic permutation
+        i = n - 2
+        while i >= 0 and cards[i] >= cards[i + 1]:
+            i -= 1
+        if i < 0:
+            return
+        j = n - 1
+        while cards[j] <= cards[i]:
+            j -= 1
+        cards[i], cards[j] = cards[j], cards[i]
+        cards[i + 1:] = reversed(cards[i + 1:])
+
+
+class ExactSolver:
+    """
+    Exact outcomes of War games by walking the deterministic game graph.
+
+    Once dealt, a game is a fixed path through states (p1_hand, p2_hand),
+    each round moving to the next state with play_round(). The solver
+    follows that path until it reaches a finished game, a state already in
+    its transposition table, or a state earlier on the same path (the game
+    loops forever), then fills in the outcome of every state on the path.
+    Because different deals soon run into each other's states, each state
+    is played at most once across all deals.
+
+    Table entries are (winner, rounds, wars, double_wars) still to come from
+    that state; looping states have winner None and rounds None. Games are
+    played by the given WarRules, which must not shuffle winnings.
+    """
+
+    def __init__(self, rules: Optional[WarRules] = None):
+        self.rules = as_rules(rules)
+        if not self.rules.deterministic:
+            raise ValueError("Exact solving needs rules that don't shuffle winnings")
+        self.table: Dict[State, Tuple[Optional[int], Optional[int], int, int]] = {}
+
+    def _walk(self, state: State) -> Tuple[Optional[int], Optional[int], int, int]:
+        table = self.table
+        path = []  # (state, wars, double_wars) for each round played
+        on_path = {}
+        while state not in table:
+            if state in on_path:
+                # Every state from the first visit on is part of the loop;
+                # the states leading into it loop forever as well
+                for visited, _, _ in path:
+                    table[visited] = (None, None, 0, 0)
+                return table[path[0][0]]
+            on_path[state] = len(path)
+
+            p1_hand, p2_hand = deque(state[0]), deque(state[1])
+            stats = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None}
+            if not play_round(p1_hand, p2_hand, stats, self.rules):
+                # Finished without completing another round, or ran out of
+                # cards during a war (stats['rounds'] is then 0)
+                table[state] = (stats['winner'], stats['rounds'], stats['wars'],
+                                stats['double_wars'])
+                del on_path[state]
+                break
+            path.append((state, stats['wars'], stats['double_wars']))
+            state = (tuple(p1_hand), tuple(p2_hand))
+
+        # Fill in the path backwards from the known outcome
+        winner, rounds, wars, double_wars = table[state]
+        for visited, round_wars, round_double_wars in reversed(path):
+            if rounds is not None:
+                rounds += 1
+                wars += round_wars
+                double_wars += round_double_wars
+            table[visited] = (winner, rounds, wars, double_wars)
+        return table[visited] if path else table[state]
+
+    def outcome(self, p1_hand, p2_hand, max_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Exact result of playing two hands, in the shape play_hands() returns.
+
+        Args:
+            p1_hand: player 1's cards, top card first
+            p2_hand: player 2's cards, top card first
+            max_rounds: count games needing this many rounds or more as
+                hitting max rounds, as the simulator does (no limit if None)
+
+        Returns:
+            dict: rounds, wars, double_wars, winner and hit_max_rounds. A
+            game that loops forever has winner None, hit_max_rounds True and
+            rounds None.
+        """
+        winner, rounds, wars, double_wars = self._walk((tuple(p1_hand), tuple(p2_hand)))
+        hit_max_rounds = rounds is None or (max_rounds is not None and rounds >= max_rounds)
+        return {
+            'rounds': rounds,
+            'wars': wars,
+            'double_wars': double_wars,
+            'winner': None if hit_max_rounds else winner,
+            'hit_max_rounds': hit_max_rounds,
+        }
+
+    def solve(self, deck: List[int], hand_size: Optional[int] = None,
+              max_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Exact statistics over every distinct deal of a small deck.
+
+        Args:
+            deck: Cards to deal, e.g. create_deck(ranks=[2, 3, 4])
+            hand_size: Cards dealt to player 1 (half the deck if None)
+            max_rounds: As in outcome(); None counts only true loops as
+                infinite, MAX_ROUNDS matches the simulator
+
+        Returns:
+            Dictionary containing:
+                - 'deals': Number of distinct, equally likely deals
+                - 'states': Size of the transposition table afterwards
+                - 'player_1_wins', 'player_2_wins', 'infinite_games': Deal counts
+                - 'player_1_win_probability', 'player_2_win_probability',
+                  'infinite_probability': Exact Fractions over all deals
+                - 'expected_rounds', 'expected_wars', 'expected_double_wars':
+                  Exact Fractions over finite games (None if there are none)
+        """
+        if len(deck) > MAX_EXACT_DECK:
+            raise ValueError(
+                f"Exact solving is limited to {MAX_EXACT_DECK} cards, got {len(deck)}"
+            )
+        if hand_size is None:
+            hand_size = len(deck) // 2
+        if not 0 < hand_size < len(deck):
+            raise ValueError(f"hand_size must leave both players cards, got {hand_size}")
+
+        deals = 0
+        wins = {1: 0, 2: 0}
+        infinite = 0
+        totals = {'rounds': 0, 'wars': 0, 'double_wars': 0}
+        for cards in distinct_deals(deck):
+            deals += 1
+            game = self.outcome(cards[:hand_size], cards[hand_size:], max_rounds)
+            if game['hit_max_rounds']:
+                infinite += 1
+                continue
+            wins[game['winner']] += 1
+            for metric in totals:
+                totals[metric] += game[metric]
+
+        finite = deals - infinite
+        return {
+            'deals': deals,
+            'states': len(self.table),
+            'player_1_wins': wins[1],
+            'player_2_wins': wins[2],
+            'infinite_games': infinite,
+            'player_1_win_probability': Fraction(wins[1], deals),
+            'player_2_win_probability': Fraction(wins[2], deals),
+            'infinite_probability': Fraction(infinite, deals),
+            'expected_rounds': Fraction(totals['rounds'], finite) if finite else None,
+            'expected_wars': Fraction(totals['wars'], finite) if finite else None,
+            'expected_double_wars': Fraction(totals['double_wars'], finite) if finite else None,
+        }
+
+
+def solve_deck(deck: List[int], hand_size: Optional[int] = None,
+               max_rounds: Optional[int] = None,
+               rules: Optional[WarRules] = None) -> Dict[str, Any]:
+    """Exact statistics for a small deck; see ExactSolver.solve()."""
+    return ExactSolver(rules).solve(deck, hand_size, max_rounds)
@@ -0,0 +1,143 @@
+from array import array
+from typing import Iterable
+
+from src.deck import CARD_RANKS, NUM_SUITS
+
+DECK_SIZE = len(CARD_RANKS) * NUM_SUITS
+# Largest deck whose stack sizes fit the one-byte values
+MAX_TRACKED_DECK = 127
+
+
+class StackTrajectories:
+    """
+    Player 1's stack size after every round, for many games.
+
+    All games share one flat array('b') of stack sizes (one byte per round)
+    plus an array of offsets, so game i's trajectory is
+    values[offsets[i]:offsets[i + 1]]. Player 2's stack is the deck size
+    minus player 1's stack, minus any cards in a war pot. Decks are
+    therefore limited to MAX_TRACKED_DECK cards.
+    """
+
+    def __init__(self):
+        self.values = array('b')
+        self.offsets = array('q', [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, game_index):
+        """Trajectory of one game (zero-based index) as an array('b')."""
+        if game_index < 0:
+            game_index += len(self)
+        return self.values[self.offsets[game_index]:self.offsets[game_index + 1]]
+
+    def append(self, stack_sizes: Iterable[int]) -> None:
+        """Add one game's trajectory."""
+        self.values.extend(stack_sizes)
+        self.offsets.append(len(self.values))
+
+    def extend(self, other: 'StackTrajectories') -> None:
+        """Add every game from another set of trajectories."""
+        base = len(self.values)
+        self.values.extend(other.values)
+        self.offsets.extend(base + offset for offset in other.offsets[1:])
+
+    def as_numpy(self):
+        """
+        Zero-copy NumPy views of the data.
+
+        Returns:
+            tuple: (values, offsets) as int8 and int64 arrays
+        """
+        import numpy as np
+        return (np.frombuffer(self.values, dtype=np.int8),
+                np.frombuffer(self.offsets, dtype=np.int64))
+
+
+def _game_ids(offsets):
+    """Game index of every round in the flat value array."""
+    import numpy as np
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def lead_changes(trajectories: StackTrajectories, deck_size: int = DECK_SIZE):
+    """
+    Count how often the lead changes hands in each game.
+
+    A player leads while holding more than half the deck. Rounds where
+    neither player leads are skipped, so a lead passing through an even
+    split still counts as one change.
+
+    Returns:
+        int64 array with one count per game
+    """
+    import numpy as np
+    values, offsets = trajectories.as_numpy()
+    num_games = len(offsets) - 1
+    if not len(values):
+        return np.zeros(num_games, dtype=np.int64)
+
+    lead = np.sign(2 * values.astype(np.int64) - deck_size)
+    starts = np.zeros(len(values), dtype=bool)
+    starts[offsets[:-1][np.diff(offsets) > 0]] = True
+
+    # Carry the last leader forward over even rounds, without crossing
+    # from one game into the next
+    anchor = np.where((lead != 0) | starts, np.arange(len(values)), 0)
+    leader = lead[np.maximum.accumulate(anchor)]
+
+    change = (leader[1:] != leader[:-1]) & (leader[1:] != 0) & (leader[:-1] != 0) & ~starts[1:]
+    game_ids = _game_ids(offsets)
+    return np.bincount(game_ids[1:][change], minlength=num_games)
+
+
+def time_to_lead(trajectories: StackTrajectories, player: int = 1,
+                 deck_size: int = DECK_SIZE):
+    """
+    Round number (1-based) at which a player first holds the lead.
+
+    Args:
+        player: 1 or 2
+        deck_size: total cards in play
+
+    Returns:
+        int64 array with one value per game, -1 if the player never led
+    """
+    import numpy as np
+    values, offsets = trajectories.as_numpy()
+    num_games = len(offsets) - 1
+    result = np.full(num_games, -1, dtype=np.int64)
+
+    doubled = 2 * values.astype(np.int64)
+    leading = doubled > deck_size if player == 1 else doubled < deck_size
+    positions = np.flatnonzero(leading)
+    game_ids = _game_ids(offsets)[positions]
+    games, first = np.unique(game_ids, return_index=True)
+    result[games] = positions[first] - offsets[games] + 1
+    return result
+
+
+def stack_histograms(trajectories: StackTrajectories, max_rounds: int = None,
+                     deck_size: int = DECK_SIZE):
+    """
+    Distribution of player 1's stack size at each round, across games.
+
+    Args:
+        max_rounds: number of rounds to include (default: longest game)
+        deck_size: total cards in play
+
+    Returns:
+        int64 array of shape (max_rounds, deck_size + 1), where entry
+        [r, s] counts the games in which player 1 held s cards after
+        round r + 1. Games that have ended don't contribute.
+    """
+    import numpy as np
+    values, offsets = trajectories.as_numpy()
+    rounds = np.arange(len(values)) - np.repeat(offsets[:-1], np.diff(offsets))
+    if max_rounds is None:
+        max_rounds = int(rounds.max()) + 1 if len(rounds) else 0
+    keep = rounds < max_rounds
+    bins = rounds[keep] * (deck_size + 1) + values[keep]
+    counts = np.bincount(bins, minlength=max_rounds * (deck_size + 1))
+    return counts.reshape(max_rounds, deck_size + 1)
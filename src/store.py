@@ -0,0 +1,221 @@
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.output import GameWriter
+from src.seeding import random_seed
+from src.simulation import _game_options, _iter_chunks
+from src.streaming import StreamingSummary
+
+# Games between commits when extending a store, so an interrupted run
+# keeps every finished batch
+STORE_BATCH_SIZE = 100000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    seed TEXT NOT NULL,
+    options TEXT NOT NULL,
+    first_game INTEGER NOT NULL,
+    last_game INTEGER NOT NULL,
+    added REAL NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS batches_series ON batches (seed, options, first_game);
+CREATE TABLE IF NOT EXISTS aggregates (
+    seed TEXT NOT NULL,
+    options TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (seed, options)
+);
+"""
+
+
+def _options_key(game_options: Optional[Dict[str, Any]]) -> str:
+    """Canonical JSON of a run's play_game() options."""
+    return json.dumps(game_options or {}, sort_keys=True)
+
+
+class ResultStore:
+    """
+    SQLite store of run summaries that grows batch by batch.
+
+    A series is every game played with one seed and one set of game
+    options; game i of a series is always the same game, whichever engine
+    or worker count plays it. Each added batch records the zero-based
+    [first_game, last_game) range it covers and its StreamingSummary
+    state, and the series' merged state is updated in the same
+    transaction. Adding a batch therefore costs one merge of accumulator
+    states, not a pass over the history, and a batch overlapping games
+    already in the store is rejected, so no game is counted twice.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+        self.path = path
+        # Transactions are opened explicitly, see add()
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+
+    def add(self, seed: int, first_game: int, last_game: int, accumulator: StreamingSummary,
+            game_options: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record games first_game..last_game-1 of a series.
+
+        Raises:
+            ValueError: if any of the games are already in the store
+        """
+        if not 0 <= first_game < last_game:
+            raise ValueError(f"Invalid game range [{first_game}, {last_game})")
+        if accumulator.total_games != last_game - first_game:
+            raise ValueError(
+                f"Batch holds {accumulator.total_games} games, range covers "
+                f"{last_game - first_game}"
+            )
+        key = (str(seed), _options_key(game_options))
+        db = self._connection
+        # IMMEDIATE takes the write lock before the overlap check, so two
+        # processes can't both add the same games
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            overlap = db.execute(
+                "SELECT first_game, last_game FROM batches WHERE seed = ? AND options = ? "
+                "AND first_game < ? AND last_game > ? LIMIT 1",
+                key + (last_game, first_game)
+            ).fetchone()
+            if overlap is not None:
+                raise ValueError(
+                    f"Games {first_game + 1:,} to {last_game:,} of seed {seed} overlap "
+                    f"games {overlap[0] + 1:,} to {overlap[1]:,} already in the store"
+                )
+            row = db.execute(
+                "SELECT state FROM aggregates WHERE seed = ? AND options = ?", key
+            ).fetchone()
+            merged = StreamingSummary.from_dict(json.loads(row[0])) if row else StreamingSummary()
+            merged.merge(accumulator)
+            db.execute(
+                "INSERT INTO batches VALUES (?, ?, ?, ?, ?, ?)",
+                key + (first_game, last_game, time.time(), json.dumps(accumulator.to_dict()))
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?)",
+                key + (json.dumps(merged.to_dict()),)
+            )
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def ranges(self, seed: int, game_options: Optional[Dict[str, Any]] = None
+               ) -> List[Tuple[int, int]]:
+        """Zero-based [first, last) game ranges of a series in the store, coalesced."""
+        ranges = []
+        for first, last in self._connection.execute(
+            "SELECT first_game, last_game FROM batches WHERE seed = ? AND options = ? "
+            "ORDER BY first_game", (str(seed), _options_key(game_options))
+        ):
+            if ranges and ranges[-1][1] == first:
+                ranges[-1] = (ranges[-1][0], last)
+            else:
+                ranges.append((first, last))
+        return ranges
+
+    def next_game(self, seed: int, game_options: Optional[Dict[str, Any]] = None) -> int:
+        """First game after everything stored for a series (0 for a new series)."""
+        row = self._connection.execute(
+            "SELECT MAX(last_game) FROM batches WHERE seed = ? AND options = ?",
+            (str(seed), _options_key(game_options))
+        ).fetchone()
+        return row[0] or 0
+
+    def seeds(self, game_options: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Seeds stored with these options, oldest first."""
+        return [int(seed) for seed, in self._connection.execute(
+            "SELECT seed FROM batches WHERE options = ? GROUP BY seed ORDER BY MIN(rowid)",
+            (_options_key(game_options),)
+        )]
+
+    def accumulator(self, game_options: Optional[Dict[str, Any]] = None,
+                    seed: Optional[int] = None) -> StreamingSummary:
+        """Merged accumulator of every series with these options (and seed, if given)."""
+        query = "SELECT state FROM aggregates WHERE options = ?"
+        params = (_options_key(game_options),)
+        if seed is not None:
+            query += " AND seed = ?"
+            params += (str(seed),)
+        merged = StreamingSummary()
+        for state, in self._connection.execute(query, params):
+            merged.merge(StreamingSummary.from_dict(json.loads(state)))
+        return merged
+
+    def summary(self, game_options: Optional[Dict[str, Any]] = None,
+                seed: Optional[int] = None) -> Dict[str, Any]:
+        """Summary dict, with the same keys as analyze_results(), of the stored games."""
+        return self.accumulator(game_options, seed).summary()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def extend_store(store: ResultStore, num_games: int, seed: Optional[int] = None,
+                 workers: int = 1, engine: str = 'python', verbose: bool = True,
+                 writer: Optional[GameWriter] = None, batch_size: int = STORE_BATCH_SIZE,
+                 **options) -> Dict[str, Any]:
+    """
+    Play num_games more games of a series and add them to a store.
+
+    The games continue the series where the store leaves off, so repeated
+    calls keep adding new games of the same seed.
+
+    Args:
+        store: ResultStore to add to
+        num_games: Games to add
+        seed: Series seed; if None, the most recently started series with
+            these options is continued, or a new random seed is drawn
+        workers, engine, verbose: As in run_simulation()
+        writer: GameWriter that receives the new games (optional)
+        batch_size: Games per committed batch
+        **options: play_game() options (detect_cycles, deck, hand_size,
+            rules, batch_deals)
+
+    Returns:
+        Dictionary containing:
+            - 'seed': Seed of the series
+            - 'first_game', 'last_game': Zero-based range of the new games
+            - 'ranges': Every stored range of the series, as from ranges()
+            - 'summary': Summary of every stored game with these options
+    """
+    game_options = _game_options(**options)
+    if seed is None:
+        seeds = store.seeds(game_options)
+        seed = seeds[-1] if seeds else random_seed()
+    first_game = store.next_game(seed, game_options)
+    last_game = first_game + num_games
+    if verbose:
+        print(f"\nAdding games {first_game + 1:,} to {last_game:,} of seed {seed} "
+              f"to {store.path}...")
+
+    for batch_first in range(first_game, last_game, batch_size):
+        batch_last = min(batch_first + batch_size, last_game)
+        accumulator = StreamingSummary()
+        for chunk_stats in _iter_chunks(batch_last, seed, workers, engine, game_options,
+                                        batch_first):
+            accumulator.update(chunk_stats)
+            if writer is not None:
+                writer.write(chunk_stats)
+        store.add(seed, batch_first, batch_last, accumulator, game_options)
+        if verbose:
+            print(f"Stored games {batch_first + 1:,} to {batch_last:,}")
+
+    return {
+        'seed': seed,
+        'first_game': first_game,
+        'last_game': last_game,
+        'ranges': store.ranges(seed, game_options),
+        'summary': store.summary(game_options),
+    }
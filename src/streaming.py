@@ -0,0 +1,251 @@
+import math
+from collections import Counter
+from fractions import Fraction
+from typing import Dict, Any, Iterable, Optional
+
+# Metrics with a confidence interval, in the units print_summary() reports:
+# mean rounds of finite games, P1 win % of finite games, % infinite games
+CI_METRICS = ('rounds_mean', 'p1_win_pct', 'infinite_pct')
+
+
+class StreamingSummary:
+    """
+    Constant-memory accumulator producing the same summary as analyze_results().
+
+    Games are added one at a time. Every per-game statistic is a bounded
+    integer (rounds never exceed MAX_ROUNDS), so the accumulator keeps exact
+    integer power sums, the wars-rounds cross moment and a value histogram
+    per statistic. Python integers never overflow, so the moments carry no
+    rounding error, and the histograms give exact medians in memory bounded
+    by the number of distinct values rather than the number of games.
+    Accumulators from separate runs can be combined with merge().
+    """
+
+    METRICS = ('rounds', 'wars', 'double_wars')
+
+    def __init__(self):
+        self.total_games = 0
+        self.infinite_games = 0
+        self.player_1_wins = 0
+        self.player_2_wins = 0
+        self.sums = dict.fromkeys(self.METRICS, 0)
+        self.squares = dict.fromkeys(self.METRICS, 0)
+        self.rounds_wars = 0  # Cross moment sum(rounds * wars)
+        self.histograms = {metric: Counter() for metric in self.METRICS}
+
+    @property
+    def finite_games(self) -> int:
+        return self.total_games - self.infinite_games
+
+    def add(self, game: Dict[str, Any]) -> None:
+        """Add one game's statistics dict (as returned by play_game())."""
+        self.total_games += 1
+        if game['hit_max_rounds']:
+            self.infinite_games += 1
+            return
+
+        if game['winner'] == 1:
+            self.player_1_wins += 1
+        elif game['winner'] == 2:
+            self.player_2_wins += 1
+
+        for metric in self.METRICS:
+            value = game[metric]
+            self.sums[metric] += value
+            self.squares[metric] += value * value
+            self.histograms[metric][value] += 1
+        self.rounds_wars += game['rounds'] * game['wars']
+
+    def update(self, games: Iterable[Dict[str, Any]]) -> 'StreamingSummary':
+        """Add every game from an iterable; returns self for chaining."""
+        for game in games:
+            self.add(game)
+        return self
+
+    def merge(self, other: 'StreamingSummary') -> 'StreamingSummary':
+        """Fold another accumulator's games into this one; returns self."""
+        self.total_games += other.total_games
+        self.infinite_games += other.infinite_games
+        self.player_1_wins += other.player_1_wins
+        self.player_2_wins += other.player_2_wins
+        for metric in self.METRICS:
+            self.sums[metric] += other.sums[metric]
+            self.squares[metric] += other.squares[metric]
+            self.histograms[metric].update(other.histograms[metric])
+        self.rounds_wars += other.rounds_wars
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the accumulator state to a JSON-compatible dict."""
+        return {
+            'total_games': self.total_games,
+            'infinite_games': self.infinite_games,
+            'player_1_wins': self.player_1_wins,
+            'player_2_wins': self.player_2_wins,
+            'sums': dict(self.sums),
+            'squares': dict(self.squares),
+            'rounds_wars': self.rounds_wars,
+            'histograms': {
+                metric: {str(value): count for value, count in sorted(histogram.items())}
+                for metric, histogram in self.histograms.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'StreamingSummary':
+        """Rebuild an accumulator from to_dict() output."""
+        accumulator = cls()
+        accumulator.total_games = state['total_games']
+        accumulator.infinite_games = state['infinite_games']
+        accumulator.player_1_wins = state['player_1_wins']
+        accumulator.player_2_wins = state['player_2_wins']
+        accumulator.sums = dict(state['sums'])
+        accumulator.squares = dict(state['squares'])
+        accumulator.rounds_wars = state['rounds_wars']
+        accumulator.histograms = {
+            metric: Counter({int(value): count for value, count in histogram.items()})
+            for metric, histogram in state['histograms'].items()
+        }
+        return accumulator
+
+    def _median(self, metric: str):
+        """Median matching statistics.median(), read off the histogram."""
+        n = self.finite_games
+        lower_rank, upper_rank = (n - 1) // 2, n // 2
+        lower = upper = None
+        seen = 0
+        for value in sorted(self.histograms[metric]):
+            seen += self.histograms[metric][value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        if lower == upper:
+            return lower
+        return (lower + upper) / 2
+
+    def _spread(self, metric: str) -> int:
+        """n * sum(x^2) - sum(x)^2, i.e. n^2 times the population variance."""
+        return self.finite_games * self.squares[metric] - self.sums[metric] ** 2
+
+    def _metric_summary(self, metric: str) -> Dict[str, Any]:
+        n = self.finite_games
+        histogram = self.histograms[metric]
+        return {
+            'mean': self.sums[metric] / n,
+            'median': self._median(metric),
+            'stdev': math.sqrt(Fraction(self._spread(metric), n * (n - 1))) if n > 1 else 0,
+            'min': min(histogram),
+            'max': max(histogram),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Return a summary dict with the same keys as analyze_results()."""
+        if not self.total_games:
+            return {}
+
+        if not self.finite_games:
+            return {
+                'total_games': self.total_games,
+                'rounds': {},
+                'wars': {},
+                'double_wars': {},
+                'winners': {},
+                'correlation_wars_rounds': None,
+                'infinite_games': {
+                    'count': self.infinite_games,
+                    'percentage': 100.0,
+                },
+            }
+
+        total_finite = self.finite_games
+        games_with_wars = total_finite - self.histograms['wars'][0]
+        games_with_double_wars = total_finite - self.histograms['double_wars'][0]
+
+        results = {
+            'total_games': self.total_games,
+            'rounds': self._metric_summary('rounds'),
+            'wars': {
+                **self._metric_summary('wars'),
+                'games_with_wars': games_with_wars,
+                'percentage_with_wars': (games_with_wars / total_finite) * 100,
+            },
+            'double_wars': {
+                **self._metric_summary('double_wars'),
+                'games_with_double_wars': games_with_double_wars,
+                'percentage_with_double_wars': (games_with_double_wars / total_finite) * 100,
+            },
+            'winners': {
+                'player_1_wins': self.player_1_wins,
+                'player_2_wins': self.player_2_wins,
+                'player_1_win_percentage': (self.player_1_wins / total_finite) * 100,
+                'player_2_win_percentage': (self.player_2_wins / total_finite) * 100,
+            },
+            'infinite_games': {
+                'count': self.infinite_games,
+                'percentage': (self.infinite_games / self.total_games) * 100,
+            },
+        }
+
+        # Correlation (finite games only)
+        if total_finite > 1:
+            numerator = total_finite * self.rounds_wars - self.sums['rounds'] * self.sums['wars']
+            denominator = math.sqrt(self._spread('rounds')) * math.sqrt(self._spread('wars'))
+            results['correlation_wars_rounds'] = numerator / denominator if denominator != 0 else 0
+        else:
+            results['correlation_wars_rounds'] = None
+
+        return results
+
+
+def confidence_half_widths(accumulator: StreamingSummary,
+                           confidence: float = 0.95) -> Dict[str, float]:
+    """
+    Normal-approximation confidence-interval half-widths for CI_METRICS.
+
+    Args:
+        accumulator: Games seen so far
+        confidence: Two-sided confidence level, e.g. 0.95
+
+    Returns:
+        Dict mapping each metric to its half-width (inf if undefined yet)
+    """
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    n_finite = accumulator.finite_games
+    n_total = accumulator.total_games
+
+    def proportion_half_width(successes, n):
+        if n < 2:
+            return math.inf
+        p = successes / n
+        return z * math.sqrt(p * (1 - p) / n) * 100
+
+    if n_finite > 1:
+        variance = Fraction(accumulator._spread('rounds'), n_finite * (n_finite - 1))
+        rounds_half_width = z * math.sqrt(variance / n_finite)
+    else:
+        rounds_half_width = math.inf
+
+    return {
+        'rounds_mean': rounds_half_width,
+        'p1_win_pct': proportion_half_width(accumulator.player_1_wins, n_finite),
+        'infinite_pct': proportion_half_width(accumulator.infinite_games, n_total),
+    }
+
+
+def analyze_stream(games: Iterable[Dict[str, Any]],
+                   accumulator: Optional[StreamingSummary] = None) -> Dict[str, Any]:
+    """
+    Summarize games one at a time without holding them in memory.
+
+    Args:
+        games: Iterable of per-game statistics dicts, e.g. iter_games()
+        accumulator: Existing accumulator to add the games to (optional)
+
+    Returns:
+        Summary dict with the same keys as analyze_results()
+    """
+    accumulator = accumulator or StreamingSummary()
+    return accumulator.update(games).summary()
@@ -0,0 +1,243 @@
+"""
+Parameter sweeps: the same simulation across a grid of configurations.
+
+Every (configuration, batch of games) job goes to one worker pool that
+lives for the whole sweep, so startup and import costs are paid once.
+Each configuration's batches are summarized with StreamingSummary and
+merged as they finish; once all of a configuration's batches are in, its
+summary becomes one row of a tidy results table that is rewritten after
+every completed configuration. Re-running a sweep against the same table
+skips the configurations it already holds.
+"""
+
+import itertools
+import os
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from src.deck import CARD_RANKS, NUM_SUITS, create_deck
+from src.game import MAX_ROUNDS
+from src.output import infer_format
+from src.rules import STANDARD_RULES, WarRules
+from src.seeding import random_seed
+from src.simulation import CHUNK_SIZE, replay_game
+from src.streaming import StreamingSummary
+
+# Sweepable parameters and their defaults
+GRID_PARAMETERS = {
+    'max_rounds': MAX_ROUNDS,
+    'facedown': STANDARD_RULES.facedown,
+    'short_war': STANDARD_RULES.short_war,
+    'winnings': STANDARD_RULES.winnings,
+    'ranks': len(CARD_RANKS),
+    'suits': NUM_SUITS,
+}
+
+# Summary columns of each results row, after the parameters
+RESULT_COLUMNS = (
+    'num_games', 'seed', 'rounds_mean', 'rounds_median', 'rounds_stdev',
+    'wars_mean', 'double_wars_mean', 'player_1_win_percentage',
+    'player_2_win_percentage', 'infinite_percentage', 'correlation_wars_rounds',
+)
+
+
+def parse_grid_value(text: str) -> Dict[str, List[Any]]:
+    """Parse a NAME=V1,V2,... grid argument; integer values become ints."""
+    name, _, values = text.partition('=')
+    if name not in GRID_PARAMETERS or not values:
+        raise ValueError(
+            f"Expected NAME=V1,V2,... with NAME one of {', '.join(GRID_PARAMETERS)}"
+        )
+    kind = type(GRID_PARAMETERS[name])
+    try:
+        return {name: [kind(value) for value in values.split(',')]}
+    except ValueError:
+        raise ValueError(f"Invalid value for {name} in {text!r}")
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the grid values, with defaults filled in.
+
+    Returns:
+        List of configuration dicts with one value per GRID_PARAMETERS key
+    """
+    unknown = set(grid) - set(GRID_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters {sorted(unknown)}")
+    names = list(grid)
+    return [
+        {**GRID_PARAMETERS, **dict(zip(names, values))}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def _game_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    play_game() keyword arguments for a configuration.
+
+    Raises:
+        ValueError: if the configuration can't be played
+    """
+    if config['max_rounds'] < 1:
+        raise ValueError(f"max_rounds must be at least 1, got {config['max_rounds']}")
+    if not 1 <= config['ranks'] <= len(CARD_RANKS):
+        raise ValueError(f"ranks must be between 1 and {len(CARD_RANKS)}, got {config['ranks']}")
+    if config['suits'] < 1:
+        raise ValueError(f"suits must be at least 1, got {config['suits']}")
+    if config['ranks'] * config['suits'] < 2:
+        raise ValueError(f"ranks={config['ranks']} suits={config['suits']} deals fewer than 2 cards")
+    options = {}
+    if (config['ranks'], config['suits']) != (len(CARD_RANKS), NUM_SUITS):
+        options['deck'] = create_deck(CARD_RANKS[:config['ranks']], config['suits'])
+    rules = WarRules(config['facedown'], config['short_war'], config['winnings']).validate()
+    if rules != STANDARD_RULES:
+        options['rules'] = rules
+    if config['max_rounds'] != MAX_ROUNDS:
+        options['max_rounds'] = config['max_rounds']
+    return options
+
+
+def _play_batch(config: Dict[str, Any], seed: int, start: int, count: int) -> StreamingSummary:
+    """Summarize games start..start+count-1 of one configuration."""
+    options = _game_options(config)
+    return StreamingSummary().update(
+        replay_game(seed, game_num, **options) for game_num in range(start + 1, start + count + 1)
+    )
+
+
+def _config_key(config: Dict[str, Any], num_games: int) -> tuple:
+    """Identify a configuration's row in the results table."""
+    # Compared as text, so values read back from the table match
+    return tuple(str(config[name]) for name in GRID_PARAMETERS) + (str(num_games),)
+
+
+def summary_row(config: Dict[str, Any], accumulator: StreamingSummary,
+                seed: int) -> Dict[str, Any]:
+    """One tidy results row: the parameters, then the summary statistics."""
+    summary = accumulator.summary()
+    rounds = summary['rounds']
+    return {
+        **{name: config[name] for name in GRID_PARAMETERS},
+        'num_games': summary['total_games'],
+        'seed': seed,
+        'rounds_mean': rounds.get('mean'),
+        'rounds_median': rounds.get('median'),
+        'rounds_stdev': rounds.get('stdev'),
+        'wars_mean': summary['wars'].get('mean'),
+        'double_wars_mean': summary['double_wars'].get('mean'),
+        'player_1_win_percentage': summary['winners'].get('player_1_win_percentage'),
+        'player_2_win_percentage': summary['winners'].get('player_2_win_percentage'),
+        'infinite_percentage': summary['infinite_games']['percentage'],
+        'correlation_wars_rounds': summary['correlation_wars_rounds'],
+    }
+
+
+def _read_table(path: str, fmt: str):
+    import pandas as pd
+    if fmt == 'csv':
+        return pd.read_csv(path)
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+
+def _write_table(rows: List[Dict[str, Any]], path: str, fmt: str) -> None:
+    """Rewrite the results table atomically."""
+    import pandas as pd
+    table = pd.DataFrame(rows, columns=list(GRID_PARAMETERS) + list(RESULT_COLUMNS))
+    tmp_path = f"{path}.tmp"
+    if fmt == 'csv':
+        table.to_csv(tmp_path, index=False)
+    elif fmt == 'parquet':
+        table.to_parquet(tmp_path, index=False)
+    else:
+        table.to_feather(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(grid: Dict[str, List[Any]], num_games: int, output: str,
+              fmt: Optional[str] = None, seed: Optional[int] = None, workers: int = 1,
+              batch_size: int = CHUNK_SIZE, verbose: bool = True) -> List[Dict[str, Any]]:
+    """
+    Simulate every configuration of a grid and write a table of summaries.
+
+    Every configuration plays the same seeded games (common random numbers),
+    so differences between rows come from the parameters rather than from
+    the deals.
+
+    Args:
+        grid: Values to sweep per parameter, keyed by GRID_PARAMETERS names;
+            parameters left out keep their default
+        num_games: Games per configuration
+        output: Results table path; configurations already in it are skipped
+        fmt: 'csv', 'parquet' or 'feather' (inferred from output if None)
+        seed: Seed for the deals (random if None)
+        workers: Size of the worker pool shared by all jobs
+        batch_size: Games per job
+        verbose: Whether to print each configuration as it completes
+
+    Returns:
+        List of all results rows, including ones from earlier runs
+    """
+    fmt = fmt or infer_format(output)
+    if seed is None:
+        seed = random_seed()
+
+    rows = []
+    done = set()
+    if os.path.exists(output):
+        for row in _read_table(output, fmt).to_dict('records'):
+            rows.append(row)
+            done.add(_config_key(row, row['num_games']))
+
+    configs = [config for config in expand_grid(grid)
+               if _config_key(config, num_games) not in done]
+    for config in configs:
+        _game_options(config)  # Reject bad values before any job is submitted
+    if verbose:
+        print(f"\nSweeping {len(configs)} configurations of {num_games:,} games "
+              f"({len(done)} already done)...\n")
+
+    jobs = [
+        (index, start, min(batch_size, num_games - start))
+        for index in range(len(configs))
+        for start in range(0, num_games, batch_size)
+    ]
+    accumulators = [StreamingSummary() for _ in configs]
+    remaining = [0] * len(configs)
+    for index, _, _ in jobs:
+        remaining[index] += 1
+
+    def finish(index, batch_summary):
+        accumulators[index].merge(batch_summary)
+        remaining[index] -= 1
+        if remaining[index]:
+            return
+        row = summary_row(configs[index], accumulators[index], seed)
+        rows.append(row)
+        _write_table(rows, output, fmt)
+        if verbose:
+            params = ' '.join(f"{name}={configs[index][name]}" for name in grid)
+            print(f"  {params}: P1 wins {row['player_1_win_percentage'] or 0:.2f}%, "
+                  f"infinite {row['infinite_percentage']:.2f}%")
+
+    if workers <= 1:
+        for index, start, count in jobs:
+            finish(index, _play_batch(configs[index], seed, start, count))
+        return rows
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queued = deque(jobs)
+        pending = {}
+        while queued or pending:
+            # Keep a few jobs per worker in flight
+            while queued and len(pending) < 2 * workers:
+                index, start, count = queued.popleft()
+                future = executor.submit(_play_batch, configs[index], seed, start, count)
+                pending[future] = index
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                finish(pending.pop(future), future.result())
+    return rows
@@ -0,0 +1,306 @@
+import json
+import os
+from array import array
+from collections import deque
+from functools import partial
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.rules import WarRules, as_rules
+
+# One record per round: the first face-up pair and the pair that decided
+# the round, packed as p1_card << 4 | p2_card (decider 0 when the game
+# ended during the war), the number of war levels, and the pot size
+RECORD_DTYPE = np.dtype([('faceup', 'u1'), ('decider', 'u1'), ('depth', 'u1'), ('pot', 'u1')])
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+TRACE_FORMAT = 1
+ROUNDS_FILE = 'rounds.bin'
+GAMES_FILE = 'games.bin'
+META_FILE = 'meta.json'
+
+
+def index_dtype(deck_size: int) -> np.dtype:
+    """Per-game index entry: where the game's records are, its totals and its deal."""
+    return np.dtype([
+        ('game_num', '<i8'),
+        ('offset', '<i8'),  # First record of the game in the rounds file
+        ('length', '<u4'),  # Records; one more than rounds if the game ended in a war
+        ('rounds', '<u4'),
+        ('wars', '<u4'),
+        ('double_wars', '<u4'),
+        ('max_depth', 'u1'),
+        ('winner', 'u1'),  # 0 when the game hit max rounds
+        ('hit_max_rounds', '?'),
+        ('p1_count', 'u1'),
+        ('deal', 'u1', (deck_size,)),
+    ])
+
+
+def _arranger(rules: WarRules):
+    if rules.winnings == 'high_first':
+        return partial(list.sort, reverse=True)
+    if rules.winnings == 'low_first':
+        return list.sort
+    return None
+
+
+def _trace_round(p1_hand, p2_hand, facedown, last_card, arrange):
+    """
+    Play one round, as the rules_player() loops do.
+
+    Returns:
+        tuple: (faceup, decider, depth, pot, ended) where ended is the
+        winner if the game ended during a war, else 0
+    """
+    p1_card = p1_hand.popleft()
+    p2_card = p2_hand.popleft()
+    faceup = p1_card << 4 | p2_card
+    pot = [p1_card, p2_card]
+    depth = 0
+    while p1_card == p2_card:
+        depth += 1
+        p1_facedown = p2_facedown = facedown
+        if last_card:
+            p1_facedown = min(facedown, len(p1_hand) - 1)
+            p2_facedown = min(facedown, len(p2_hand) - 1)
+        if len(p1_hand) < p1_facedown + 1 or p1_facedown < 0:
+            return faceup, 0, depth, len(pot), 2
+        if len(p2_hand) < p2_facedown + 1 or p2_facedown < 0:
+            return faceup, 0, depth, len(pot), 1
+
+        for i in range(max(p1_facedown, p2_facedown)):
+            if i < p1_facedown:
+                pot.append(p1_hand.popleft())
+            if i < p2_facedown:
+                pot.append(p2_hand.popleft())
+        p1_card = p1_hand.popleft()
+        p2_card = p2_hand.popleft()
+        pot.append(p1_card)
+        pot.append(p2_card)
+
+    if arrange is not None:
+        arrange(pot)
+    (p1_hand if p1_card > p2_card else p2_hand).extend(pot)
+    return faceup, p1_card << 4 | p2_card, depth, len(pot), 0
+
+
+def play_traced(p1_hand, p2_hand, trace: array, max_rounds: int, rules: WarRules):
+    """
+    Play dealt hands to the end, appending a record per round to trace.
+
+    Args:
+        p1_hand: deque of player 1's cards
+        p2_hand: deque of player 2's cards
+        trace: array('B') that each round's RECORD_DTYPE bytes go to
+        max_rounds: round limit after which the game counts as infinite
+        rules: WarRules without shuffled winnings
+
+    Returns:
+        dict: Statistics in the same shape as play_hands()
+    """
+    if not rules.deterministic:
+        raise ValueError("Traces need rules that don't shuffle winnings")
+    if max(max(p1_hand), max(p2_hand)) > 15 or len(p1_hand) + len(p2_hand) > 255:
+        raise ValueError("Traces need card values up to 15 and at most 255 cards")
+    facedown = rules.facedown
+    last_card = rules.short_war == 'last_card'
+    arrange = _arranger(rules)
+
+    rounds = wars = double_wars = 0
+    winner = None
+    hit_max_rounds = False
+    while True:
+        if not p1_hand:
+            winner = 2
+            break
+        if not p2_hand:
+            winner = 1
+            break
+
+        faceup, decider, depth, pot, ended = _trace_round(p1_hand, p2_hand, facedown,
+                                                         last_card, arrange)
+        trace.extend((faceup, decider, depth, pot))
+        if depth:
+            wars += depth
+            double_wars += depth - 1
+        if ended:
+            winner = ended
+            break
+
+        rounds += 1
+        if rounds >= max_rounds:
+            hit_max_rounds = True
+            break
+
+    return {
+        'rounds': rounds,
+        'wars': wars,
+        'double_wars': double_wars,
+        'winner': winner,
+        'hit_max_rounds': hit_max_rounds
+    }
+
+
+class TraceWriter:
+    """
+    Appends traced games to a trace directory.
+
+    Games come from play_game(trace=True), whose statistics carry the
+    'trace' records and the 'deal'. Records are appended to rounds.bin and
+    one index entry per game to games.bin, both flat binary files that
+    TraceReader memory-maps; meta.json holds the run's rules, seed and
+    deck size. meta.json marks a finished trace: it is only written when
+    the writer is closed after recording games, not when the run fails.
+    The directory must not already hold a finished trace; leftovers of a
+    failed run are overwritten.
+    """
+
+    def __init__(self, directory: str, rules: Optional[WarRules] = None,
+                 seed: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, META_FILE)):
+            raise ValueError(f"{directory} already holds a trace")
+        self.directory = directory
+        self.meta = {'format': TRACE_FORMAT, 'rules': list(as_rules(rules)), 'seed': seed,
+                     'deck_size': None, 'games': 0}
+        self.records_written = 0
+        self._rounds = open(os.path.join(directory, ROUNDS_FILE), 'wb')
+        self._games = open(os.path.join(directory, GAMES_FILE), 'wb')
+        self._dtype = None
+
+    def append(self, game: Dict[str, Any]) -> None:
+        """Write one game, removing its 'trace' and 'deal' from the dict."""
+        records = game.pop('trace')
+        deal = game.pop('deal')
+        p1_count = game.pop('p1_count')
+        if self._dtype is None:
+            self.meta['deck_size'] = len(deal)
+            self._dtype = index_dtype(len(deal))
+        length = len(records) // RECORD_SIZE
+
+        entry = np.zeros(1, dtype=self._dtype)
+        entry['game_num'] = game['game_num']
+        entry['offset'] = self.records_written
+        entry['length'] = length
+        entry['rounds'] = game['rounds']
+        entry['wars'] = game['wars']
+        entry['double_wars'] = game['double_wars']
+        entry['max_depth'] = max(records[2::RECORD_SIZE], default=0)
+        entry['winner'] = game['winner'] or 0
+        entry['hit_max_rounds'] = game['hit_max_rounds']
+        entry['p1_count'] = p1_count
+        entry['deal'] = np.frombuffer(deal, dtype=np.uint8)
+
+        self._rounds.write(records)
+        self._games.write(entry.tobytes())
+        self.records_written += length
+        self.meta['games'] += 1
+
+    def _write_meta(self):
+        tmp_path = os.path.join(self.directory, f"{META_FILE}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, META_FILE))
+
+    def close(self, completed: bool = True) -> None:
+        """Close the files, finishing the trace if the run completed with games."""
+        self._rounds.close()
+        self._games.close()
+        if completed and self.meta['games']:
+            self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        self.close(completed=exc_type is None)
+
+
+class TraceReader:
+    """
+    Memory-mapped access to a trace directory written by TraceWriter.
+
+    Nothing is loaded up front: `index` is a structured array over
+    games.bin (one entry per game, see index_dtype()) and `records` one
+    over rounds.bin, so games can be filtered with NumPy masks on the index
+    and single games read without touching the rest, e.g.
+    reader.index['game_num'][reader.index['double_wars'] >= 5].
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta['format'] != TRACE_FORMAT:
+            raise ValueError(f"Unsupported trace format {self.meta['format']}")
+        self.directory = directory
+        self.rules = as_rules(self.meta['rules'])
+        self.index = self._map(GAMES_FILE, index_dtype(self.meta['deck_size']))
+        self.records = self._map(ROUNDS_FILE, RECORD_DTYPE)
+
+    def _map(self, name, dtype):
+        path = os.path.join(self.directory, name)
+        if not os.path.getsize(path):
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    def __len__(self):
+        return len(self.index)
+
+    def entry(self, game_num: int):
+        """The index entry of a game (game numbers are in order)."""
+        position = np.searchsorted(self.index['game_num'], game_num)
+        if position == len(self.index) or self.index['game_num'][position] != game_num:
+            raise KeyError(f"Game {game_num} is not in the trace")
+        return self.index[position]
+
+    def rounds(self, game_num: int) -> np.ndarray:
+        """A game's round records (a view into the mapped file)."""
+        entry = self.entry(game_num)
+        return self.records[entry['offset']:entry['offset'] + entry['length']]
+
+    def deal(self, game_num: int) -> Tuple[deque, deque]:
+        """A game's dealt hands."""
+        entry = self.entry(game_num)
+        cards = entry['deal'].tolist()
+        return deque(cards[:entry['p1_count']]), deque(cards[entry['p1_count']:])
+
+    def select(self, min_rounds: Optional[int] = None, min_double_wars: Optional[int] = None,
+               min_depth: Optional[int] = None,
+               hit_max_rounds: Optional[bool] = None) -> np.ndarray:
+        """Game numbers of the games meeting every given condition."""
+        index = self.index
+        mask = np.ones(len(index), dtype=bool)
+        if min_rounds is not None:
+            mask &= index['rounds'] >= min_rounds
+        if min_double_wars is not None:
+            mask &= index['double_wars'] >= min_double_wars
+        if min_depth is not None:
+            mask &= index['max_depth'] >= min_depth
+        if hit_max_rounds is not None:
+            mask &= index['hit_max_rounds'] == hit_max_rounds
+        return np.asarray(index['game_num'][mask])
+
+
+def replay_trace(reader: TraceReader, game_num: int) -> Iterator[Tuple[int, Any, tuple, tuple]]:
+    """
+    Rebuild a game's hand states from its deal, checked against its trace.
+
+    Yields:
+        (round, record, p1_hand, p2_hand) after each round, starting with
+        (0, None, ...) for the deal; hands are tuples, top card first
+
+    Raises:
+        ValueError: if replaying the deal doesn't reproduce a recorded round
+    """
+    rules = reader.rules
+    p1_hand, p2_hand = reader.deal(game_num)
+    last_card = rules.short_war == 'last_card'
+    arrange = _arranger(rules)
+    yield 0, None, tuple(p1_hand), tuple(p2_hand)
+    for round_num, record in enumerate(reader.rounds(game_num), 1):
+        played = _trace_round(p1_hand, p2_hand, rules.facedown, last_card, arrange)
+        if played[:4] != tuple(record.tolist()):
+            raise ValueError(f"Trace of game {game_num} diverges from its deal at round {round_num}")
+        yield round_num, record, tuple(p1_hand), tuple(p2_hand)
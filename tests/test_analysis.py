@@ -1,5 +1,5 @@
 import pytest
-from analysis import analyze_results, print_summary
+from analysis import analyze_columns, analyze_results, print_summary
 from io import StringIO
 import sys
 
@@ -167,4 +167,41 @@ def test_print_summary_with_results():
     assert "Total Games Simulated: 100" in output
     assert "GAME LENGTH" in output
     assert "WARS" in output
-    assert "WINNERS" in output
\ No newline at end of file
+    assert "WINNERS" in output
+
+def test_analyze_columns_matches_analyze_results():
+    """The vectorized path should give the same summary as the dict path"""
+    import pandas as pd
+    game_stats = [
+        {'rounds': 100, 'wars': 5, 'double_wars': 0, 'winner': 1, 'hit_max_rounds': False},
+        {'rounds': 250, 'wars': 12, 'double_wars': 1, 'winner': 2, 'hit_max_rounds': False},
+        {'rounds': 40, 'wars': 0, 'double_wars': 0, 'winner': 1, 'hit_max_rounds': False},
+        {'rounds': 10000, 'wars': 90, 'double_wars': 4, 'winner': None, 'hit_max_rounds': True},
+    ]
+    expected = analyze_results(game_stats)
+    results = analyze_columns(pd.DataFrame(game_stats))
+
+    for key in ('total_games', 'winners', 'infinite_games'):
+        assert results[key] == expected[key]
+    for metric in ('rounds', 'wars', 'double_wars'):
+        for stat, value in expected[metric].items():
+            assert results[metric][stat] == pytest.approx(value)
+    assert results['correlation_wars_rounds'] == pytest.approx(expected['correlation_wars_rounds'])
+
+
+def test_analyze_columns_quantiles_and_histograms():
+    """Quantiles and histograms should cover only the finite games"""
+    import numpy as np
+    columns = {
+        'rounds': np.arange(1, 1001),
+        'wars': np.arange(1000) % 3,
+        'double_wars': np.zeros(1000, dtype=int),
+        'winner': np.ones(1000, dtype=int),
+        'hit_max_rounds': np.arange(1000) >= 990,
+    }
+    results = analyze_columns(columns, rounds_bin_width=250)
+
+    assert results['rounds']['quantiles']['p90'] == pytest.approx(np.quantile(np.arange(1, 991), 0.9))
+    assert results['histograms']['rounds'] == {0: 249, 250: 250, 500: 250, 750: 241}
+    assert results['histograms']['wars'] == {0: 330, 1: 330, 2: 330}
+    assert analyze_columns({'hit_max_rounds': np.array([], dtype=bool)}) == {}
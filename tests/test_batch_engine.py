@@ -0,0 +1,69 @@
+import random
+from collections import deque
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src import batch_engine
+from src.batch_engine import play_batch, play_games
+from src.game import play_game, play_round
+from src.seeding import game_rng
+
+
+def _play_python(p1_cards, p2_cards):
+    """Play a deal with the reference round loop."""
+    p1_hand, p2_hand = deque(p1_cards), deque(p2_cards)
+    stats = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None,
+             'hit_max_rounds': False}
+    while play_round(p1_hand, p2_hand, stats):
+        pass
+    return stats
+
+
+# Lockstep only, handed to the scalar loop partway, and scalar throughout
+TAILS = [0, 100, batch_engine.SCALAR_TAIL]
+
+
+@pytest.mark.parametrize('tail', TAILS)
+def test_play_games_matches_play_game(tail, monkeypatch):
+    """The batch engine should reproduce play_game for the same RNGs"""
+    monkeypatch.setattr(batch_engine, 'SCALAR_TAIL', tail)
+    expected = [play_game(rng=game_rng(9, i)) for i in range(300)]
+    actual = play_games(game_rng(9, i) for i in range(300))
+    assert actual == expected
+
+
+@pytest.mark.parametrize('tail', TAILS)
+def test_play_batch_small_decks_match_reference(tail, monkeypatch):
+    """Short decks exercise wars with too few cards and uneven splits"""
+    monkeypatch.setattr(batch_engine, 'SCALAR_TAIL', tail)
+    rng = random.Random(0)
+    deals = []
+    for _ in range(500):
+        deck = [rng.randint(2, 5) for _ in range(12)]
+        deals.append((deck[:5], deck[5:]))
+
+    cards = np.array([p1 + p2 for p1, p2 in deals], dtype=np.int8)
+    results = play_batch(cards, [len(p1) for p1, _ in deals])
+
+    for i, (p1, p2) in enumerate(deals):
+        expected = _play_python(p1, p2)
+        assert results['rounds'][i] == expected['rounds']
+        assert results['wars'][i] == expected['wars']
+        assert results['double_wars'][i] == expected['double_wars']
+        assert (results['winner'][i] or None) == expected['winner']
+        assert results['hit_max_rounds'][i] == expected['hit_max_rounds']
+
+
+@pytest.mark.parametrize('tail', [0, batch_engine.SCALAR_TAIL])
+def test_play_batch_double_war(tail, monkeypatch):
+    """Chained ties should count as wars and double wars"""
+    monkeypatch.setattr(batch_engine, 'SCALAR_TAIL', tail)
+    p1 = [4, 1, 2, 3, 5, 6, 7, 8, 14]
+    p2 = [4, 9, 10, 11, 5, 12, 13, 14, 7]
+    results = play_batch(np.array([p1 + p2], dtype=np.int8))
+
+    expected = _play_python(p1, p2)
+    assert results['wars'][0] == expected['wars'] == 2
+    assert results['double_wars'][0] == expected['double_wars'] == 1
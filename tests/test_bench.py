@@ -0,0 +1,39 @@
+from src.bench import compare, main, run_suite
+
+
+def test_run_suite_reports_every_phase():
+    """Each game count should report throughput, timings and memory"""
+    report = run_suite([50], repeat=1, verbose=False)
+    result = report['results']['50']
+
+    for metric in ('games_per_sec', 'rounds_per_sec', 'wars_per_sec', 'deal_sec',
+                   'play_sec', 'dataframe_sec', 'analysis_sec', 'peak_memory_bytes'):
+        assert result[metric] > 0
+
+
+def test_compare_flags_regressions():
+    """Slower throughput or timings beyond the threshold should be flagged"""
+    base = run_suite([50], repeat=1, verbose=False)
+    slower = {'results': {'50': dict(base['results']['50'])}}
+    slower['results']['50']['games_per_sec'] /= 2
+    slower['results']['50']['play_sec'] *= 2
+
+    flagged = {metric for _, metric, *_ in compare(base, slower, threshold=0.10)}
+    assert flagged == {'games_per_sec', 'play_sec'}
+    assert compare(base, base, threshold=0.10) == []
+
+
+def test_main_writes_baseline(tmp_path):
+    """The CLI should write a JSON baseline and pass against itself"""
+    path = tmp_path / 'baseline.json'
+    assert main(['-n', '20', '--repeat', '1', '-o', str(path)]) == 0
+    assert path.exists()
+    assert main(['-n', '20', '--repeat', '1', '--compare', str(path), '--threshold', '100']) == 0
+
+
+def test_engines_play_the_same_benchmark_games():
+    """Every engine should be timed on its own loop over identical deals"""
+    python = run_suite([50], repeat=1, verbose=False)['results']['50']
+    for engine in ('numpy', 'jit'):
+        result = run_suite([50], engine=engine, repeat=1, verbose=False)['results']['50']
+        assert (result['rounds'], result['wars']) == (python['rounds'], python['wars'])
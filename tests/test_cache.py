@@ -0,0 +1,61 @@
+import random
+
+import pytest
+from src.cache import OutcomeCache, SqliteOutcomeCache, encode_deal
+from src.deck import create_deck
+from src.game import play_game
+from src.simulation import run_simulation
+
+
+def test_encode_deal_packs_four_bits_per_card():
+    """A standard deal should pack into 27 bytes, distinguishing the split"""
+    key = encode_deal([14, 2, 3], [5])
+    assert key == bytes([3, 0xE2, 0x35])
+    assert encode_deal([14, 2], [3, 5]) != key
+    assert len(encode_deal(create_deck()[:26], create_deck()[26:])) == 27
+    with pytest.raises(ValueError):
+        encode_deal([16], [2])
+
+
+def test_lru_eviction_and_counters():
+    """The least recently used outcome should be evicted first"""
+    cache = OutcomeCache(maxsize=2)
+    outcome = {'rounds': 5, 'wars': 1, 'double_wars': 0, 'winner': 1, 'hit_max_rounds': False}
+    cache.put(b'a', outcome)
+    cache.put(b'b', outcome)
+    assert cache.get(b'a') == outcome  # 'b' is now least recent
+    cache.put(b'c', outcome)
+
+    assert cache.get(b'b') is None
+    assert cache.get(b'c') == outcome
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 2
+
+
+def test_play_game_with_cache_matches_uncached():
+    """Cached and uncached games should be identical, including on a hit"""
+    cache = OutcomeCache()
+    first = play_game(rng=random.Random(3), cache=cache)
+    second = play_game(rng=random.Random(3), cache=cache)
+
+    assert first == second == play_game(rng=random.Random(3))
+    assert (cache.hits, cache.misses) == (1, 1)
+    with pytest.raises(ValueError):
+        play_game(cache=cache, detect_cycles=True)
+
+
+def test_sqlite_cache_persists(tmp_path):
+    """Outcomes should survive reopening the on-disk store"""
+    path = str(tmp_path / 'outcomes.db')
+    deck = create_deck([2, 3], 4)
+    with SqliteOutcomeCache(path) as cache:
+        first = run_simulation(200, verbose=False, seed=4, deck=deck, cache=cache)
+        misses = cache.misses
+
+    with SqliteOutcomeCache(path) as cache:
+        second = run_simulation(200, verbose=False, seed=4, deck=deck, cache=cache)
+        assert cache.misses == 0
+        assert cache.hits == 200
+        assert len(cache) == misses
+
+    assert first['game_data'].equals(second['game_data'])
@@ -0,0 +1,48 @@
+import pytest
+from src.cache import OutcomeCache
+from src.checkpoint import Checkpoint
+from src.output import GameWriter
+from src.simulation import resume_simulation, run_simulation
+
+
+class _CrashingWriter(GameWriter):
+    """Writer that fails partway through a run, like a killed process."""
+
+    def __init__(self, fail_on_batch):
+        super().__init__(None)
+        self.fail_on_batch = fail_on_batch
+        self.batches = 0
+
+    def _write_batch(self, games):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise KeyboardInterrupt
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    """A resumed run should give the same results as one that never stopped"""
+    with pytest.raises(KeyboardInterrupt):
+        run_simulation(num_games=3500, verbose=False, seed=21, writer=_CrashingWriter(3),
+                       checkpoint_dir=str(tmp_path), checkpoint_every=1000)
+    assert Checkpoint.load(str(tmp_path)).completed_games == 2000
+
+    resumed = resume_simulation(str(tmp_path), verbose=False)
+    uninterrupted = run_simulation(num_games=3500, verbose=False, seed=21)
+
+    assert resumed['summary'] == uninterrupted['summary']
+    assert resumed['game_data'].equals(uninterrupted['game_data'])
+
+
+def test_checkpoint_refuses_to_overwrite(tmp_path):
+    """Starting a new run in a checkpoint directory should fail"""
+    run_simulation(num_games=10, verbose=False, seed=1, checkpoint_dir=str(tmp_path))
+    with pytest.raises(FileExistsError):
+        run_simulation(num_games=10, verbose=False, seed=1, checkpoint_dir=str(tmp_path))
+
+
+def test_checkpointed_run_with_cache(tmp_path):
+    """The cache should speed up a checkpointed run without entering its config"""
+    cached = run_simulation(num_games=2000, verbose=False, seed=5, cache=OutcomeCache(),
+                            checkpoint_dir=str(tmp_path), checkpoint_every=1000)
+    assert Checkpoint.load(str(tmp_path)).config['game_options'] == {}
+    assert cached['summary'] == run_simulation(num_games=2000, verbose=False, seed=5)['summary']
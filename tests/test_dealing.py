@@ -0,0 +1,72 @@
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.dealing import (
+    DEAL_BLOCK, deal_batch, deal_range, load_deals, play_deal_batch, save_deals,
+)
+from src.deck import CARD_RANKS, create_deck
+from src.game import play_game
+from src.rules import WarRules
+from src.simulation import replay_game, run_simulation
+
+
+def test_deal_batch_rows_are_shuffled_decks():
+    """Every row should hold the whole deck, split at hand_size"""
+    deals = deal_batch(200, np.random.default_rng(1), hand_size=20)
+    assert deals.cards.shape == (200, 52) and deals.cards.dtype == np.int8
+    assert all(Counter(row) == Counter(create_deck()) for row in deals.cards.tolist())
+    assert len(set(map(bytes, deals.cards))) == 200
+    p1_hand, p2_hand = deals.hands(0)
+    assert (len(p1_hand), len(p2_hand)) == (20, 32)
+    with pytest.raises(ValueError):
+        deal_batch(1, np.random.default_rng(1), hand_size=52)
+
+
+def test_deal_range_independent_of_split():
+    """A game's deal should only depend on the seed and its index"""
+    whole = deal_range(5, 0, 2 * DEAL_BLOCK + 10)
+    part = deal_range(5, DEAL_BLOCK - 3, DEAL_BLOCK + 7)
+    assert np.array_equal(part.cards, whole.cards[DEAL_BLOCK - 3:DEAL_BLOCK + 7])
+    assert not np.array_equal(deal_range(6, 0, 10).cards, whole.cards[:10])
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy', 'jit'])
+def test_engines_play_batched_deals_alike(engine):
+    deals = deal_range(3, 0, 150)
+    expected = [play_game(hands=deals.hands(i)) for i in range(len(deals))]
+    assert play_deal_batch(deals, engine) == expected
+
+
+def test_batch_deals_run_matches_replay_and_workers():
+    """Batched-deal runs should replay per game and not depend on workers or engine"""
+    deck = create_deck(CARD_RANKS[:6])
+    serial = run_simulation(num_games=1200, verbose=False, seed=2, batch_deals=True,
+                            deck=deck, hand_size=10)
+    pooled = run_simulation(num_games=1200, verbose=False, seed=2, batch_deals=True,
+                            deck=deck, hand_size=10, workers=2, engine='numpy')
+    assert pooled['game_data'].equals(serial['game_data'])
+    game = replay_game(2, 1001, batch_deals=True, deck=deck, hand_size=10)
+    assert game['rounds'] == serial['game_data'].loc[1001, 'rounds']
+
+
+def test_batch_deals_shuffled_winnings_are_seeded():
+    """Shuffled winnings should come from the game streams, not global random"""
+    rules = WarRules(winnings='shuffle')
+    first = run_simulation(num_games=300, verbose=False, seed=6, batch_deals=True, rules=rules)
+    second = run_simulation(num_games=300, verbose=False, seed=6, batch_deals=True, rules=rules)
+    assert first['game_data'].equals(second['game_data'])
+    game = replay_game(6, 250, batch_deals=True, rules=rules)
+    assert game['rounds'] == first['game_data'].loc[250, 'rounds']
+
+
+def test_saved_deals_round_trip(tmp_path):
+    deals = deal_range(9, 0, 300)
+    path = str(tmp_path / 'deals.bin')
+    save_deals(path, deals)
+    loaded = load_deals(path)
+    assert np.array_equal(loaded.cards, deals.cards)
+    assert np.array_equal(loaded.p1_counts, deals.p1_counts)
+    assert play_deal_batch(loaded) == play_deal_batch(deals)
@@ -40,4 +40,26 @@ def test_deal_cards_returns_deques():
     deck = create_deck()
     p1, p2 = deal_cards(deck)
     assert isinstance(p1, deque)
-    assert isinstance(p2, deque)
\ No newline at end of file
+    assert isinstance(p2, deque)
+
+def test_deal_cards_with_rng_reproducible():
+    """Deals from identically seeded RNGs should match"""
+    import random
+    deck = create_deck()
+    p1_first, p2_first = deal_cards(deck, random.Random(42))
+    p1_second, p2_second = deal_cards(deck, random.Random(42))
+    assert p1_first == p1_second
+    assert p2_first == p2_second
+
+def test_create_deck_custom_composition():
+    """Reduced decks should have the requested ranks and suits"""
+    deck = create_deck(ranks=[2, 3, 4], suits=2)
+    assert sorted(deck) == [2, 2, 3, 3, 4, 4]
+
+def test_deal_cards_hand_size():
+    """Player 1 should get hand_size cards and player 2 the rest"""
+    p1, p2 = deal_cards(create_deck(), hand_size=20)
+    assert len(p1) == 20
+    assert len(p2) == 32
+    with pytest.raises(ValueError):
+        deal_cards(create_deck(), hand_size=52)
@@ -166,4 +166,120 @@ def test_play_game_statistics_validity():
     
     # Max stack sizes should be reasonable
     assert stats['max_stack_p1'] <= 52
-    assert stats['max_stack_p2'] <= 52
\ No newline at end of file
+    assert stats['max_stack_p2'] <= 52
+
+def test_play_game_seed_reproducible():
+    """The same seed should replay the same game"""
+    assert play_game(seed=123) == play_game(seed=123)
+
+
+def test_play_until_cycle_detects_loop():
+    """A deal that repeats its hands should be stopped and measured"""
+    from game import play_until_cycle
+    # The hands return to the starting position every four rounds
+    p1_hand = deque([5, 2])
+    p2_hand = deque([3, 4])
+    stats = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None,
+             'hit_max_rounds': False}
+
+    play_until_cycle(p1_hand, p2_hand, stats)
+
+    assert stats['hit_max_rounds'] is True
+    assert stats['winner'] is None
+    assert stats['cycle_length'] == 4
+    assert stats['cycle_start'] == 0
+    assert stats['rounds'] < MAX_ROUNDS
+
+
+def test_play_until_cycle_detects_long_loop():
+    """Loops far longer than a few hundred rounds should still be found"""
+    from src.deck import create_deck, deal_cards
+    from src.seeding import game_rng
+    stats = play_game(rng=game_rng(5, 9), detect_cycles=True)
+    assert (stats['cycle_start'], stats['cycle_length']) == (90, 1872)
+    assert stats['rounds'] == 90 + 1872
+
+    # The hands at the loop's start come back one lap later
+    p1_hand, p2_hand = deal_cards(create_deck(), game_rng(5, 9))
+    replay = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None}
+    for _ in range(90):
+        play_round(p1_hand, p2_hand, replay)
+    start = (list(p1_hand), list(p2_hand))
+    for _ in range(1872):
+        play_round(p1_hand, p2_hand, replay)
+    assert (list(p1_hand), list(p2_hand)) == start
+
+
+def test_play_game_detect_cycles_keeps_finite_games():
+    """Cycle detection should not change games that finish"""
+    for seed in range(20):
+        plain = play_game(seed=seed)
+        detected = play_game(seed=seed, detect_cycles=True)
+        if not plain['hit_max_rounds']:
+            assert {key: detected[key] for key in plain} == plain
+            assert detected['cycle_length'] is None
+
+
+def test_play_hands_matches_play_round():
+    """The allocation-free loop should follow play_round exactly"""
+    import random
+    from game import play_hands
+    from deck import create_deck, deal_cards
+    for seed in range(200):
+        p1_hand, p2_hand = deal_cards(create_deck(), random.Random(seed))
+        stats = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None,
+                 'hit_max_rounds': False}
+        ref_p1, ref_p2 = deque(p1_hand), deque(p2_hand)
+        while play_round(ref_p1, ref_p2, stats):
+            pass
+        assert play_hands(p1_hand, p2_hand) == stats
+
+
+def test_play_hands_memory_does_not_grow_with_rounds():
+    """A game that runs to MAX_ROUNDS should allocate only its pot buffer"""
+    import tracemalloc
+    from game import play_hands
+    # Each player wins one card back and forth forever
+    p1_hand = deque([5, 2])
+    p2_hand = deque([3, 4])
+
+    tracemalloc.start()
+    stats = play_hands(p1_hand, p2_hand)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert stats['hit_max_rounds'] is True
+    assert stats['rounds'] == MAX_ROUNDS
+    assert peak < 4096
+
+
+def test_hooks_report_rounds_and_wars():
+    """Hooked games should match the fast loop and report every event"""
+    from game import add_hook, remove_hook
+
+    rounds, wars, ends = [], [], []
+    callbacks = (
+        ('on_round', lambda n, p1, p2: rounds.append((n, p1, p2))),
+        ('on_war', wars.append),
+        ('on_game_end', ends.append),
+    )
+    for event, callback in callbacks:
+        add_hook(event, callback)
+    try:
+        hooked = play_game(seed=11)
+    finally:
+        for event, callback in callbacks:
+            remove_hook(event, callback)
+
+    assert hooked == play_game(seed=11)
+    assert ends == [hooked]
+    assert len(rounds) == hooked['rounds']
+    assert [n for n, _, _ in rounds] == list(range(1, hooked['rounds'] + 1))
+    assert len(wars) == hooked['wars']
+    assert wars.count(0) == hooked['wars'] - hooked['double_wars']
+
+
+def test_add_hook_rejects_unknown_event():
+    from game import add_hook
+    with pytest.raises(ValueError):
+        add_hook('on_shuffle', print)
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.game import play_game
+from src.jit_engine import NUMBA_AVAILABLE, _play_deals, play_deals, play_games
+from src.rules import WarRules
+from src.seeding import game_rng
+from src.simulation import run_simulation
+
+
+def _small_deals(count, seed=0):
+    """Short decks with many ties, split unevenly"""
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(count):
+        deck = [rng.randint(2, 5) for _ in range(12)]
+        deals.append((deck[:5], deck[5:]))
+    cards = np.array([p1 + p2 for p1, p2 in deals], dtype=np.int8)
+    return deals, cards, np.array([len(p1) for p1, _ in deals])
+
+
+def _expected(deals, facedown=3):
+    from collections import deque
+    from src.game import rules_player
+    play = rules_player(WarRules(facedown=facedown))
+    return [play(deque(p1), deque(p2), max_rounds=200) for p1, p2 in deals]
+
+
+def _as_stats(out):
+    return [
+        {'rounds': r, 'wars': w, 'double_wars': d, 'winner': win or None,
+         'hit_max_rounds': bool(hit)}
+        for r, w, d, win, hit in out.tolist()
+    ]
+
+
+def test_play_games_matches_play_game():
+    """The jit engine (or its fallback) should reproduce play_game for the same RNGs"""
+    expected = [play_game(rng=game_rng(9, i)) for i in range(300)]
+    actual = play_games(game_rng(9, i) for i in range(300))
+    assert actual == expected
+
+
+def test_kernel_matches_reference_uncompiled():
+    """The kernel's logic should match the Python loop even without numba"""
+    deals, cards, p1_counts = _small_deals(100)
+    out = np.zeros((len(deals), 5), dtype=np.int32)
+    _play_deals(cards, p1_counts, 200, 3, out)
+    assert _as_stats(out) == _expected(deals)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason='numba not installed')
+@pytest.mark.parametrize('facedown', [0, 1, 3])
+def test_compiled_kernel_matches_reference(facedown):
+    deals, cards, p1_counts = _small_deals(500, seed=facedown)
+    out = play_deals(cards, p1_counts, max_rounds=200, facedown=facedown)
+    assert _as_stats(out) == _expected(deals, facedown)
+
+
+def test_run_simulation_jit_engine_matches_python():
+    """Both engines should produce identical results for a seed"""
+    python = run_simulation(num_games=200, verbose=False, seed=4, rules=WarRules(facedown=2))
+    jit = run_simulation(num_games=200, verbose=False, seed=4, engine='jit',
+                         rules=WarRules(facedown=2))
+    assert jit['summary'] == python['summary']
+    assert jit['game_data'].equals(python['game_data'])
+
+
+def test_jit_engine_rejects_unsupported_options():
+    with pytest.raises(ValueError):
+        run_simulation(num_games=10, verbose=False, engine='jit', detect_cycles=True)
+    with pytest.raises(ValueError):
+        run_simulation(num_games=10, verbose=False, engine='jit',
+                       rules=WarRules(winnings='shuffle'))
+
+
+def test_fallback_without_numba(monkeypatch):
+    """Without numba, games should come from play_game itself"""
+    import src.jit_engine as jit_engine
+    monkeypatch.setattr(jit_engine, 'NUMBA_AVAILABLE', False)
+    expected = [play_game(rng=game_rng(3, i)) for i in range(20)]
+    assert jit_engine.play_games(game_rng(3, i) for i in range(20)) == expected
+    with pytest.raises(RuntimeError):
+        jit_engine.play_deals(np.zeros((1, 4), dtype=np.int8))
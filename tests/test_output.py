@@ -0,0 +1,53 @@
+import pytest
+from src.output import open_writer, infer_format
+from src.simulation import run_simulation
+
+
+def test_infer_format():
+    """Formats should follow the file extension, defaulting to CSV"""
+    assert infer_format('games.parquet') == 'parquet'
+    assert infer_format('games.feather') == 'feather'
+    assert infer_format('games.csv') == 'csv'
+    assert infer_format('games') == 'csv'
+
+
+def test_csv_writer_matches_game_data(tmp_path):
+    """Batched CSV output should hold the same rows as game_data"""
+    pd = pytest.importorskip('pandas')
+    path = tmp_path / 'games.csv'
+    with open_writer(str(path)) as writer:
+        results = run_simulation(num_games=1500, verbose=False, seed=6, writer=writer)
+
+    data = pd.read_csv(path, index_col='game_num')
+    pd.testing.assert_frame_equal(data, results['game_data'], check_dtype=False)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_arrow_writers_round_trip(tmp_path, fmt):
+    """Columnar output should hold every game with compact types"""
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    path = tmp_path / f'games.{fmt}'
+    with open_writer(str(path)) as writer:
+        results = run_simulation(num_games=1500, verbose=False, seed=6, writer=writer)
+
+    data = getattr(pd, f'read_{fmt}')(path).set_index('game_num')
+    assert len(data) == 1500
+    assert str(data['rounds'].dtype) == 'uint32'
+    assert (data['rounds'].values == results['game_data']['rounds'].values).all()
+    assert data['winner'].isna().sum() == results['game_data']['winner'].isna().sum()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_arrow_writers_hold_long_games(tmp_path, fmt):
+    """Counters of games with a raised max_rounds should fit the schema"""
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    path = tmp_path / f'games.{fmt}'
+    game = {'game_num': 1, 'rounds': 100000, 'wars': 70000, 'double_wars': 300,
+            'winner': None, 'hit_max_rounds': True}
+    with open_writer(str(path)) as writer:
+        writer.write([game])
+
+    row = getattr(pd, f'read_{fmt}')(path).iloc[0]
+    assert (row['rounds'], row['wars'], row['double_wars']) == (100000, 70000, 300)
@@ -0,0 +1,37 @@
+from src.profiling import RunProfiler
+from src.simulation import run_simulation
+
+
+def test_profiler_collects_phases_and_histograms():
+    """A profiled run should account for every game, round and war"""
+    profiler = RunProfiler()
+    with profiler:
+        results = run_simulation(num_games=30, verbose=False, seed=2)
+    with profiler.phase('summary'):
+        results['game_data']
+
+    game_data = results['game_data']
+    report = profiler.report()
+    assert sum(report['game_rounds'].values()) == 30
+    assert sum(report['round_counts'].values()) == game_data['rounds'].sum()
+    assert sum(report['war_depths'].values()) == game_data['wars'].sum()
+    assert {'deal', 'plain rounds', 'summary'} <= set(report['phase_times'])
+
+
+def test_profiler_detaches():
+    """Hooks should be gone once the profiled block ends"""
+    from src.game import _hooks
+    with RunProfiler():
+        pass
+    assert not any(_hooks.values())
+
+
+def test_profiler_times_accumulation_as_its_own_phase():
+    """Summary accumulation should be timed apart from the games"""
+    profiler = RunProfiler()
+    with profiler:
+        run_simulation(num_games=30, verbose=False, seed=2, profiler=profiler)
+
+    phase_times = profiler.report()['phase_times']
+    assert phase_times['accumulation'] > 0
+    assert phase_times['other simulation'] >= 0
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+
+from src.progress import RunProgress, StatusServer
+from src.simulation import run_simulation
+
+
+def test_progress_counts_serial_and_parallel_runs():
+    """Counters should reach the run totals whichever path plays the games"""
+    for workers in (1, 2):
+        progress = RunProgress()
+        results = run_simulation(num_games=2500, verbose=False, seed=3, workers=workers,
+                                 progress=progress)
+        status = progress.snapshot()
+        assert status['state'] == 'finished'
+        assert status['completed_games'] == status['total_games'] == 2500
+        assert status['percent'] == 100
+        assert status['eta_sec'] == 0
+        assert status['infinite_pct'] == results['summary']['infinite_games']['percentage']
+
+
+def test_progress_reports_are_rate_limited(capsys):
+    chatty = RunProgress(report_interval=0)
+    run_simulation(num_games=3000, verbose=False, seed=1, progress=chatty)
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert lines[-1].startswith('Progress: 100.0% (3,000 / 3,000 games)')
+
+    quiet = RunProgress(report_interval=3600)
+    run_simulation(num_games=3000, verbose=False, seed=1, progress=quiet)
+    assert capsys.readouterr().out == ''
+
+
+def test_progress_works_alongside_verbose_output(capsys):
+    """The run's own percentage lines shouldn't clobber the progress object"""
+    progress = RunProgress()
+    run_simulation(num_games=3000, verbose=True, seed=1, progress=progress)
+    assert progress.snapshot()['completed_games'] == 3000
+    assert 'Progress: 100% (3,000 / 3,000 games)' in capsys.readouterr().out
+
+
+def test_status_server_serves_snapshot():
+    progress = RunProgress()
+    progress.start(100)
+    progress.update([{'hit_max_rounds': True}, {'hit_max_rounds': False}])
+    with StatusServer(progress) as server:
+        with urllib.request.urlopen(server.address, timeout=5) as response:
+            status = json.load(response)
+    assert status['state'] == 'running'
+    assert status['completed_games'] == 2
+    assert status['infinite_pct'] == 50
+
+
+def test_simulation_import_leaves_asyncio_unloaded():
+    """Only the status server needs asyncio, so plain runs shouldn't load it"""
+    check = "import sys, main, src.progress; print('asyncio' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True,
+                         check=True, cwd=root).stdout
+    assert out.strip() == 'False'
@@ -0,0 +1,77 @@
+import random
+from collections import deque
+
+import pytest
+from src.deck import create_deck, deal_cards
+from src.game import handle_war, play_game, play_hands, play_hooked, rules_player
+from src.rules import STANDARD_RULES, WarRules, as_rules
+
+
+def test_standard_rules_use_fast_loop():
+    """The standard rule set should specialize to play_hands itself"""
+    assert rules_player(STANDARD_RULES) is play_hands
+    assert rules_player(WarRules(2)) is rules_player(WarRules(2))
+    assert play_game(seed=4, rules=STANDARD_RULES) == play_game(seed=4)
+
+
+@pytest.mark.parametrize('rules', [
+    WarRules(facedown=1),
+    WarRules(facedown=0, short_war='last_card'),
+    WarRules(short_war='last_card', winnings='high_first'),
+    WarRules(facedown=2, winnings='low_first'),
+    WarRules(winnings='shuffle'),
+])
+def test_specialized_loop_matches_reference(rules):
+    """Each specialized loop should play exactly like play_round/handle_war"""
+    for game in range(50):
+        p1_hand, p2_hand = deal_cards(create_deck(), random.Random(game))
+        fast = rules_player(rules)(deque(p1_hand), deque(p2_hand), rng=random.Random(1))
+        reference = play_hooked(deque(p1_hand), deque(p2_hand), rules=rules,
+                                rng=random.Random(1))
+        assert fast == reference
+
+
+def test_handle_war_last_card_faceup():
+    """A short player should turn their last card faceup instead of losing"""
+    p1_hand = deque([9, 14])
+    p2_hand = deque([2, 3, 4, 5, 6])
+    cards_in_play = [7, 7]
+    stats = {'wars': 1, 'double_wars': 0, 'winner': None}
+    rules = WarRules(short_war='last_card', winnings='high_first')
+
+    assert handle_war(p1_hand, p2_hand, cards_in_play, stats, rules=rules)
+    assert stats['winner'] is None
+    assert list(p1_hand) == [14, 9, 7, 7, 5, 4, 3, 2]
+    assert list(p2_hand) == [6]
+
+
+def test_rules_list_form_and_validation():
+    """Rules should survive a JSON round trip and reject unknown values"""
+    assert as_rules([1, 'last_card', 'in_play']) == WarRules(1, 'last_card')
+    with pytest.raises(ValueError):
+        as_rules(WarRules(winnings='sorted'))
+    with pytest.raises(ValueError):
+        play_game(detect_cycles=True, rules=WarRules(winnings='shuffle'))
+
+
+def test_detect_cycles_with_rules_finds_the_loop():
+    """Loops under variant rules should be measured with those rules"""
+    from src.game import play_round
+    rules = WarRules(1, 'lose', 'in_play')
+    deck = create_deck(range(2, 8), 2)
+    looped = 0
+    for game in range(20):
+        p1_hand, p2_hand = deal_cards(deck, random.Random(game))
+        stats = play_game(rng=random.Random(game), detect_cycles=True, rules=rules, deck=deck)
+        if stats['cycle_length'] is None:
+            continue
+        looped += 1
+        # Replaying to the loop's start, one more lap should repeat the hands
+        replay = {'rounds': 0, 'wars': 0, 'double_wars': 0, 'winner': None}
+        for _ in range(stats['cycle_start']):
+            play_round(p1_hand, p2_hand, replay, rules)
+        start = (list(p1_hand), list(p2_hand))
+        for _ in range(stats['cycle_length']):
+            play_round(p1_hand, p2_hand, replay, rules)
+        assert (list(p1_hand), list(p2_hand)) == start
+    assert looped
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from src.analysis import analyze_results
+from src.shards import merge_shards, parse_shard, run_shard, shard_range
+from src.simulation import iter_games
+
+
+def test_shard_ranges_cover_run():
+    """Shards should tile the run with no gaps or overlap"""
+    ranges = [shard_range(10, i, 3) for i in range(1, 4)]
+    assert ranges == [(0, 3), (3, 6), (6, 10)]
+    assert parse_shard('2/3') == (2, 3)
+    with pytest.raises(ValueError):
+        parse_shard('4/3')
+
+
+def test_merged_shards_match_single_run(tmp_path):
+    """Merging shard summaries should give the one-run summary exactly"""
+    for index in (1, 2, 3):
+        run_shard(200, index, 3, seed=8, directory=str(tmp_path), verbose=False)
+
+    merged = merge_shards([str(tmp_path)])
+    games = list(iter_games(200, seed=8))
+    expected = analyze_results(games)
+
+    assert merged['missing'] == []
+    assert merged['summary']['total_games'] == 200
+    assert merged['summary']['rounds']['median'] == expected['rounds']['median']
+    assert merged['summary']['winners'] == expected['winners']
+    assert merged['summary']['rounds']['mean'] == pytest.approx(expected['rounds']['mean'])
+
+    rows = pd.concat(pd.read_csv(tmp_path / f"shard-0000{i}-of-00003.csv") for i in (1, 2, 3))
+    assert rows['game_num'].tolist() == list(range(1, 201))
+
+
+def test_merge_reports_missing_and_rejects_mixed_runs(tmp_path):
+    """Missing shards should be reported and shards of other runs refused"""
+    run_shard(100, 1, 2, seed=8, directory=str(tmp_path / 'a'), verbose=False)
+    assert merge_shards([str(tmp_path / 'a')])['missing'] == [(50, 100)]
+
+    run_shard(100, 2, 2, seed=9, directory=str(tmp_path / 'b'), verbose=False)
+    with pytest.raises(ValueError):
+        merge_shards([str(tmp_path / 'a'), str(tmp_path / 'b')])
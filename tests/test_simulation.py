@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+from src.output import open_writer
+from src.simulation import (
+    check_engine_options, games_to_dataframe, run_simulation, run_until_confident,
+)
+
+
+def test_run_simulation_shape():
+    """Should return one row per game and a summary"""
+    results = run_simulation(num_games=50, verbose=False, seed=1)
+
+    assert len(results['game_data']) == 50
+    assert results['summary']['total_games'] == 50
+
+
+def test_run_simulation_seed_reproducible():
+    """The same seed should produce the same games"""
+    first = run_simulation(num_games=50, verbose=False, seed=7)
+    second = run_simulation(num_games=50, verbose=False, seed=7)
+
+    assert first['game_data'].equals(second['game_data'])
+
+
+def test_run_simulation_workers_match_serial():
+    """Results should not depend on the number of workers"""
+    serial = run_simulation(num_games=2500, verbose=False, seed=3)
+    parallel = run_simulation(num_games=2500, verbose=False, seed=3, workers=2)
+
+    assert serial['game_data'].equals(parallel['game_data'])
+    assert serial['summary'] == parallel['summary']
+
+
+def test_replay_game_matches_run():
+    """Any single game of a run can be regenerated on its own"""
+    from src.simulation import replay_game
+    results = run_simulation(num_games=30, verbose=False, seed=11)
+
+    game = replay_game(11, 17)
+    row = results['game_data'].loc[17]
+    assert game['rounds'] == row['rounds']
+    assert game['wars'] == row['wars']
+    assert game['double_wars'] == row['double_wars']
+
+
+def test_run_simulation_numpy_engine_matches_python():
+    """Both engines should produce identical results for a seed"""
+    python = run_simulation(num_games=200, verbose=False, seed=4)
+    vectorized = run_simulation(num_games=200, verbose=False, seed=4, engine='numpy')
+
+    assert python['game_data'].equals(vectorized['game_data'])
+    assert python['summary'] == vectorized['summary']
+
+
+def test_run_until_confident_stops_at_target():
+    """Should stop at the first batch whose CI half-widths meet the targets"""
+    results = run_until_confident({'p1_win_pct': 10}, batch_size=50, verbose=False, seed=3)
+
+    assert results['converged']
+    assert results['half_widths']['p1_win_pct'] <= 10
+    assert results['games_needed'] % 50 == 0
+    assert len(results['game_data']) == results['games_needed']
+
+    # Same games as a fixed-size run with the same seed
+    fixed = run_simulation(results['games_needed'], verbose=False, seed=3)
+    assert fixed['game_data'].equals(results['game_data'])
+
+
+def test_run_until_confident_respects_max_games():
+    """An unreachable target should stop at max_games"""
+    results = run_until_confident(
+        {'rounds_mean': 1e-9}, batch_size=40, max_games=100, verbose=False, seed=3
+    )
+
+    assert not results['converged']
+    assert results['games_needed'] == 100
+
+    # With no games allowed, no interval is defined yet
+    empty = run_until_confident({'rounds_mean': 1}, max_games=0, verbose=False, seed=3)
+    assert empty['games_needed'] == 0
+    assert empty['half_widths'] == {'rounds_mean': float('inf')}
+
+
+def test_run_until_confident_rejects_unknown_metric():
+    with pytest.raises(ValueError):
+        run_until_confident({'mean_wars': 1}, verbose=False)
+
+
+def test_game_data_built_on_first_access():
+    """game_data should only be built when looked up, then kept"""
+    results = run_simulation(num_games=20, verbose=False, seed=1)
+
+    assert 'game_data' not in results
+    assert len(results.columns) == 20
+    game_data = results['game_data']
+    assert results['game_data'] is game_data
+    assert list(game_data.columns) == ['rounds', 'wars', 'double_wars', 'winner', 'hit_max_rounds']
+    with pytest.raises(KeyError):
+        results['missing']
+
+
+def test_streamed_run_keeps_no_games(tmp_path):
+    """With keep_games=False the games should only reach the writer"""
+    path = str(tmp_path / 'games.csv')
+    with open_writer(path) as writer:
+        streamed = run_simulation(num_games=2500, verbose=False, seed=6, writer=writer,
+                                  keep_games=False)
+    kept = run_simulation(num_games=2500, verbose=False, seed=6)
+
+    assert streamed.columns is None
+    with pytest.raises(KeyError):
+        streamed['game_data']
+    assert streamed['summary'] == kept['summary']
+    written = pd.read_csv(path, index_col='game_num')
+    pd.testing.assert_frame_equal(written, kept['game_data'], check_dtype=False)
+
+
+def test_games_to_dataframe_missing_values():
+    """Infinite games should get a NaN winner, as with rows built from None"""
+    games = [
+        {'game_num': 1, 'rounds': 10, 'wars': 1, 'double_wars': 0, 'winner': 2,
+         'hit_max_rounds': False, 'cycle_length': None, 'cycle_start': None},
+        {'game_num': 2, 'rounds': 40, 'wars': 3, 'double_wars': 1, 'winner': None,
+         'hit_max_rounds': True, 'cycle_length': 12, 'cycle_start': 0},
+    ]
+    game_data = games_to_dataframe(games)
+
+    assert game_data.index.name == 'game_num'
+    assert game_data.loc[1, 'winner'] == 2
+    assert game_data['winner'].isna().tolist() == [False, True]
+    assert game_data['cycle_start'].tolist()[1] == 0
+    assert game_data['hit_max_rounds'].dtype == bool
+
+
+def test_check_engine_options_before_playing():
+    """Options an engine can't play are caught without playing any game"""
+    from src.rules import WarRules
+    check_engine_options('numpy', {'deck': [2] * 10, 'batch_deals': True})
+    check_engine_options('jit', {'rules': WarRules(facedown=1)})
+    with pytest.raises(ValueError):
+        check_engine_options('numpy', {'detect_cycles': True})
+    with pytest.raises(ValueError):
+        check_engine_options('jit', {'track_stacks': True})
+    with pytest.raises(ValueError):
+        check_engine_options('jit', {'rules': WarRules(winnings='shuffle')})
+
+
+def test_standard_rules_count_as_the_default():
+    """Passing STANDARD_RULES explicitly shouldn't change what an engine accepts"""
+    from src.rules import STANDARD_RULES
+    default = run_simulation(num_games=50, verbose=False, seed=3, engine='numpy')
+    explicit = run_simulation(num_games=50, verbose=False, seed=3, engine='numpy',
+                              rules=STANDARD_RULES)
+    assert explicit['summary'] == default['summary']
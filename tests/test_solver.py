@@ -0,0 +1,58 @@
+from collections import deque
+from fractions import Fraction
+from math import factorial
+
+import pytest
+from src.deck import create_deck
+from src.game import MAX_ROUNDS, play_hands
+from src.simulation import run_simulation
+from src.solver import ExactSolver, distinct_deals, solve_deck
+
+
+def test_distinct_deals_counts_multiset_orderings():
+    """Should yield each distinct ordering of the deck exactly once"""
+    deals = list(distinct_deals(create_deck([2, 3, 4, 5], 2)))
+
+    assert len(deals) == factorial(8) // 2 ** 4
+    assert len(set(deals)) == len(deals)
+
+
+def test_outcomes_match_play_hands():
+    """Every deal should have the result the simulator plays out"""
+    solver = ExactSolver()
+    for cards in distinct_deals(create_deck([2, 3, 4, 5], 2)):
+        expected = play_hands(deque(cards[:4]), deque(cards[4:]))
+        actual = solver.outcome(cards[:4], cards[4:], MAX_ROUNDS)
+        assert actual['winner'] == expected['winner']
+        assert actual['hit_max_rounds'] == expected['hit_max_rounds']
+        if not actual['hit_max_rounds']:
+            assert actual == expected
+
+
+def test_solve_deck_probabilities():
+    """Probabilities should be exact and sum to one"""
+    result = solve_deck(create_deck([2, 3], 2))
+
+    # P1 wins only with both 3s; two deals loop; a tied first round ends in
+    # a war player 1 can't pay for
+    assert result['deals'] == 6
+    assert result['player_1_win_probability'] == Fraction(1, 6)
+    assert result['player_2_win_probability'] == Fraction(1, 2)
+    assert result['infinite_probability'] == Fraction(1, 3)
+    assert result['expected_rounds'] == 1
+
+
+def test_solve_deck_rejects_large_decks():
+    with pytest.raises(ValueError):
+        solve_deck(create_deck())
+
+
+def test_run_simulation_reduced_deck():
+    """Monte Carlo estimates on a reduced deck should land near the exact answer"""
+    deck = create_deck([2, 3, 4], 4)
+    exact = solve_deck(deck, max_rounds=MAX_ROUNDS)
+    summary = run_simulation(2000, verbose=False, seed=5, deck=deck)['summary']
+
+    assert summary['infinite_games']['percentage'] == pytest.approx(
+        float(exact['infinite_probability']) * 100, abs=2
+    )
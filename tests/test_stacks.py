@@ -0,0 +1,69 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.simulation import run_simulation
+from src.stacks import StackTrajectories, lead_changes, stack_histograms, time_to_lead
+
+
+def _trajectories(*games):
+    trajectories = StackTrajectories()
+    for game in games:
+        trajectories.append(game)
+    return trajectories
+
+
+def test_run_simulation_track_stacks():
+    """Every game should get one stack size per round"""
+    results = run_simulation(num_games=40, verbose=False, seed=5, track_stacks=True)
+    stacks = results['stacks']
+
+    assert len(stacks) == 40
+    for i, rounds in enumerate(results['game_data']['rounds']):
+        assert len(stacks[i]) == rounds
+        assert all(0 <= size <= 52 for size in stacks[i])
+
+
+def test_extend_keeps_offsets():
+    """Extending should append games after the existing ones"""
+    first = _trajectories([27, 28])
+    first.extend(_trajectories([25], [26, 27, 28]))
+
+    assert len(first) == 3
+    assert list(first[1]) == [25]
+    assert list(first[2]) == [26, 27, 28]
+
+
+def test_lead_changes_skip_even_rounds():
+    """A lead passing through an even split counts as a single change"""
+    stacks = _trajectories([27, 26, 25, 27], [26, 26], [30, 31])
+    assert list(lead_changes(stacks)) == [2, 0, 0]
+
+
+def test_time_to_lead():
+    """Should report the first round each player leads, or -1"""
+    stacks = _trajectories([26, 25, 27], [27, 28])
+    assert list(time_to_lead(stacks, player=1)) == [3, 1]
+    assert list(time_to_lead(stacks, player=2)) == [2, -1]
+
+
+def test_stack_histograms():
+    """Should count stack sizes per round across games"""
+    hist = stack_histograms(_trajectories([27, 28], [25]))
+
+    assert hist.shape == (2, 53)
+    assert hist[0, 27] == 1 and hist[0, 25] == 1
+    assert hist[1, 28] == 1
+    assert hist.sum() == 3
+
+
+def test_track_stacks_rejects_decks_too_large_for_bytes():
+    """Stack sizes above MAX_TRACKED_DECK wouldn't fit the one-byte values"""
+    from src.deck import create_deck
+    from src.game import play_game
+    from src.stacks import MAX_TRACKED_DECK
+
+    deck = create_deck(suits=MAX_TRACKED_DECK // 13)
+    assert len(play_game(seed=1, deck=deck, track_stacks=True)['stack_sizes']) > 0
+    with pytest.raises(ValueError):
+        play_game(seed=1, deck=create_deck(suits=10), track_stacks=True)
@@ -0,0 +1,43 @@
+import pytest
+from src.analysis import analyze_results
+from src.simulation import iter_games
+from src.store import ResultStore, extend_store
+from src.streaming import StreamingSummary
+
+
+def test_extended_store_matches_single_run(tmp_path):
+    """Extending a store in batches should give the one-run summary exactly"""
+    path = str(tmp_path / 'results.db')
+    with ResultStore(path) as store:
+        extend_store(store, 150, seed=8, verbose=False, batch_size=100)
+        result = extend_store(store, 50, verbose=False)
+
+    expected = analyze_results(list(iter_games(200, seed=8)))
+    assert (result['seed'], result['first_game'], result['last_game']) == (8, 150, 200)
+    assert result['ranges'] == [(0, 200)]
+    assert result['summary']['total_games'] == 200
+    assert result['summary']['rounds']['median'] == expected['rounds']['median']
+    assert result['summary']['winners'] == expected['winners']
+    assert result['summary']['rounds']['mean'] == pytest.approx(expected['rounds']['mean'])
+
+    # A reopened store keeps its series and coverage
+    with ResultStore(path) as store:
+        assert store.seeds() == [8]
+        assert store.next_game(8) == 200
+        assert store.summary(seed=8)['total_games'] == 200
+        assert store.accumulator({'detect_cycles': True}).total_games == 0
+
+
+def test_store_rejects_overlapping_batches(tmp_path):
+    """Games already in the store should never be counted twice"""
+    games = list(iter_games(100, seed=3))
+    with ResultStore(str(tmp_path / 'results.db')) as store:
+        store.add(3, 0, 50, StreamingSummary().update(games[:50]))
+        store.add(3, 80, 100, StreamingSummary().update(games[80:]))
+        with pytest.raises(ValueError):
+            store.add(3, 40, 60, StreamingSummary().update(games[40:60]))
+        with pytest.raises(ValueError):
+            store.add(3, 50, 60, StreamingSummary().update(games[:5]))
+
+        assert store.ranges(3) == [(0, 50), (80, 100)]
+        assert store.summary()['total_games'] == 70
@@ -0,0 +1,79 @@
+import pytest
+from src.analysis import analyze_results
+from src.simulation import iter_games
+import math
+from src.streaming import StreamingSummary, analyze_stream, confidence_half_widths
+
+
+def _assert_summaries_match(expected, actual):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert actual[key].keys() == value.keys()
+            for stat, number in value.items():
+                assert actual[key][stat] == pytest.approx(number)
+        else:
+            assert actual[key] == pytest.approx(value)
+
+
+def test_analyze_stream_matches_analyze_results():
+    """Streaming summary should match the list-based analysis"""
+    games = list(iter_games(400, seed=2))
+    _assert_summaries_match(analyze_results(games), analyze_stream(iter(games)))
+
+
+def test_analyze_stream_even_median_and_infinite_games():
+    """Median of an even count averages the middle values"""
+    games = [
+        {'rounds': 100, 'wars': 5, 'double_wars': 0, 'winner': 1, 'hit_max_rounds': False},
+        {'rounds': 200, 'wars': 10, 'double_wars': 2, 'winner': 2, 'hit_max_rounds': False},
+        {'rounds': 3000, 'wars': 40, 'double_wars': 3, 'winner': None, 'hit_max_rounds': True},
+    ]
+    results = analyze_stream(games)
+
+    assert results['rounds']['median'] == 150
+    _assert_summaries_match(analyze_results(games), results)
+
+
+def test_analyze_stream_empty_and_all_infinite():
+    """Edge cases should mirror analyze_results"""
+    assert analyze_stream([]) == {}
+    games = [{'rounds': 3000, 'wars': 1, 'double_wars': 0, 'winner': None,
+              'hit_max_rounds': True}]
+    assert analyze_stream(games) == analyze_results(games)
+
+
+def test_merge_equals_single_pass():
+    """Merging accumulators should equal accumulating every game at once"""
+    games = list(iter_games(300, seed=8))
+    left = StreamingSummary().update(games[:120])
+    right = StreamingSummary().update(games[120:])
+
+    assert left.merge(right).summary() == analyze_stream(games)
+
+
+def test_to_dict_round_trip():
+    """Serialized state should rebuild an identical accumulator"""
+    import json
+    accumulator = StreamingSummary().update(iter_games(200, seed=1))
+    state = json.loads(json.dumps(accumulator.to_dict()))
+
+    assert StreamingSummary.from_dict(state).summary() == accumulator.summary()
+
+
+def test_confidence_half_widths():
+    """Half-widths should follow the normal approximation"""
+    games = [
+        {'rounds': r, 'wars': 0, 'double_wars': 0, 'winner': w, 'hit_max_rounds': False}
+        for r, w in [(100, 1), (200, 2), (300, 1), (400, 2)]
+    ]
+    games.append({'rounds': 3000, 'wars': 0, 'double_wars': 0, 'winner': None,
+                  'hit_max_rounds': True})
+    widths = confidence_half_widths(StreamingSummary().update(games), confidence=0.95)
+
+    z = 1.959963984540054
+    stdev = math.sqrt(sum((r - 250) ** 2 for r in (100, 200, 300, 400)) / 3)
+    assert widths['rounds_mean'] == pytest.approx(z * stdev / 2)
+    assert widths['p1_win_pct'] == pytest.approx(z * math.sqrt(0.25 / 4) * 100)
+    assert widths['infinite_pct'] == pytest.approx(z * math.sqrt(0.2 * 0.8 / 5) * 100)
+    assert confidence_half_widths(StreamingSummary())['rounds_mean'] == math.inf
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from src.sweep import expand_grid, parse_grid_value, run_sweep
+
+
+def test_grid_expands_with_defaults():
+    """Each combination should appear once, with unswept parameters at their defaults"""
+    grid = {**parse_grid_value('facedown=1,3'), **parse_grid_value('ranks=6,13')}
+    configs = expand_grid(grid)
+    assert len(configs) == 4
+    assert {(c['facedown'], c['ranks']) for c in configs} == {(1, 6), (1, 13), (3, 6), (3, 13)}
+    assert all(c['suits'] == 4 and c['winnings'] == 'in_play' for c in configs)
+    with pytest.raises(ValueError):
+        parse_grid_value('jokers=1,2')
+
+
+def test_sweep_writes_rows_and_skips_done(tmp_path):
+    """A re-run should only play configurations missing from the table"""
+    output = str(tmp_path / 'sweep.csv')
+    rows = run_sweep({'facedown': [1, 3]}, 50, output, seed=4, batch_size=20, verbose=False)
+    table = pd.read_csv(output)
+    assert len(rows) == len(table) == 2
+    assert (table['num_games'] == 50).all()
+
+    rows = run_sweep({'facedown': [1, 2, 3]}, 50, output, seed=4, batch_size=20, verbose=False)
+    table = pd.read_csv(output)
+    assert len(table) == 3
+    assert sorted(table['facedown']) == [1, 2, 3]
+
+
+def test_sweep_pool_matches_serial(tmp_path):
+    """Summaries shouldn't depend on how jobs are spread over workers"""
+    grid = {'max_rounds': [100, 1000], 'ranks': [6]}
+    serial = run_sweep(grid, 40, str(tmp_path / 'a.csv'), seed=2, batch_size=15, verbose=False)
+    pooled = run_sweep(grid, 40, str(tmp_path / 'b.csv'), seed=2, workers=2, batch_size=15,
+                       verbose=False)
+    key = lambda row: row['max_rounds']
+    assert sorted(serial, key=key) == sorted(pooled, key=key)
+
+
+@pytest.mark.parametrize('grid', [
+    {'max_rounds': [100, 0]}, {'ranks': [6, 14]}, {'suits': [0]}, {'ranks': [1], 'suits': [1]},
+])
+def test_sweep_rejects_bad_configurations_up_front(tmp_path, grid):
+    """No configuration should be played when any of them can't be"""
+    output = tmp_path / 'sweep.csv'
+    with pytest.raises(ValueError):
+        run_sweep(grid, 20, str(output), seed=1, verbose=False)
+    assert not output.exists()
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.game import play_game
+from src.rules import WarRules
+from src.seeding import game_rng
+from src.simulation import run_simulation
+from src.output import GameWriter
+from src.trace import META_FILE, RECORD_SIZE, ROUNDS_FILE, TraceReader, replay_trace
+
+
+def test_traced_run_matches_untraced(tmp_path):
+    """Tracing shouldn't change any game, and the index should hold the totals"""
+    traced = run_simulation(num_games=300, verbose=False, seed=5, trace_dir=str(tmp_path))
+    plain = run_simulation(num_games=300, verbose=False, seed=5)
+    assert traced['summary'] == plain['summary']
+
+    reader = TraceReader(str(tmp_path))
+    game_data = plain['game_data']
+    assert len(reader) == 300
+    assert reader.index['rounds'].tolist() == game_data['rounds'].tolist()
+    assert reader.index['double_wars'].tolist() == game_data['double_wars'].tolist()
+    assert os.path.getsize(tmp_path / ROUNDS_FILE) >= RECORD_SIZE * game_data['rounds'].sum()
+
+    infinite = reader.select(hit_max_rounds=True)
+    assert infinite.tolist() == game_data.index[game_data['hit_max_rounds']].tolist()
+    deep = reader.select(min_double_wars=2)
+    assert deep.tolist() == game_data.index[game_data['double_wars'] >= 2].tolist()
+
+
+@pytest.mark.parametrize('rules', [None, WarRules(2, 'last_card', 'high_first')])
+def test_replay_rebuilds_hand_states(tmp_path, rules):
+    run_simulation(num_games=40, verbose=False, seed=2, rules=rules, trace_dir=str(tmp_path))
+    reader = TraceReader(str(tmp_path))
+    for game_num in (1, 17, 40):
+        expected = play_game(rng=game_rng(2, game_num - 1), rules=rules)
+        states = list(replay_trace(reader, game_num))
+        _, _, p1_hand, p2_hand = states[-1]
+        assert len(p1_hand) + len(p2_hand) <= 52
+        assert states[0][0] == 0 and len(states[0][2]) == 26
+        rounds = sum(1 for _, record, _, _ in states[1:] if record['decider'])
+        assert rounds == expected['rounds']
+
+
+def test_replay_detects_a_corrupt_trace(tmp_path):
+    run_simulation(num_games=5, verbose=False, seed=1, trace_dir=str(tmp_path))
+    with open(tmp_path / ROUNDS_FILE, 'r+b') as f:
+        f.seek(RECORD_SIZE * 3)
+        f.write(bytes([0x22]))
+    with pytest.raises(ValueError):
+        list(replay_trace(TraceReader(str(tmp_path)), 1))
+
+
+def test_trace_rejects_shuffled_winnings():
+    with pytest.raises(ValueError):
+        play_game(rng=game_rng(1, 0), rules=WarRules(winnings='shuffle'), trace=True)
+
+
+def test_failed_runs_leave_the_trace_directory_reusable(tmp_path):
+    """Neither bad options nor a run that dies partway should claim the directory"""
+    directory = str(tmp_path / 'trace')
+    for bad_options in ({'detect_cycles': True}, {'engine': 'numpy'},
+                        {'rules': WarRules(winnings='shuffle')},
+                        {'checkpoint_dir': str(tmp_path / 'checkpoint')}):
+        with pytest.raises(ValueError):
+            run_simulation(num_games=10, verbose=False, seed=1, trace_dir=directory,
+                           **bad_options)
+    assert not os.path.exists(directory)
+
+    class _CrashingWriter(GameWriter):
+        def _write_batch(self, games):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_simulation(num_games=10, verbose=False, seed=1, trace_dir=directory,
+                       writer=_CrashingWriter(None))
+    assert not os.path.exists(os.path.join(directory, META_FILE))
+
+    run_simulation(num_games=10, verbose=False, seed=1, trace_dir=directory)
+    reader = TraceReader(directory)
+    assert len(reader) == 10
+    assert reader.records.size == reader.index['length'].sum()